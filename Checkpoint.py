@@ -0,0 +1,247 @@
+import json
+import numpy as np
+import os
+import pickle
+import threading
+
+from .InfoSetTable import InfoSetTable
+
+MAGIC = b'OCFRCKP1'
+VERSION = 1
+ARRAYS = ('regret_sum', 'strategy', 'strategy_sum', 'reach_prob', 'reach_prob_sum')
+
+class Checkpointer:
+    '''
+    Writes incremental checkpoints of an InfoSetTable while training. Each checkpoint file holds only the information
+    sets added and the rows changed since the previous checkpoint, and names the previous checkpoint as its base, so any
+    checkpoint in the chain can be loaded with load_checkpoint. Every full_freq checkpoints a full checkpoint is written,
+    which bounds the length of the chain.
+
+    The table is copied into one of two snapshot buffers on the training thread, and the buffer is compared with the
+    previous snapshot and written to disk on a background thread while training continues. Files are written to a
+    temporary name and renamed once complete, so a crash never leaves a partial checkpoint behind.
+
+    A checkpoint file consists of the 8 byte magic string, the length of the header as an 8 byte unsigned integer, a JSON
+    header padded to a multiple of 8 bytes, and a data section. The header gives the offset of every section relative to
+    the start of the data section:
+
+        index: The pickled keys of every information set added since the base, in id order, followed by the number of
+               available actions of each one and all of their available actions concatenated into one array.
+        state: A pickled dictionary of training state, such as the iteration counter.
+        blocks: For each InfoSetBlock, the changed rows as int64 values followed by the values of those rows of each of
+                regret_sum, strategy, strategy_sum, reach_prob, and reach_prob_sum as float64 values.
+    '''
+
+    def __init__(self, save_dir, prefix='checkpoint', full_freq=10):
+        '''
+        :param save_dir: The directory to which checkpoints are written.
+        :param prefix: The prefix of each checkpoint's file name, which is followed by the iteration.
+        :param full_freq: How many checkpoints to write between full checkpoints.
+        '''
+        self.save_dir = save_dir
+        self.prefix = prefix
+        self.full_freq = full_freq
+        self.buffers = [{}, {}] # Two snapshots of the table, mapping a number of actions to a (size, arrays) pair
+        self.current = 0 # The buffer holding the snapshot of the last checkpoint
+        self.num_infosets = 0 # The number of information sets in the last checkpoint
+        self.last_path = None
+        self.num_saved = 0
+        self.thread = None
+        self.error = None
+
+    def save(self, infosets, iteration, state=None):
+        '''
+        Snapshots the table and writes a checkpoint of it on a background thread. Waits for the previous checkpoint to be
+        written first.
+
+        :param infosets: The InfoSetTable to checkpoint.
+        :param iteration: The number of iterations completed, which is used in the checkpoint's file name.
+        :param state: A dictionary of training state to store with the checkpoint.
+        :return: The path of the checkpoint file being written.
+        '''
+        self.wait()
+        full = self.last_path is None or self.num_saved % self.full_freq == 0
+        previous = self.buffers[self.current]
+        snapshot = self.buffers[1 - self.current]
+
+        for num_actions, block in infosets.blocks.items():
+            size, arrays = snapshot.get(num_actions, (0, None))
+
+            if arrays is None or len(arrays[0]) < block.size:
+                capacity = len(block.ids)
+                arrays = [np.empty((capacity,) + getattr(block, name).shape[1:]) for name in ARRAYS]
+
+            for name, array in zip(ARRAYS, arrays):
+                np.copyto(array[:block.size], getattr(block, name)[:block.size])
+
+            snapshot[num_actions] = (block.size, arrays)
+
+        start = 0 if full else self.num_infosets
+        index = infosets.keys_by_id[start:], infosets.actions_by_id[start:]
+        base = None if full else os.path.basename(self.last_path)
+        path = os.path.join(self.save_dir, self.prefix + '_' + str(iteration) + '.ckpt')
+
+        args = (path, base, iteration, len(infosets), index, state or {}, snapshot, None if full else previous)
+        self.thread = threading.Thread(target=self._write, args=args, daemon=True)
+        self.thread.start()
+
+        self.current = 1 - self.current
+        self.num_infosets = len(infosets)
+        self.last_path = path
+        self.num_saved += 1
+
+        return path
+
+    def wait(self):
+        '''
+        Waits for the checkpoint being written to finish, and raises any error raised while writing it.
+        '''
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _write(self, path, base, iteration, num_infosets, index, state, snapshot, previous):
+        '''
+        Compares a snapshot with the previous snapshot and writes the changed rows to a checkpoint file. Run on the
+        background thread.
+        '''
+        try:
+            keys, actions = index
+            lengths = np.array([len(available_actions) for available_actions in actions], dtype=np.int64)
+            actions = np.concatenate(actions) if len(actions) > 0 else np.zeros(0)
+            index = pickle.dumps((keys, lengths, actions), protocol=pickle.HIGHEST_PROTOCOL)
+            sections = [index, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)]
+            blocks = []
+
+            for num_actions, (size, arrays) in snapshot.items():
+                previous_size, previous_arrays = previous.get(num_actions, (0, None)) if previous is not None else (0, None)
+                changed = np.zeros(size, dtype=bool)
+                changed[previous_size:] = True
+
+                for array, previous_array in zip(arrays, previous_arrays or []):
+                    difference = array[:previous_size] != previous_array[:previous_size]
+                    changed[:previous_size] |= difference.reshape(previous_size, -1).any(axis=1)
+
+                rows = np.flatnonzero(changed)
+                blocks.append({'num_actions': num_actions, 'size': size, 'num_rows': len(rows)})
+                sections.append(rows.astype(np.int64).tobytes())
+                sections += [np.ascontiguousarray(array[rows]).tobytes() for array in arrays]
+
+            offsets = []
+            offset = 0
+
+            for section in sections:
+                offsets.append(offset)
+                offset += _padded(len(section))
+
+            for i, block in enumerate(blocks):
+                block['offsets'] = offsets[2 + i * (len(ARRAYS) + 1):2 + (i + 1) * (len(ARRAYS) + 1)]
+
+            header = {'version': VERSION, 'iteration': iteration, 'base': base, 'num_infosets': num_infosets,
+                      'index': [offsets[0], len(sections[0])], 'state': [offsets[1], len(sections[1])], 'blocks': blocks}
+            header = json.dumps(header).encode('utf-8')
+            header += b' ' * (_padded(len(header)) - len(header))
+
+            temporary_path = path + '.tmp'
+
+            with open(temporary_path, 'wb') as file:
+                file.write(MAGIC)
+                file.write(np.uint64(len(header)).tobytes())
+                file.write(header)
+
+                for section in sections:
+                    file.write(section)
+                    file.write(b'\0' * (_padded(len(section)) - len(section)))
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temporary_path, path)
+
+        except Exception as error:
+            self.error = error
+
+    def close(self):
+        '''
+        Waits for the last checkpoint to be written.
+        '''
+        self.wait()
+
+def _padded(length):
+    '''
+    Rounds a length in bytes up to a multiple of 8, so that every array in a checkpoint file is aligned.
+    '''
+    return (length + 7) // 8 * 8
+
+def read_header(path):
+    '''
+    Reads the header of a checkpoint file.
+
+    :param path: The path of the checkpoint file.
+    :return: The header dictionary, and the offset of the data section in the file.
+    '''
+    with open(path, 'rb') as file:
+        if file.read(8) != MAGIC:
+            raise ValueError(path + ' is not a checkpoint file')
+
+        header_length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+        header = json.loads(file.read(header_length).decode('utf-8'))
+
+    if header['version'] != VERSION:
+        raise ValueError('Unsupported checkpoint version ' + str(header['version']))
+
+    return header, 16 + header_length
+
+def load_checkpoint(path, precision='double'):
+    '''
+    Loads an InfoSetTable from a checkpoint file, applying every checkpoint in its chain from the last full checkpoint
+    onwards. The base checkpoints must be in the same directory. The arrays of each file are memory-mapped rather than
+    read into memory.
+
+    :param path: The path of the checkpoint file.
+    :param precision: The precision of the loaded table, from InfoSetTable.PRECISIONS. Checkpoints always store float64
+                      values, so a table of any precision can be saved and loaded without loss.
+    :return: The InfoSetTable and the dictionary of training state stored in the checkpoint.
+    '''
+    header, data_offset = read_header(path)
+
+    if header['base'] is None:
+        infosets = InfoSetTable(precision)
+
+    else:
+        infosets, _ = load_checkpoint(os.path.join(os.path.dirname(path), header['base']), precision)
+
+    with open(path, 'rb') as file:
+        file.seek(data_offset + header['index'][0])
+        keys, lengths, actions = pickle.loads(file.read(header['index'][1]))
+        file.seek(data_offset + header['state'][0])
+        state = pickle.loads(file.read(header['state'][1]))
+
+    for key, available_actions in zip(keys, np.split(actions, np.cumsum(lengths)[:-1]) if len(keys) > 0 else []):
+        infosets.add(key, available_actions)
+
+    if len(infosets) != header['num_infosets']:
+        raise ValueError(path + ' does not match its base checkpoint')
+
+    for block_header in header['blocks']:
+        num_actions, num_rows = block_header['num_actions'], block_header['num_rows']
+
+        if num_rows == 0:
+            continue
+
+        block = infosets.blocks[num_actions]
+        offsets = block_header['offsets']
+        rows = np.memmap(path, dtype=np.int64, mode='r', offset=data_offset + offsets[0], shape=(num_rows,))
+
+        for name, offset in zip(ARRAYS, offsets[1:]):
+            shape = getattr(block, name).shape[1:]
+            getattr(block, name)[rows] = np.memmap(path, dtype=np.float64, mode='r', offset=data_offset + offset, shape=(num_rows,) + shape)
+
+    for block in infosets.blocks.values():
+        block.touched[:block.size] = False
+
+    return infosets, state
@@ -0,0 +1,150 @@
+import numpy as np
+
+from .games import CompiledTree
+from .games.CompiledTree import TERMINAL_NODE
+from .minimizers.VectorizedEngine import get_layout
+
+class BestResponse:
+    '''
+    Evaluates the average strategies of an InfoSetTable exactly on a CompiledTree. The value of a best response to the
+    average strategies of the other players is computed for each player with one top-down and one bottom-up pass over
+    the tree, one depth at a time, choosing the best action of every information set at a depth at once. Every
+    information set must have all of its nodes at the same depth, which holds for games whose information set keys
+    include the number of actions taken.
+
+    Only one and two player zero-sum games are supported, since terminal utilities are only defined for one player.
+    '''
+
+    def __init__(self, tree, infosets):
+        '''
+        Precomputes the index arrays used by each evaluation. Every information set in the tree is added to the table.
+
+        :param tree: A CompiledTree object.
+        :param infosets: An InfoSetTable object.
+        '''
+        if tree.num_players > 2:
+            raise ValueError('Best responses can only be computed for one and two player zero-sum games')
+
+        depth = tree.depth[tree.infoset_index >= 0]
+        infoset_index = tree.infoset_index[tree.infoset_index >= 0]
+        min_depth = np.full(tree.num_infosets, tree.num_levels)
+        max_depth = np.zeros(tree.num_infosets, dtype=np.int64)
+        np.minimum.at(min_depth, infoset_index, depth)
+        np.maximum.at(max_depth, infoset_index, depth)
+
+        if np.any(min_depth != max_depth):
+            raise ValueError('Every node of an information set must be at the same depth to compute a best response')
+
+        self.tree = tree
+        self.infosets = infosets
+        self.layout = get_layout(tree, infosets)
+        self.level_splits = {} # The range of each group selection's nodes at each depth, indexed by (group, player)
+
+        for i, group in enumerate(self.layout.groups):
+            for player in range(tree.num_players):
+                nodes = group.selections[player][0]
+                self.level_splits[i, player] = np.searchsorted(nodes, tree.level_offsets)
+
+        is_terminal = tree.node_type == TERMINAL_NODE
+        self.utilities = [] # The expected utility of each terminal node for each player
+
+        for player in range(tree.num_players):
+            sign = np.where((tree.player == player) | (tree.num_players == 1), 1.0, -1.0)
+            self.utilities.append(np.where(is_terminal, tree.expected_utilities() * sign, 0))
+
+    def evaluate(self):
+        '''
+        Computes the value of the average strategies and of a best response to them for every player.
+
+        :return: An array of the expected value of each player when every player follows the average strategy, and an
+                 array of the expected value of each player when that player best responds to the others.
+        '''
+        tree = self.tree
+        layout = self.layout
+        num_players = tree.num_players
+        reach_factor = layout.reach_factor.copy()
+        value_factor = tree.edge_prob.copy() # Values are from a fixed player's perspective, so no sign is applied
+        flat_reach_factor = reach_factor.reshape(-1)
+        average_strategies = {num_actions: block.average_strategy() for num_actions, block in self.infosets.blocks.items()}
+
+        for group in layout.groups:
+            strategy = average_strategies[group.num_actions][group.rows]
+            flat_reach_factor[group.reach_index] = strategy
+            value_factor[group.children] = strategy
+
+        reach = np.ones_like(reach_factor)
+
+        for level, parents, _, _, _ in layout.levels: # Top-down pass
+            np.multiply(reach[parents], reach_factor[level], out=reach[level])
+
+        values = np.zeros(num_players)
+        best_response_values = np.zeros(num_players)
+
+        for player in range(num_players):
+            counterfactual_reach = np.prod(np.delete(reach, player, axis=1), axis=1) # The opponent and chance contribution
+            values[player] = self._value(player, value_factor)
+            best_response_values[player] = self._value(player, value_factor, counterfactual_reach)
+
+        return values, best_response_values
+
+    def _value(self, player, value_factor, counterfactual_reach=None):
+        '''
+        A bottom-up pass computing the value of the root for a player. If counterfactual_reach is given, the player
+        chooses the action with the highest counterfactual value at each of their information sets instead of following
+        the average strategy.
+        '''
+        tree = self.tree
+        value = self.utilities[player].copy()
+
+        for depth, (level, _, parent_index, parent_level, parent_level_size) in reversed(list(enumerate(self.layout.levels))):
+            value[parent_level] += np.bincount(parent_index, weights=value_factor[level] * value[level], minlength=parent_level_size)
+
+            if counterfactual_reach is None:
+                continue
+
+            for i, group in enumerate(self.layout.groups): # Best respond at every information set at the parent depth
+                start, end = self.level_splits[i, player][depth:depth + 2]
+
+                if start == end:
+                    continue
+
+                nodes, rows, children, _, _, flat_index = group.selections[player]
+                nodes, rows, children = nodes[start:end], rows[start:end], children[start:end]
+                num_actions = group.num_actions
+                action_values = value[children]
+                weights = (counterfactual_reach[nodes][:, None] * action_values).ravel()
+                infoset_values = np.bincount(flat_index[start * num_actions:end * num_actions], weights=weights, minlength=group.block.size * num_actions)
+                best_actions = np.argmax(infoset_values.reshape(-1, num_actions)[rows], axis=1)
+                value[nodes] = action_values[np.arange(len(nodes)), best_actions]
+
+        return value[0]
+
+    def nash_conv(self):
+        '''
+        Returns the sum over players of how much each player gains by best responding to the average strategies of the
+        others. Zero exactly at a Nash equilibrium.
+        '''
+        values, best_response_values = self.evaluate()
+
+        return float(np.sum(best_response_values - values))
+
+    def exploitability(self):
+        '''
+        Returns the NashConv averaged over the players.
+        '''
+        return self.nash_conv() / self.tree.num_players
+
+def exploitability(game, tree, infosets):
+    '''
+    Computes the exploitability of the average strategies of an InfoSetTable. To evaluate a table repeatedly, create a
+    BestResponse object once instead.
+
+    :param game: An implementation of the Game abstract base class.
+    :param tree: A CompiledTree object or the GameNode object representing the root of the game tree.
+    :param infosets: An InfoSetTable object.
+    :return: The NashConv of the average strategies averaged over the players.
+    '''
+    if not isinstance(tree, CompiledTree):
+        tree = CompiledTree(game, tree)
+
+    return BestResponse(tree, infosets).exploitability()
@@ -0,0 +1,509 @@
+import numpy as np
+
+from .InfoSet import InformationSet
+
+# The data types of the (regret_sum, strategy, reach_prob) and (strategy_sum, reach_prob_sum) arrays of each precision.
+# Mixed precision halves the memory of the arrays read and written on every visit, while keeping the sums that are
+# accumulated over every iteration exact enough for long runs.
+PRECISIONS = {
+    'double': (np.float64, np.float64),
+    'mixed': (np.float32, np.float64),
+    'single': (np.float32, np.float32),
+}
+
+class InfoSetBlock:
+    '''
+    The regret sums, strategies, and strategy sums of every information set in an InfoSetTable with the same number of
+    available actions, stored as contiguous 2D arrays with one row per information set.
+    '''
+
+    precision = 'double' # Blocks pickled before precisions were added are double precision
+
+    def __init__(self, num_actions, capacity=64, precision='double'):
+        '''
+        Initializes the block with the following variables:
+
+            num_actions: The number of actions available at every information set in the block.
+            precision: The name of the data types of the arrays, from PRECISIONS.
+            size: The number of rows in use.
+            ids: The InfoSetTable id of the information set stored in each row.
+            regret_sum, strategy, strategy_sum: Arrays of shape (capacity, num_actions).
+            reach_prob, reach_prob_sum: Arrays of shape (capacity,).
+            touched: Whether each row has been accessed since the last update.
+
+        :param num_actions: The number of actions available at each information set.
+        :param capacity: The number of rows to allocate. Doubled whenever the block is full.
+        :param precision: 'double' for float64 arrays, 'mixed' for float32 regrets, strategies, and reach probabilities
+                          with float64 sums, or 'single' for float32 arrays.
+        '''
+        dtype, sum_dtype = PRECISIONS[precision]
+        self.num_actions = num_actions
+        self.precision = precision
+        self.size = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.regret_sum = np.zeros((capacity, num_actions), dtype=dtype)
+        self.strategy = np.full((capacity, num_actions), 1 / num_actions, dtype=dtype)
+        self.strategy_sum = np.zeros((capacity, num_actions), dtype=sum_dtype)
+        self.reach_prob = np.zeros(capacity, dtype=dtype)
+        self.reach_prob_sum = np.zeros(capacity, dtype=sum_dtype)
+        self.touched = np.zeros(capacity, dtype=bool)
+        self.scratch = None # Temporary arrays reused by every call to update, allocated on the first call
+
+    def append(self, infoset_id):
+        '''
+        Adds a row for a new information set and returns its index.
+        '''
+        if self.size == len(self.ids):
+            self._grow(2 * len(self.ids))
+
+        row = self.size
+        self.ids[row] = infoset_id
+        self.size += 1
+
+        return row
+
+    def _grow(self, capacity):
+        '''
+        Reallocates every array with a larger capacity, keeping the values of the rows in use.
+        '''
+        dtype, sum_dtype = PRECISIONS[self.precision]
+        new_rows = capacity - len(self.ids)
+        self.ids = np.concatenate([self.ids, np.zeros(new_rows, dtype=np.int64)])
+        self.regret_sum = np.concatenate([self.regret_sum, np.zeros((new_rows, self.num_actions), dtype=dtype)])
+        self.strategy = np.concatenate([self.strategy, np.full((new_rows, self.num_actions), 1 / self.num_actions, dtype=dtype)])
+        self.strategy_sum = np.concatenate([self.strategy_sum, np.zeros((new_rows, self.num_actions), dtype=sum_dtype)])
+        self.reach_prob = np.concatenate([self.reach_prob, np.zeros(new_rows, dtype=dtype)])
+        self.reach_prob_sum = np.concatenate([self.reach_prob_sum, np.zeros(new_rows, dtype=sum_dtype)])
+        self.touched = np.concatenate([self.touched, np.zeros(new_rows, dtype=bool)])
+        self.scratch = None
+
+    def copy(self, capacity=None):
+        '''
+        Returns a copy of the block with a given capacity, which defaults to the number of rows in use.
+        '''
+        n = self.size
+        block = InfoSetBlock(self.num_actions, capacity=max(n if capacity is None else capacity, 1), precision=self.precision)
+        block.size = n
+        block.ids[:n] = self.ids[:n]
+        block.regret_sum[:n] = self.regret_sum[:n]
+        block.strategy[:n] = self.strategy[:n]
+        block.strategy_sum[:n] = self.strategy_sum[:n]
+        block.reach_prob[:n] = self.reach_prob[:n]
+        block.reach_prob_sum[:n] = self.reach_prob_sum[:n]
+        block.touched[:n] = self.touched[:n]
+
+        return block
+
+    def update(self, reset_regret=False, touched_only=False, discounts=None):
+        '''
+        Update the strategy sum, strategy, and reach probability sum, and reset the reach probability of every row in
+        use at once. Regret matching, strategy sum accumulation, and regret clipping are done in place without
+        allocating temporary arrays.
+
+        :param reset_regret: Whether negative regret values should also be zeroed out. Used by the CFR+ algorithm.
+        :param touched_only: Whether to only update the rows accessed since the last update. Gives the same result as
+                             updating every row, since the regret sum and reach probability of every other row is
+                             unchanged. Much faster for sampling minimizers, which only visit a few rows per iteration.
+        :param discounts: An optional (positive regret, negative regret, strategy sum) tuple of discount factors, as
+                          returned by the functions in minimizers.Discounting. Applied to every row in use, touched or not,
+                          before the strategy sum is accumulated.
+        '''
+        if discounts is not None:
+            self.discount(*discounts)
+
+        if touched_only:
+            rows = np.flatnonzero(self.touched[:self.size])
+
+            if len(rows) == 0:
+                return
+
+            regret_sum, strategy, strategy_sum = self.regret_sum[rows], self.strategy[rows], self.strategy_sum[rows]
+            reach_prob, reach_prob_sum = self.reach_prob[rows], self.reach_prob_sum[rows]
+            scratch = np.empty_like(strategy), np.empty((len(rows), 1), dtype=strategy.dtype)
+
+            self._update_rows(regret_sum, strategy, strategy_sum, reach_prob, reach_prob_sum, scratch, reset_regret)
+
+            self.regret_sum[rows], self.strategy[rows], self.strategy_sum[rows] = regret_sum, strategy, strategy_sum
+            self.reach_prob[rows], self.reach_prob_sum[rows] = reach_prob, reach_prob_sum
+            self.touched[rows] = False
+
+            return
+
+        n = self.size
+
+        if self.scratch is None:
+            self.scratch = np.empty_like(self.strategy), np.empty((len(self.strategy), 1), dtype=self.strategy.dtype)
+
+        scratch = self.scratch[0][:n], self.scratch[1][:n]
+
+        self._update_rows(self.regret_sum[:n], self.strategy[:n], self.strategy_sum[:n], self.reach_prob[:n], self.reach_prob_sum[:n], scratch, reset_regret)
+        self.touched[:n] = False
+
+    def discount(self, positive_regret, negative_regret, strategy_sum):
+        '''
+        Multiplies the positive and negative regret sums and the strategy sums of every row in use by discount factors,
+        in place.
+        '''
+        n = self.size
+        regret_sum = self.regret_sum[:n]
+
+        if positive_regret == negative_regret:
+            regret_sum *= positive_regret
+
+        else:
+            np.multiply(regret_sum, positive_regret, out=regret_sum, where=regret_sum > 0)
+            np.multiply(regret_sum, negative_regret, out=regret_sum, where=regret_sum < 0)
+
+        if strategy_sum != 1:
+            self.strategy_sum[:n] *= strategy_sum
+
+    def _update_rows(self, regret_sum, strategy, strategy_sum, reach_prob, reach_prob_sum, scratch, reset_regret):
+        '''
+        Updates a set of rows in place, using the scratch arrays for intermediate values.
+        '''
+        weighted_strategy, normalizing_sum = scratch
+
+        np.multiply(strategy, reach_prob[:, None], out=weighted_strategy)
+        strategy_sum += weighted_strategy
+
+        if reset_regret: # Clipping the regrets first lets regret matching read them directly
+            positive_regret = np.maximum(regret_sum, 0, out=regret_sum)
+
+        else:
+            positive_regret = np.maximum(regret_sum, 0, out=weighted_strategy)
+
+        np.add.reduce(positive_regret, axis=1, keepdims=True, out=normalizing_sum) # np.sum without its Python overhead, which dominates on small tables
+        strategy.fill(1 / self.num_actions) # Uniform unless some regret is positive
+        np.divide(positive_regret, normalizing_sum, out=strategy, where=normalizing_sum > 0)
+
+        reach_prob_sum += reach_prob
+        reach_prob[:] = 0
+
+    def average_strategy(self):
+        '''
+        Returns the average strategy of every row in use, computed the same way as
+        InformationSet.get_average_strategy.
+        '''
+        n = self.size
+        reach_prob_sum = self.reach_prob_sum[:n, None]
+        avg_strategy = np.divide(self.strategy_sum[:n], reach_prob_sum, out=self.strategy_sum[:n].copy(), where=reach_prob_sum != 0)
+        normalizing_sum = np.sum(avg_strategy, axis=1, keepdims=True)
+        np.divide(avg_strategy, normalizing_sum, out=avg_strategy, where=normalizing_sum > 0)
+        np.copyto(avg_strategy, 1 / self.num_actions, where=normalizing_sum <= 0)
+
+        return avg_strategy
+
+    def nbytes(self):
+        '''
+        Returns the number of bytes used by the rows in use.
+        '''
+        return self.size * ((self.num_actions + 1) * (2 * self.regret_sum.itemsize + self.strategy_sum.itemsize) - self.regret_sum.itemsize)
+
+class InfoSetView:
+    '''
+    A lightweight view of a single information set stored in an InfoSetTable. Provides the same attributes and methods as
+    an InformationSet object, but reads and writes the rows of the table's arrays.
+    '''
+
+    __slots__ = ('table', 'id', 'block', 'row')
+
+    def __init__(self, table, infoset_id):
+        self.table = table
+        self.id = infoset_id
+        self.block, self.row = table.locate(infoset_id)
+
+    @property
+    def key(self):
+        return self.table.keys_by_id[self.id]
+
+    @property
+    def available_actions(self):
+        return self.table.actions_by_id[self.id]
+
+    @property
+    def num_actions(self):
+        return self.block.num_actions
+
+    @property
+    def regret_sum(self):
+        return self.block.regret_sum[self.row]
+
+    @regret_sum.setter
+    def regret_sum(self, value):
+        self.block.regret_sum[self.row] = value
+
+    @property
+    def strategy(self):
+        return self.block.strategy[self.row]
+
+    @strategy.setter
+    def strategy(self, value):
+        self.block.strategy[self.row] = value
+
+    @property
+    def strategy_sum(self):
+        return self.block.strategy_sum[self.row]
+
+    @strategy_sum.setter
+    def strategy_sum(self, value):
+        self.block.strategy_sum[self.row] = value
+
+    @property
+    def reach_prob(self):
+        return self.block.reach_prob[self.row]
+
+    @reach_prob.setter
+    def reach_prob(self, value):
+        self.block.reach_prob[self.row] = value
+
+    @property
+    def reach_prob_sum(self):
+        return self.block.reach_prob_sum[self.row]
+
+    @reach_prob_sum.setter
+    def reach_prob_sum(self, value):
+        self.block.reach_prob_sum[self.row] = value
+
+    get_strategy = InformationSet.get_strategy
+    get_average_strategy = InformationSet.get_average_strategy
+    update = InformationSet.update
+    reset_regret = InformationSet.reset_regret
+
+    def __str__(self):
+        '''
+        Print the information set.
+        '''
+        return str(self.key) + ': ' + str(self.available_actions) + ': ' + str(self.get_average_strategy())
+
+class InfoSetTable:
+    '''
+    A table of every information set visited by a minimizer, stored as a struct of arrays. Each information set is given
+    a dense integer id in the order it was added, and its values are stored in the InfoSetBlock for its number of
+    available actions. Behaves like a dictionary mapping information set keys to InfoSetView objects.
+    '''
+
+    precision = 'double' # Tables pickled before precisions were added are double precision
+    minimizer_state = None # Tables pickled before minimizer states were added have none
+    node_counter = None # Never pickled
+
+    def __init__(self, precision='double'):
+        '''
+        Initializes the table with the following variables:
+
+            precision: The precision of every block, from PRECISIONS.
+            blocks: A dictionary mapping a number of actions to the InfoSetBlock storing those information sets.
+            ids: A dictionary mapping information set keys to ids.
+            keys_by_id: The key of each information set, indexed by id.
+            actions_by_id: The available actions of each information set, indexed by id.
+            num_actions_by_id: The number of available actions of each information set, indexed by id. Selects the block
+                               the information set is stored in.
+            rows_by_id: The row of the block each information set is stored in, indexed by id.
+            minimizer_state: State a minimizer keeps between traversals of the table, such as the pruning counters of
+                             RBP_CFR, or None. Stored in checkpoints by the Trainer, so must be picklable.
+            node_counter: The games.NodeCounter counting the nodes visited by traversals of the table, or None. Set by
+                          the counter while it is active.
+
+        :param precision: 'double' for float64 arrays, 'mixed' for float32 regrets, strategies, and reach probabilities
+                          with float64 sums, or 'single' for float32 arrays.
+        '''
+        if precision not in PRECISIONS:
+            raise ValueError('Unknown precision: ' + str(precision))
+
+        self.precision = precision
+        self.blocks = {}
+        self.ids = {}
+        self.keys_by_id = []
+        self.actions_by_id = []
+        self.num_actions_by_id = np.zeros(64, dtype=np.int32)
+        self.rows_by_id = np.zeros(64, dtype=np.int64)
+        self.minimizer_state = None
+        self.node_counter = None
+
+    def add(self, key, available_actions):
+        '''
+        Adds a new information set to the table if it does not already exist, and returns a view of it.
+
+        :param key: The unique key identifying the information set. Defined by each game.
+        :param available_actions: An array where each index contains a token representing an action in the game.
+        :return: An InfoSetView of the information set.
+        '''
+        if key in self.ids:
+            return self.view(self.ids[key])
+
+        num_actions = len(available_actions)
+
+        if num_actions not in self.blocks:
+            self.blocks[num_actions] = InfoSetBlock(num_actions, precision=self.precision)
+
+        infoset_id = len(self.keys_by_id)
+        block = self.blocks[num_actions]
+        row = block.append(infoset_id)
+
+        if infoset_id == len(self.rows_by_id):
+            self.num_actions_by_id = np.concatenate([self.num_actions_by_id, np.zeros_like(self.num_actions_by_id)])
+            self.rows_by_id = np.concatenate([self.rows_by_id, np.zeros_like(self.rows_by_id)])
+
+        self.ids[key] = infoset_id
+        self.keys_by_id.append(key)
+        self.actions_by_id.append(available_actions)
+        self.num_actions_by_id[infoset_id] = num_actions
+        self.rows_by_id[infoset_id] = row
+
+        return self.view(infoset_id)
+
+    def intern_tree(self, game, root):
+        '''
+        Computes the key of every information set in a game tree once, adds each one to the table, and stores its
+        integer id on each decision node as GameNode.infoset_id. The ids are only valid for this table. Subtrees shared
+        by several parents in a game DAG are visited once.
+
+        :param game: An implementation of the Game abstract base class.
+        :param root: The GameNode object representing the root of the game tree or DAG.
+        :return: The number of information sets in the table.
+        '''
+        stack = [root]
+        visited = set() # The ids of the nonterminal nodes already visited
+
+        while stack:
+            node = stack.pop()
+
+            if node.is_terminal_node or id(node) in visited:
+                continue
+
+            visited.add(id(node))
+
+            if not node.is_chance_node:
+                node.infoset_id = self.add(game.get_infoset_key(list(node.history)), node.available_actions).id
+
+            stack.extend(node.next_nodes)
+
+        return len(self)
+
+    def lookup(self, game, game_node):
+        '''
+        Returns a view of the information set a decision node belongs to. Uses the node's interned infoset_id if it has
+        one, otherwise builds the information set key and adds it to the table if this is a new game state.
+
+        :param game: An implementation of the Game abstract base class.
+        :param game_node: A GameNode object at which a player acts.
+        :return: An InfoSetView of the information set.
+        '''
+        if game_node.infoset_id is not None:
+            return self.view(game_node.infoset_id)
+
+        if self.node_counter is not None: # Times the key
+            return self.add(self.node_counter.build_key(game, list(game_node.history)), game_node.available_actions)
+
+        return self.add(game.get_infoset_key(list(game_node.history)), game_node.available_actions)
+
+    def locate(self, infoset_id):
+        '''
+        Returns the InfoSetBlock and row an information set is stored in.
+        '''
+        return self.blocks[self.num_actions_by_id[infoset_id]], self.rows_by_id[infoset_id]
+
+    def view(self, infoset_id):
+        '''
+        Returns a view of the information set with a given id, and marks it as touched for the next update.
+        '''
+        view = InfoSetView(self, infoset_id)
+        view.block.touched[view.row] = True
+
+        return view
+
+    def update(self, reset_regret=False, touched_only=False, discounts=None):
+        '''
+        Update the strategy sum, strategy, and reach probability sum, and reset the reach probability of every
+        information set at once following a traversal of the game tree.
+
+        :param reset_regret: Whether negative regret values should also be zeroed out. Used by the CFR+ algorithm.
+        :param touched_only: Whether to only update the information sets accessed since the last update. Used by the
+                             sampling minimizers, which only visit a small fraction of the table on each traversal.
+        :param discounts: An optional (positive regret, negative regret, strategy sum) tuple of discount factors applied
+                          to every information set before updating. Used by the discounted minimizers.
+        '''
+        for block in self.blocks.values():
+            block.update(reset_regret, touched_only, discounts)
+
+        return self
+
+    def nbytes(self):
+        '''
+        Returns the number of bytes used by the regret, strategy, and reach probability arrays.
+        '''
+        return sum(block.nbytes() for block in self.blocks.values())
+
+    def to_dict(self):
+        '''
+        Returns a dictionary mapping information set keys to independent InformationSet objects.
+        '''
+        infosets = {}
+
+        for key, view in self.items():
+            infoset = InformationSet(key, view.available_actions)
+            infoset.regret_sum = view.regret_sum.copy()
+            infoset.strategy = view.strategy.copy()
+            infoset.strategy_sum = view.strategy_sum.copy()
+            infoset.reach_prob = float(view.reach_prob)
+            infoset.reach_prob_sum = float(view.reach_prob_sum)
+            infosets[key] = infoset
+
+        return infosets
+
+    @classmethod
+    def from_dict(cls, infosets, precision='double'):
+        '''
+        Creates a table from a dictionary mapping information set keys to InformationSet objects, such as the pickles
+        in the pretrained directory.
+        '''
+        table = cls(precision)
+
+        for key, infoset in infosets.items():
+            table[key] = infoset
+
+        return table
+
+    def __setitem__(self, key, infoset):
+        '''
+        Copies the values of an InformationSet object into the table.
+        '''
+        view = self.add(key, infoset.available_actions)
+        view.regret_sum = infoset.regret_sum
+        view.strategy = infoset.strategy
+        view.strategy_sum = infoset.strategy_sum
+        view.reach_prob = infoset.reach_prob
+        view.reach_prob_sum = infoset.reach_prob_sum
+
+    def __getitem__(self, key):
+        return self.view(self.ids[key])
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def __len__(self):
+        return len(self.keys_by_id)
+
+    def __iter__(self):
+        return iter(self.keys_by_id)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.ids else default
+
+    def keys(self):
+        return list(self.keys_by_id)
+
+    def values(self):
+        return [InfoSetView(self, i) for i in range(len(self))]
+
+    def items(self):
+        return [(key, InfoSetView(self, i)) for i, key in enumerate(self.keys_by_id)]
+
+    def __getstate__(self):
+        '''
+        Pickles the rows in use of each block, dropping unused capacity and the node counter.
+        '''
+        state = self.__dict__.copy()
+        state['node_counter'] = None
+        state['blocks'] = {num_actions: block.copy() for num_actions, block in self.blocks.items()}
+
+        return state
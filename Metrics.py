@@ -0,0 +1,259 @@
+import contextlib
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+from .games import CompiledTree, NodeCounter
+from .games.CompiledTree import CHANCE_NODE, DECISION_NODE, TERMINAL_NODE
+
+def peak_rss():
+    '''
+    Returns the peak resident set size of the process in bytes, or None if it cannot be measured on this platform.
+    '''
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak if sys.platform == 'darwin' else peak * 1024 # Reported in kilobytes on Linux
+
+class JSONLSink:
+    '''
+    Writes every metrics record to a file as one line of JSON.
+    '''
+
+    def __init__(self, path):
+        '''
+        :param path: The path of the file. Records are appended if it already exists.
+        '''
+        self.file = open(path, 'a')
+
+    def __call__(self, record):
+        self.file.write(json.dumps(record) + '\n')
+
+    def close(self):
+        self.file.close()
+
+class MetricsRecorder:
+    '''
+    Measures where the time of Trainer.train goes and writes one record every freq iterations to each sink. A sink is any
+    callable taking a record dictionary, such as a JSONLSink, and is closed at the end of training if it has a close
+    method. Each record has the following fields:
+
+        event: 'start' for the record written once the tree is ready, 'iteration' for each record written during
+               training, and 'end' for the record written when training finishes.
+        iteration: The number of iterations run.
+        seconds: The wall clock time since training started.
+        phases: The seconds spent since the last record traversing the game, updating the table, building information
+                set keys, writing checkpoints, measuring exploitability, and displaying results. Key building is part of
+                the other phases and only measured in a single process. The start record has the seconds spent building
+                the tree instead.
+        nodes: The number of decision, chance, and terminal nodes visited since the last record. None if they cannot
+               be counted, which is the case for batched traversals and traversals in several processes.
+        infosets_touched: The number of information sets visited on each iteration, summed since the last record. None
+                          if it cannot be counted.
+        new_infosets: The number of information sets added to the table since the last record.
+        num_infosets: The number of information sets in the table.
+        peak_rss_bytes: The peak resident set size of the process.
+        rss_growth_bytes: How much the peak resident set size grew since the last record.
+
+    Node visits are counted and key building is timed by a games.NodeCounter set on the table, which the minimizers
+    and InfoSetTable.lookup report to, only while training in a single process. A recorder without sinks only counts
+    node visits, which Trainer.train uses to enforce a node budget. Trainer.train uses a NullRecorder when neither sinks
+    nor a node budget are given, so nothing is measured.
+    '''
+
+    def __init__(self, sinks, freq=1):
+        '''
+        :param sinks: A sink or a list of sinks.
+        :param freq: How many iterations each record covers.
+        '''
+        self.sinks = list(sinks) if isinstance(sinks, (list, tuple)) else [sinks]
+        self.freq = freq
+        self.counter = None
+        self.static_counts = None # The nodes of each type visited per iteration by a full width compiled traversal
+        self.touched = 0
+        self.touched_mode = None # 'count' to count the touched rows of the table, 'all' if every row is visited
+        self.phases = dict.fromkeys(('traverse', 'update', 'key', 'checkpoint', 'evaluation', 'display'), 0.0)
+        self.phase_start = self.start_time = time.perf_counter()
+        self.num_infosets = 0
+        self.last_rss = peak_rss()
+        self.last_iteration = 0
+        self.total_nodes = 0 # The node visits reported by every record so far
+
+    def attach(self, starting_node, infosets, iteration, local, counted=False):
+        '''
+        Starts measuring once the tree is ready and writes the start record.
+
+        :param starting_node: The GameNode, CompiledTree, LazyGameNode or GameState the minimizer traverses.
+        :param infosets: The InfoSetTable being trained.
+        :param iteration: The number of iterations already run.
+        :param local: Whether each iteration is one traversal of starting_node in this process, so that visits can be
+                      counted. Compiled trees are assumed to be traversed in full unless counted is given.
+        :param counted: Whether a compiled tree is traversed by a cfr_compiled function, which counts the nodes it visits.
+        '''
+        if local and isinstance(starting_node, CompiledTree) and not counted:
+            self.static_counts = {name: int((starting_node.node_type == node_type).sum()) for name, node_type in (('decision', DECISION_NODE), ('chance', CHANCE_NODE), ('terminal', TERMINAL_NODE))}
+            self.touched_mode = 'all'
+
+        elif local:
+            self.counter = NodeCounter(infosets).__enter__()
+
+            if self.sinks: # Only needed for the records
+                self.touched_mode = 'count'
+
+        self.last_iteration = iteration
+        self._write('start', iteration, infosets, {'build': time.perf_counter() - self.start_time})
+
+    def detach(self, iteration, infosets):
+        '''
+        Stops measuring, writes the end record, and closes the sinks.
+        '''
+        if self.counter is not None:
+            self.counter.__exit__(None, None, None)
+
+        if iteration > self.last_iteration or any(self.phases.values()):
+            self._write('end', iteration, infosets, self._take_phases())
+
+        for sink in self.sinks:
+            if hasattr(sink, 'close'):
+                sink.close()
+
+    def num_nodes(self, iteration):
+        '''
+        Returns the number of node visits since attach, or None if they cannot be counted.
+
+        :param iteration: The number of iterations run.
+        '''
+        if self.counter is not None:
+            return self.total_nodes + sum(self.counter.counts)
+
+        if self.static_counts is not None:
+            return self.total_nodes + sum(self.static_counts.values()) * (iteration - self.last_iteration)
+
+        return None
+
+    def mark(self):
+        '''
+        Starts timing a phase.
+        '''
+        self.phase_start = time.perf_counter()
+
+    def lap(self, phase):
+        '''
+        Adds the time since the last call to mark or lap to a phase, and starts timing the next one.
+        '''
+        now = time.perf_counter()
+        self.phases[phase] += now - self.phase_start
+        self.phase_start = now
+
+    @contextlib.contextmanager
+    def timed(self, phase):
+        '''
+        A context manager adding the time spent in its body to a phase.
+        '''
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.phases[phase] += time.perf_counter() - start
+
+    def count_touched(self, infosets):
+        '''
+        Adds the number of information sets visited since the last update of the table. Called between each traversal
+        and update.
+        '''
+        if self.touched_mode == 'count':
+            self.touched += sum(int(block.touched[:block.size].sum()) for block in infosets.blocks.values())
+
+    def iteration(self, iteration, infosets):
+        '''
+        Writes a record if freq iterations have run since the last one.
+        '''
+        if iteration - self.last_iteration >= self.freq:
+            self._write('iteration', iteration, infosets, self._take_phases())
+
+    def _take_phases(self):
+        if self.counter is not None:
+            self.phases['key'] += self.counter.take_key_seconds()
+
+        phases = dict(self.phases)
+
+        for phase in self.phases:
+            self.phases[phase] = 0.0
+
+        return phases
+
+    def _write(self, event, iteration, infosets, phases):
+        num_iterations = iteration - self.last_iteration
+
+        if self.counter is not None:
+            nodes = self.counter.reset()
+
+        elif self.static_counts is not None:
+            nodes = {name: count * num_iterations for name, count in self.static_counts.items()}
+
+        else:
+            nodes = None
+
+        touched = {'count': self.touched, 'all': len(infosets) * num_iterations}.get(self.touched_mode)
+
+        rss = peak_rss()
+        record = {
+            'event': event,
+            'iteration': iteration,
+            'seconds': time.perf_counter() - self.start_time,
+            'phases': phases,
+            'nodes': nodes if event != 'start' else None,
+            'infosets_touched': touched if event != 'start' else None,
+            'new_infosets': len(infosets) - self.num_infosets,
+            'num_infosets': len(infosets),
+            'peak_rss_bytes': rss,
+            'rss_growth_bytes': None if rss is None or self.last_rss is None else rss - self.last_rss,
+        }
+
+        self.total_nodes += sum(nodes.values()) if nodes is not None else 0
+        self.touched = 0
+        self.num_infosets = len(infosets)
+        self.last_rss = rss
+        self.last_iteration = iteration
+
+        for sink in self.sinks:
+            sink(record)
+
+class NullRecorder:
+    '''
+    A recorder whose methods do nothing, used by Trainer.train when no metrics are recorded, so that measuring costs a
+    few empty method calls per iteration.
+    '''
+
+    def attach(self, starting_node, infosets, iteration, local, counted=False):
+        pass
+
+    def detach(self, iteration, infosets):
+        pass
+
+    def num_nodes(self, iteration):
+        return None
+
+    def mark(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def timed(self, phase):
+        return contextlib.nullcontext()
+
+    def count_touched(self, infosets):
+        pass
+
+    def iteration(self, iteration, infosets):
+        pass
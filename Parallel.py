@@ -0,0 +1,449 @@
+import importlib
+import multiprocessing
+import numpy as np
+import random
+import time
+import traceback
+from multiprocessing import shared_memory
+
+from .InfoSetTable import InfoSetBlock, InfoSetTable
+from .minimizers.Alternation import get_traverser
+from .minimizers.Sampler import Sampler
+
+def shared_array(shape, dtype=np.float64, name=None):
+    '''
+    Creates a NumPy array backed by a new shared memory segment, or attaches to an existing segment if a name is given.
+
+    :param shape: The shape of the array.
+    :param dtype: The data type of the array.
+    :param name: The name of an existing shared memory segment to attach to.
+    :return: The SharedMemory object, which must be kept alive while the array is in use, and the array.
+    '''
+    size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+
+    if name is None:
+        segment = shared_memory.SharedMemory(create=True, size=size)
+
+    else:
+        segment = shared_memory.SharedMemory(name=name)
+
+    return segment, np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+def split_chance_nodes(root, num_subtrees):
+    '''
+    Expands chance nodes starting at the root until there are at least num_subtrees independent subtrees, or the next
+    node to expand is not a chance node. The value of the root is the sum of each subtree's value weighted by its
+    chance probability.
+
+    :param root: The GameNode object representing the root of the game tree.
+    :param num_subtrees: The number of subtrees to aim for.
+    :return: A list of (GameNode, chance probability) pairs, one for each subtree.
+    '''
+    frontier = [(root, 1.0)]
+
+    while len(frontier) < num_subtrees and all(node.is_chance_node for node, _ in frontier):
+        frontier = [(next_node, prob * node.chance_probs[i]) for node, prob in frontier for i, next_node in enumerate(node.next_nodes)]
+
+    return frontier
+
+def _chance_split_worker(conn, game, root, minimizer_name, infosets, num_subtrees, segment_names, seed):
+    '''
+    The loop run by each worker process. Receives (iteration, traverser, subtree indices) tasks, traverses the assigned
+    subtrees against the shared strategies, writes regret and reach probability deltas to its own shared buffers, and
+    replies with the value of each subtree. The global random generators are seeded with seed, since every forked
+    worker would otherwise sample the same utilities at the dynamic utility nodes of its subtrees.
+    '''
+    try:
+        np.random.seed(seed)
+        random.seed(seed)
+        minimizer = importlib.import_module(minimizer_name)
+        frontier = split_chance_nodes(root, num_subtrees)
+        segments = []
+        deltas = []
+
+        for num_actions, block in infosets.blocks.items():
+            capacity, strategy_name, regret_name, reach_name = segment_names[num_actions]
+            dtype = block.strategy.dtype
+            segment, block.strategy = shared_array((capacity, num_actions), dtype, name=strategy_name)
+            segments.append(segment)
+            segment, block.regret_sum = shared_array((capacity, num_actions), dtype, name=regret_name)
+            segments.append(segment)
+            segment, block.reach_prob = shared_array((capacity,), dtype, name=reach_name)
+            segments.append(segment)
+            deltas += [block.regret_sum, block.reach_prob]
+
+        while True:
+            task = conn.recv()
+
+            if task is None:
+                break
+
+            iteration, traverser, subtrees = task
+
+            for delta in deltas:
+                delta[:] = 0
+
+            values = []
+
+            for i in subtrees:
+                node, chance_prob = frontier[i]
+                reach_probs = np.ones(game.num_players)
+
+                if minimizer.ALTERNATING:
+                    values.append(minimizer.cfr(game, node, infosets, reach_probs, chance_prob, iteration, traverser))
+
+                else:
+                    values.append(minimizer.cfr(game, node, infosets, reach_probs, chance_prob, iteration))
+
+            conn.send(('ok', values))
+
+    except Exception:
+        conn.send(('error', traceback.format_exc()))
+
+    finally:
+        conn.close()
+
+class ChanceSplitPool:
+    '''
+    Traverses the independent subtrees below the root chance nodes of a game tree in a pool of worker processes. Every
+    worker reads the current strategies from shared memory and accumulates regret and reach probability deltas in its
+    own shared buffers. The deltas are reduced into the InfoSetTable in worker order after each iteration, so results do
+    not depend on scheduling.
+    '''
+
+    def __init__(self, game, root, minimizer, infosets, workers):
+        '''
+        Moves the strategies of the table into shared memory and starts the worker processes.
+
+        :param game: An implementation of the Game abstract base class.
+        :param root: The GameNode object representing the root of the game tree. Must have been interned into infosets.
+        :param minimizer: A full-width minimizer module with CHANCE_SPLIT = True.
+        :param infosets: The InfoSetTable holding every information set of the game tree.
+        :param workers: The number of worker processes.
+        '''
+        self.infosets = infosets
+        self.frontier = split_chance_nodes(root, workers)
+        self.workers = min(workers, len(self.frontier))
+        self.assignments = [list(range(len(self.frontier)))[i::self.workers] for i in range(self.workers)]
+        self.segments = []
+        self.deltas = [] # (worker, block, regret deltas, reach probability deltas) for each worker and block
+        segment_names = [{} for _ in range(self.workers)]
+
+        for num_actions, block in infosets.blocks.items():
+            capacity = len(block.ids)
+            segment, strategy = shared_array((capacity, num_actions), block.strategy.dtype)
+            strategy[:] = block.strategy
+            block.strategy = strategy
+            self.segments.append(segment)
+
+            for worker in range(self.workers):
+                regret_segment, regret_delta = shared_array((capacity, num_actions), block.regret_sum.dtype)
+                reach_segment, reach_delta = shared_array((capacity,), block.reach_prob.dtype)
+                self.segments += [regret_segment, reach_segment]
+                self.deltas.append((worker, block, regret_delta, reach_delta))
+                segment_names[worker][num_actions] = (capacity, segment.name, regret_segment.name, reach_segment.name)
+
+        context = multiprocessing.get_context()
+        self.connections = []
+        self.processes = []
+
+        for worker in range(self.workers):
+            parent_conn, child_conn = context.Pipe()
+            seed = random.getrandbits(31) # Drawn in the parent, so a seeded run stays reproducible
+            args = (child_conn, game, root, minimizer.__name__, infosets, workers, segment_names[worker], seed)
+            process = context.Process(target=_chance_split_worker, args=args, daemon=True)
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def cfr(self, iteration, traverser=None):
+        '''
+        Runs one traversal of the game tree split across the workers, and adds the reduced regret and reach probability
+        deltas to the table.
+
+        :param iteration: How many iterations of CFR have been run.
+        :param traverser: The player who is traversing the game tree, for alternating minimizers.
+        :return: The utility of the first player for the single traversal of the game tree.
+        '''
+        for worker, conn in enumerate(self.connections):
+            conn.send((iteration, traverser, self.assignments[worker]))
+
+        values = np.zeros(len(self.frontier))
+
+        for worker, conn in enumerate(self.connections):
+            status, result = conn.recv()
+
+            if status == 'error':
+                self.close()
+                raise RuntimeError('A chance split worker failed:\n' + result)
+
+            values[self.assignments[worker]] = result
+
+        for worker, block, regret_delta, reach_delta in self.deltas:
+            n = block.size
+            block.regret_sum[:n] += regret_delta[:n]
+            block.reach_prob[:n] += reach_delta[:n]
+
+        expected_value = 0
+
+        for i, (_, chance_prob) in enumerate(self.frontier):
+            expected_value += chance_prob * values[i]
+
+        return expected_value
+
+    def close(self):
+        '''
+        Stops the workers, copies the strategies out of shared memory, and releases every shared memory segment.
+        '''
+        for conn in self.connections:
+            try:
+                conn.send(None)
+                conn.close()
+
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self.processes:
+            process.join()
+
+        for block in self.infosets.blocks.values():
+            block.strategy = np.array(block.strategy)
+
+        self.deltas = []
+
+        for segment in self.segments:
+            segment.close()
+            segment.unlink()
+
+        self.connections = []
+        self.processes = []
+        self.segments = []
+
+def _merge_deltas(minimizer, infosets, shared_regret, iteration):
+    '''
+    Adds a worker's local regret and reach probability deltas to the shared table without locking, and updates the
+    strategies of the rows the worker touched by running the minimizer's update on a copy of those rows. Only the
+    change the update made to each shared sum is added back to it, rather than the copy being written over it, so merges
+    that other workers make while the update runs are kept. The strategies are written over, since they are recomputed
+    from the regrets by every merge. Two merges can still lose an update if they add to the same row at the same instant.
+
+    :param minimizer: The minimizer module the worker is running.
+    :param infosets: The worker's InfoSetTable, whose strategies, strategy sums, and reach probability sums are shared,
+                     and whose regret sums and reach probabilities hold the local deltas.
+    :param shared_regret: A dictionary mapping a number of actions to the shared regret sums of that block.
+    :param iteration: The number of the last traversal the worker ran, passed to the minimizer's update.
+    '''
+    staging = InfoSetTable(infosets.precision)
+    touched = {}
+
+    for num_actions, block in infosets.blocks.items():
+        rows = np.flatnonzero(block.touched[:block.size])
+
+        if len(rows) == 0:
+            continue
+
+        stage = InfoSetBlock(num_actions, capacity=len(rows), precision=block.precision)
+        stage.size = len(rows)
+        snapshot = shared_regret[num_actions][rows], block.strategy_sum[rows], block.reach_prob_sum[rows]
+        stage.regret_sum[:] = snapshot[0] + block.regret_sum[rows]
+        stage.strategy[:] = block.strategy[rows]
+        stage.strategy_sum[:] = snapshot[1]
+        stage.reach_prob[:] = block.reach_prob[rows]
+        stage.reach_prob_sum[:] = snapshot[2]
+        stage.touched[:] = True
+        staging.blocks[num_actions] = stage
+        touched[num_actions] = rows, snapshot
+
+    minimizer.update(staging, iteration)
+
+    for num_actions, (rows, (regret_sum, strategy_sum, reach_prob_sum)) in touched.items():
+        block, stage = infosets.blocks[num_actions], staging.blocks[num_actions]
+        shared_regret[num_actions][rows] += stage.regret_sum - regret_sum
+        block.strategy[rows] = stage.strategy
+        block.strategy_sum[rows] += stage.strategy_sum - strategy_sum
+        block.reach_prob_sum[rows] += stage.reach_prob_sum - reach_prob_sum
+        block.regret_sum[rows] = 0
+        block.reach_prob[rows] = 0
+        block.touched[rows] = False
+
+def _sampling_worker(conn, game, root, minimizer_name, infosets, sampler, segment_specs):
+    '''
+    The loop run by each worker process. Receives (iteration, number of traversals) tasks, runs that many sampled
+    traversals against the shared strategies while accumulating regret deltas locally, merges the deltas into the shared
+    table, and replies with the sum of the traversal values.
+    '''
+    try:
+        minimizer = importlib.import_module(minimizer_name)
+        seed = int(sampler.generator.integers(2 ** 31)) # Seeds the global generators used by dynamic utility nodes
+        np.random.seed(seed)
+        random.seed(seed)
+        segments = []
+        shared_regret = {}
+
+        for num_actions, block in infosets.blocks.items():
+            for attribute, (name, shape, dtype) in segment_specs[num_actions].items():
+                segment, array = shared_array(shape, dtype, name=name)
+                segments.append(segment)
+
+                if attribute == 'regret_sum':
+                    shared_regret[num_actions] = array
+
+                else:
+                    setattr(block, attribute, array)
+
+            capacity = len(shared_regret[num_actions])
+            block.regret_sum = np.zeros((capacity, num_actions), dtype=shared_regret[num_actions].dtype)
+            block.reach_prob = np.zeros(capacity, dtype=block.strategy.dtype)
+            block.touched = np.zeros(capacity, dtype=bool)
+
+        while True:
+            task = conn.recv()
+
+            if task is None:
+                break
+
+            iteration, num_traversals = task
+            value = 0
+
+            for i in range(num_traversals):
+                reach_probs = np.ones(game.num_players)
+
+                if minimizer.ALTERNATING:
+                    value += minimizer.cfr(game, root, infosets, reach_probs, 1, iteration + i, get_traverser(iteration + i), sampler=sampler)
+
+                else:
+                    value += minimizer.cfr(game, root, infosets, reach_probs, 1, iteration + i, sampler=sampler)
+
+            _merge_deltas(minimizer, infosets, shared_regret, iteration + num_traversals - 1)
+            conn.send(('ok', value))
+
+    except Exception:
+        conn.send(('error', traceback.format_exc()))
+
+    finally:
+        conn.close()
+
+class SamplingPool:
+    '''
+    Runs batches of sampled traversals of a game tree in a pool of worker processes, in the style of Hogwild. The regret
+    sums, strategies, and strategy sums of the table are stored in shared memory. Each worker samples sync_interval
+    traversals against the shared strategies while accumulating regret deltas locally, then adds its deltas to the shared
+    table and recomputes the strategies of the information sets it visited, without any locking. Concurrent merges of the
+    same information set may occasionally lose an update, which sampling minimizers tolerate.
+    '''
+
+    SHARED_ATTRIBUTES = ('regret_sum', 'strategy', 'strategy_sum', 'reach_prob_sum')
+
+    def __init__(self, game, root, minimizer, infosets, workers, sync_interval=100, sampler=None):
+        '''
+        Moves the table into shared memory and starts the worker processes. Each worker gets its own Sampler spawned from
+        sampler, so runs are reproducible up to the order in which merges happen.
+
+        :param game: An implementation of the Game abstract base class.
+        :param root: The GameNode object representing the root of the game tree. Must have been interned into infosets.
+        :param minimizer: A sampling minimizer module with SAMPLING = True.
+        :param infosets: The InfoSetTable holding every information set of the game tree.
+        :param workers: The number of worker processes.
+        :param sync_interval: How many traversals each worker samples between merges into the shared table.
+        :param sampler: The Sampler the worker samplers are spawned from. If None, one is seeded from np.random.
+        '''
+        self.infosets = infosets
+        self.workers = workers
+        self.sync_interval = sync_interval
+        self.traversals = 0
+        self.elapsed = 0
+        self.segments = []
+        segment_specs = {}
+
+        for num_actions, block in infosets.blocks.items():
+            segment_specs[num_actions] = {}
+
+            for attribute in self.SHARED_ATTRIBUTES:
+                array = getattr(block, attribute)
+                segment, shared = shared_array(array.shape, array.dtype)
+                shared[:] = array
+                setattr(block, attribute, shared)
+                self.segments.append(segment)
+                segment_specs[num_actions][attribute] = (segment.name, array.shape, array.dtype)
+
+        samplers = (sampler or Sampler(np.random.randint(2 ** 31))).spawn(workers)
+        context = multiprocessing.get_context()
+        self.connections = []
+        self.processes = []
+
+        for worker in range(workers):
+            parent_conn, child_conn = context.Pipe()
+            args = (child_conn, game, root, minimizer.__name__, infosets, samplers[worker], segment_specs)
+            process = context.Process(target=_sampling_worker, args=args, daemon=True)
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def run(self, iteration, num_traversals):
+        '''
+        Samples up to workers * sync_interval traversals, split as evenly as possible between the workers, and waits for
+        every worker to merge its deltas.
+
+        :param iteration: How many traversals have been sampled so far.
+        :param num_traversals: The number of traversals to sample.
+        :return: The number of traversals sampled and the sum of their utilities for the first player.
+        '''
+        num_traversals = min(num_traversals, self.workers * self.sync_interval)
+        counts = [num_traversals // self.workers + (worker < num_traversals % self.workers) for worker in range(self.workers)]
+        start = time.perf_counter()
+        offset = iteration + 1
+
+        for conn, count in zip(self.connections, counts):
+            conn.send((offset, count))
+            offset += count
+
+        value = 0
+
+        for conn in self.connections:
+            status, result = conn.recv()
+
+            if status == 'error':
+                self.close()
+                raise RuntimeError('A sampling worker failed:\n' + result)
+
+            value += result
+
+        self.elapsed += time.perf_counter() - start
+        self.traversals += num_traversals
+
+        return num_traversals, value
+
+    def traversals_per_second(self):
+        '''
+        Returns the number of sampled traversals per second of wall clock time spent in run.
+        '''
+        return self.traversals / self.elapsed if self.elapsed > 0 else 0
+
+    def close(self):
+        '''
+        Stops the workers, copies the table out of shared memory, and releases every shared memory segment.
+        '''
+        for conn in self.connections:
+            try:
+                conn.send(None)
+                conn.close()
+
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self.processes:
+            process.join()
+
+        for block in self.infosets.blocks.values():
+            for attribute in self.SHARED_ATTRIBUTES:
+                setattr(block, attribute, np.array(getattr(block, attribute)))
+
+        for segment in self.segments:
+            segment.close()
+            segment.unlink()
+
+        self.connections = []
+        self.processes = []
+        self.segments = []
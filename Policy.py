@@ -0,0 +1,304 @@
+import json
+import mmap
+import numpy as np
+from hashlib import blake2b
+
+from .InfoSetTable import InfoSetTable
+
+MAGIC = b'OCFRPOL1'
+VERSION = 1
+SECTIONS = (('hashes', np.uint64), ('key_offsets', np.int64), ('key_data', np.uint8), ('offsets', np.int64),
+            ('actions', np.int64), ('strategies', np.float64))
+
+def key_hash(key):
+    '''
+    Returns a 64 bit hash of an information set key that is stable across processes.
+    '''
+    return int.from_bytes(blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class Policy:
+    '''
+    A read-only table of the normalized average strategy of every information set of a trained game. Information sets
+    are sorted by the hash of their key, and all keys, available actions, and strategies are stored in a few flat arrays,
+    so a policy can be saved to a file and memory-mapped by many processes, which then share one copy in the page cache
+    and look up strategies without copying them.
+    '''
+
+    def __init__(self, hashes, key_offsets, key_data, offsets, actions, strategies, buffer=None, game=None):
+        '''
+        Initializes the policy with the following arrays, indexed by position in hash order:
+
+            hashes: The key_hash of each key, sorted.
+            key_offsets: Key i is stored as UTF-8 in key_data[key_offsets[i]:key_offsets[i + 1]].
+            key_data: Every key, concatenated.
+            offsets: The available actions and strategy of information set i are stored in
+                     actions[offsets[i]:offsets[i + 1]] and strategies[offsets[i]:offsets[i + 1]].
+            actions: The available actions of every information set, concatenated.
+            strategies: The normalized average strategy of every information set, concatenated.
+
+        :param buffer: The memory map the arrays are views into, if the policy was loaded from a file.
+        :param game: The Game the policy was trained on. Needed to look up strategies by history with act.
+        '''
+        self.hashes = hashes
+        self.key_offsets = key_offsets
+        self.key_data = key_data
+        self.offsets = offsets
+        self.actions = actions
+        self.strategies = strategies
+        self.buffer = buffer
+        self.game = game
+        self.cdf = None # The cumulative strategies offset by position, computed on the first call to sample_batch
+
+    @classmethod
+    def from_table(cls, infosets, game=None):
+        '''
+        Creates a policy from the average strategies of an InfoSetTable. Available actions must be integers, as they are
+        in the sample games.
+        '''
+        keys = infosets.keys()
+        average_strategies = {num_actions: block.average_strategy() for num_actions, block in infosets.blocks.items()}
+        hashes = np.array([key_hash(key) for key in keys], dtype=np.uint64)
+        order = np.argsort(hashes, kind='stable')
+        encoded_keys = [keys[i].encode('utf-8') for i in order]
+        key_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        key_offsets[1:] = np.cumsum([len(key) for key in encoded_keys])
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(infosets.num_actions_by_id[:len(keys)][order])
+        actions = []
+        strategies = []
+
+        for i in order:
+            block, row = infosets.locate(i)
+            actions.append(np.asarray(infosets.actions_by_id[i], dtype=np.int64))
+            strategies.append(average_strategies[block.num_actions][row])
+
+        key_data = np.frombuffer(b''.join(encoded_keys), dtype=np.uint8)
+        actions = np.concatenate(actions) if actions else np.zeros(0, dtype=np.int64)
+        strategies = np.concatenate(strategies) if strategies else np.zeros(0)
+
+        return cls(hashes[order], key_offsets, key_data, offsets, actions, strategies, game=game)
+
+    @classmethod
+    def from_dict(cls, infosets, game=None):
+        '''
+        Creates a policy from a dictionary mapping keys to InformationSet objects, such as the pickles in the pretrained
+        directory.
+        '''
+        return cls.from_table(InfoSetTable.from_dict(infosets), game)
+
+    def save(self, path):
+        '''
+        Writes the policy to a file consisting of the 8 byte magic string, the length of the header as an 8 byte unsigned
+        integer, a JSON header padded to a multiple of 8 bytes, and each array in SECTIONS aligned to 8 bytes. The header
+        gives the offset of each array from the start of the file and its length.
+        '''
+        arrays = [np.ascontiguousarray(getattr(self, name), dtype=dtype) for name, dtype in SECTIONS]
+        header = {'version': VERSION, 'num_infosets': len(self), 'sections': {}}
+        header_length = 4096 # Reserved for the header, so that the offsets of the arrays are known before it is written
+
+        offset = 16 + header_length
+
+        for (name, _), array in zip(SECTIONS, arrays):
+            header['sections'][name] = [offset, len(array)]
+            offset += (array.nbytes + 7) // 8 * 8
+
+        header = json.dumps(header).encode('utf-8')
+
+        if len(header) > header_length:
+            raise ValueError('The policy header is too long')
+
+        with open(path, 'wb') as file:
+            file.write(MAGIC)
+            file.write(np.uint64(header_length).tobytes())
+            file.write(header + b' ' * (header_length - len(header)))
+
+            for array in arrays:
+                file.write(array.tobytes())
+                file.write(b'\0' * ((array.nbytes + 7) // 8 * 8 - array.nbytes))
+
+    @classmethod
+    def load(cls, path, game=None):
+        '''
+        Memory-maps a policy written by save. The arrays of the policy are read-only views into the file, so loading is
+        independent of the size of the policy and every process that loads the same file shares its memory.
+        '''
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if buffer[:8] != MAGIC:
+            raise ValueError(path + ' is not a policy file')
+
+        header_length = int(np.frombuffer(buffer, dtype=np.uint64, count=1, offset=8)[0])
+        header = json.loads(bytes(buffer[16:16 + header_length]).decode('utf-8'))
+
+        if header['version'] != VERSION:
+            raise ValueError('Unsupported policy version ' + str(header['version']))
+
+        arrays = []
+
+        for name, dtype in SECTIONS:
+            offset, length = header['sections'][name]
+            arrays.append(np.frombuffer(buffer, dtype=dtype, count=length, offset=offset))
+
+        return cls(*arrays, buffer=buffer, game=game)
+
+    def index(self, key):
+        '''
+        Returns the position of an information set in the policy, or -1 if the key is not in the policy.
+        '''
+        encoded_key = key.encode('utf-8')
+        hash_value = np.uint64(key_hash(key))
+        i = int(np.searchsorted(self.hashes, hash_value))
+
+        while i < len(self.hashes) and self.hashes[i] == hash_value: # Hash collisions are resolved by comparing keys
+            if self.key_data[self.key_offsets[i]:self.key_offsets[i + 1]].tobytes() == encoded_key:
+                return i
+
+            i += 1
+
+        return -1
+
+    def probs(self, key):
+        '''
+        Returns the normalized average strategy of an information set, as a read-only view into the policy's arrays.
+        Raises a KeyError if the key is not in the policy.
+        '''
+        i = self._index(key)
+
+        return self.strategies[self.offsets[i]:self.offsets[i + 1]]
+
+    def available_actions(self, key):
+        '''
+        Returns the available actions of an information set, in the same order as its strategy.
+        '''
+        i = self._index(key)
+
+        return self.actions[self.offsets[i]:self.offsets[i + 1]]
+
+    def sample(self, key, rng):
+        '''
+        Samples an action from the average strategy of an information set.
+
+        :param key: The information set key.
+        :param rng: A numpy.random.Generator or a Sampler.
+        :return: The sampled action.
+        '''
+        i = self._index(key)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        u = rng.random() if hasattr(rng, 'random') else rng.uniform()
+        position = min(int(np.searchsorted(np.cumsum(self.strategies[start:end]), u, side='right')), end - start - 1)
+
+        return self.actions[start + position]
+
+    def act(self, history, rng=None):
+        '''
+        Chooses an action for the player to act after a game history, following the average strategy. Requires the policy
+        to have been created with a game.
+
+        :param history: The game history, in the format used by the game.
+        :param rng: A numpy.random.Generator or a Sampler. If None, the action with the highest probability is returned.
+        :return: The chosen action.
+        '''
+        key = self.game.get_infoset_key(history)
+
+        if rng is not None:
+            return self.sample(key, rng)
+
+        i = self._index(key)
+        start, end = self.offsets[i], self.offsets[i + 1]
+
+        return self.actions[start + int(np.argmax(self.strategies[start:end]))]
+
+    def lookup(self, keys):
+        '''
+        Returns the positions of many information sets at once, with -1 for keys that are not in the policy.
+        '''
+        encoded_keys = [key.encode('utf-8') for key in keys]
+        hash_values = np.array([key_hash(key) for key in keys], dtype=np.uint64)
+        indices = np.searchsorted(self.hashes, hash_values)
+        found = indices < len(self.hashes)
+        found[found] = self.hashes[indices[found]] == hash_values[found]
+        indices = np.where(found, indices, -1)
+
+        for j in np.flatnonzero(found): # Confirm the keys, falling back to a single lookup on a hash collision
+            i = indices[j]
+
+            if self.key_data[self.key_offsets[i]:self.key_offsets[i + 1]].tobytes() != encoded_keys[j]:
+                indices[j] = self.index(keys[j])
+
+        return indices
+
+    def probs_batch(self, keys):
+        '''
+        Returns the average strategies of many information sets at once, as a list of read-only views. Raises a KeyError
+        if any key is not in the policy.
+        '''
+        indices = self.lookup(keys)
+
+        if np.any(indices < 0):
+            raise KeyError(keys[int(np.argmax(indices < 0))])
+
+        starts, ends = self.offsets[indices], self.offsets[indices + 1]
+
+        return [self.strategies[start:end] for start, end in zip(starts, ends)]
+
+    def sample_batch(self, keys, rng):
+        '''
+        Samples an action for each of many information sets at once by inverse-CDF lookup.
+
+        :param keys: A list of information set keys.
+        :param rng: A numpy.random.Generator or a Sampler.
+        :return: An array of the sampled actions.
+        '''
+        if self.cdf is None: # Offsetting each strategy's cumulative sum by its position keeps the whole array sorted
+            cumulative = np.concatenate([[0], np.cumsum(self.strategies)])
+            lengths = np.diff(self.offsets)
+            self.cdf = np.repeat(np.arange(len(self)) - cumulative[self.offsets[:-1]], lengths) + cumulative[1:]
+
+        indices = self.lookup(keys)
+
+        if np.any(indices < 0):
+            raise KeyError(keys[int(np.argmax(indices < 0))])
+
+        u = rng.random(len(keys)) if hasattr(rng, 'random') else rng.uniforms(len(keys))
+        positions = np.searchsorted(self.cdf, indices + u, side='right')
+        positions = np.clip(positions, self.offsets[indices], self.offsets[indices + 1] - 1)
+
+        return self.actions[positions]
+
+    def _index(self, key):
+        i = self.index(key)
+
+        if i < 0:
+            raise KeyError(key)
+
+        return i
+
+    def keys(self):
+        '''
+        Returns every key in the policy, in hash order.
+        '''
+        return [self.key_data[self.key_offsets[i]:self.key_offsets[i + 1]].tobytes().decode('utf-8') for i in range(len(self))]
+
+    def close(self):
+        '''
+        Releases the memory map of a policy loaded from a file. The policy can not be used afterwards. The arrays returned
+        by probs, available_actions, and probs_batch are read-only views into the map, and stay valid after close: the
+        file is unmapped once the last of them is garbage collected. Copy them to keep them without keeping the map.
+        '''
+        if self.buffer is not None:
+            self.hashes = self.key_offsets = self.key_data = self.offsets = self.actions = self.strategies = None
+            self.cdf = None
+            buffer, self.buffer = self.buffer, None
+
+            try:
+                buffer.close()
+
+            except BufferError: # Views returned to callers are still alive, and keep the map open until they are freed
+                pass
+
+    def __contains__(self, key):
+        return self.index(key) >= 0
+
+    def __len__(self):
+        return len(self.hashes)
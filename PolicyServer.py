@@ -0,0 +1,132 @@
+import asyncio
+import json
+import numpy as np
+
+class PolicyServer:
+    '''
+    A local request/response server for a Policy. Clients send one JSON object per line and receive one JSON object per
+    line in reply, in the same order. Each request holds one of the following fields:
+
+        key: Replies with the available actions and average strategy of the information set with this key.
+        keys: Replies with the available actions and average strategies of a list of information sets.
+        history: Replies with the available actions and average strategy of the information set of the player to act
+                 after this game history. Requires the policy to have been created with a game.
+
+    If the request also holds "sample": true, the reply holds sampled actions instead of strategies. An "id" field is
+    copied to the reply. Errors are replied to with an "error" field.
+    '''
+
+    def __init__(self, policy, host='127.0.0.1', port=8765, seed=None):
+        '''
+        :param policy: The Policy to serve.
+        :param host: The address to listen on.
+        :param port: The port to listen on. If zero, a free port is chosen, which can be read from port after start.
+        :param seed: The seed of the numpy.random.Generator used to sample actions.
+        '''
+        self.policy = policy
+        self.host = host
+        self.port = port
+        self.rng = np.random.default_rng(seed)
+        self.server = None
+        self.num_requests = 0
+
+    async def start(self):
+        '''
+        Starts listening for connections.
+        '''
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        '''
+        Starts the server if it has not been started, and handles connections until it is closed.
+        '''
+        if self.server is None:
+            await self.start()
+
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        '''
+        Stops listening for connections.
+        '''
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def handle(self, request):
+        '''
+        Computes the reply to a single decoded request.
+        '''
+        reply = {'id': request['id']} if 'id' in request else {}
+        policy = self.policy
+        sample = request.get('sample', False)
+
+        try:
+            if 'keys' in request:
+                keys = request['keys']
+                indices = policy.lookup(keys)
+
+                if np.any(indices < 0):
+                    raise KeyError(keys[int(np.argmax(indices < 0))])
+
+                reply['actions'] = [policy.actions[policy.offsets[i]:policy.offsets[i + 1]].tolist() for i in indices]
+
+                if sample:
+                    reply['sampled'] = policy.sample_batch(keys, self.rng).tolist()
+
+                else:
+                    reply['probs'] = [probs.tolist() for probs in policy.probs_batch(keys)]
+
+                return reply
+
+            if 'history' in request:
+                key = policy.game.get_infoset_key(request['history'])
+
+            else:
+                key = request['key']
+
+            reply['actions'] = policy.available_actions(key).tolist()
+
+            if sample:
+                reply['sampled'] = int(policy.sample(key, self.rng))
+
+            else:
+                reply['probs'] = policy.probs(key).tolist()
+
+        except KeyError as error:
+            reply['error'] = 'Unknown information set ' + str(error)
+
+        except Exception as error:
+            reply['error'] = type(error).__name__ + ': ' + str(error)
+
+        return reply
+
+    async def _handle_connection(self, reader, writer):
+        '''
+        Replies to every request sent over a connection until the client closes it.
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                try:
+                    reply = self.handle(json.loads(line))
+
+                except ValueError:
+                    reply = {'error': 'Invalid JSON request'}
+
+                self.num_requests += 1
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
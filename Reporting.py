@@ -0,0 +1,205 @@
+import threading
+import numpy as np
+
+def snapshot(infosets):
+    '''
+    Copies the arrays of an InfoSetTable needed to summarize it, so that the copy can be summarized on another thread
+    while training continues.
+
+    :param infosets: The InfoSetTable to copy.
+    :return: A dictionary mapping each number of actions to the (ids, strategy_sum, reach_prob_sum, regret_sum) arrays of
+             the rows in use of its block.
+    '''
+    return {num_actions: (block.ids[:block.size].copy(), block.strategy_sum[:block.size].copy(), block.reach_prob_sum[:block.size].copy(), block.regret_sum[:block.size].copy()) for num_actions, block in infosets.blocks.items()}
+
+def _average_strategy(strategy_sum, reach_prob_sum):
+    '''
+    Computes the average strategy of every row, the same way as InfoSetBlock.average_strategy.
+    '''
+    reach_prob_sum = reach_prob_sum[:, None]
+    avg_strategy = np.divide(strategy_sum, reach_prob_sum, out=strategy_sum.copy(), where=reach_prob_sum != 0)
+    normalizing_sum = np.sum(avg_strategy, axis=1, keepdims=True)
+    np.divide(avg_strategy, normalizing_sum, out=avg_strategy, where=normalizing_sum > 0)
+    np.copyto(avg_strategy, 1 / strategy_sum.shape[1], where=normalizing_sum <= 0)
+
+    return avg_strategy
+
+def summarize(blocks, expected_game_value, num_iterations, previous=None, top_k=10, sample_size=10, rng=None):
+    '''
+    Computes summary statistics of a snapshot of an InfoSetTable with one pass of array operations per block.
+
+    :param blocks: A snapshot of the table, as returned by snapshot.
+    :param expected_game_value: The expected value of the first player, summed over every iteration.
+    :param num_iterations: What iteration of training the algorithm is on.
+    :param previous: The average strategies of each block at the previous summary, as returned in the 'strategies' field,
+                     to find the information sets whose strategies changed the most. None for the first summary.
+    :param top_k: How many of the most changed information sets to return.
+    :param sample_size: How many information sets to sample uniformly.
+    :param rng: The numpy Generator used to sample information sets. The global numpy random state is never used, so
+                sampling does not change the course of training.
+    :return: A dictionary with the following fields:
+
+                iteration: The iteration of training.
+                expected_value: The expected value of each player.
+                num_infosets: The number of information sets.
+                average_regret: The sum over information sets of the largest positive cumulative regret, divided by the
+                                number of iterations, which bounds the average overall regret of the players.
+                max_infoset_regret: The largest positive cumulative regret of any information set, divided by the number
+                                    of iterations.
+                mean_entropy: The mean entropy of the average strategies, in nats.
+                most_changed: (id, total variation distance) pairs of the top_k information sets whose average strategies
+                              moved the most since the previous summary, largest first.
+                sampled: (id, average strategy) pairs of the sampled information sets.
+                strategies: The average strategies of each block, to pass as previous to the next summary.
+    '''
+    rng = rng if rng is not None else np.random.default_rng()
+    num_iterations = max(num_iterations, 1)
+    utility = expected_game_value / num_iterations
+    strategies = {}
+    ids, changes, sampled_ids, sampled_strategies = [], [], [], []
+    total_regret, max_regret, total_entropy, num_infosets = 0.0, 0.0, 0.0, 0
+
+    for num_actions, (block_ids, strategy_sum, reach_prob_sum, regret_sum) in blocks.items():
+        if len(block_ids) == 0:
+            continue
+
+        avg_strategy = _average_strategy(strategy_sum, reach_prob_sum)
+        strategies[num_actions] = avg_strategy
+        num_infosets += len(block_ids)
+
+        regret = np.maximum(regret_sum.max(axis=1), 0)
+        total_regret += regret.sum()
+        max_regret = max(max_regret, regret.max())
+
+        logs = np.log(avg_strategy, out=np.zeros_like(avg_strategy), where=avg_strategy > 0)
+        total_entropy -= np.sum(avg_strategy * logs)
+
+        if previous is not None and num_actions in previous:
+            old = previous[num_actions]
+            n = len(old) # Rows are only ever appended, so the first rows are the same information sets
+            change = 0.5 * np.abs(avg_strategy[:n] - old).sum(axis=1)
+            top = np.argsort(change)[::-1][:top_k]
+            ids.append(block_ids[top])
+            changes.append(change[top])
+
+    for num_actions, avg_strategy in strategies.items():
+        count = rng.binomial(sample_size, len(avg_strategy) / num_infosets) if sample_size > 0 else 0
+        rows = rng.choice(len(avg_strategy), min(count, len(avg_strategy)), replace=False)
+        sampled_ids.extend(blocks[num_actions][0][rows])
+        sampled_strategies.extend(avg_strategy[rows])
+
+    most_changed = []
+
+    if changes:
+        ids, changes = np.concatenate(ids), np.concatenate(changes)
+        order = np.argsort(changes)[::-1][:top_k]
+        most_changed = [(int(ids[i]), float(changes[i])) for i in order]
+
+    return {
+        'iteration': num_iterations,
+        'expected_value': [float(utility), float(-utility)],
+        'num_infosets': num_infosets,
+        'average_regret': float(total_regret / num_iterations),
+        'max_infoset_regret': float(max_regret / num_iterations),
+        'mean_entropy': float(total_entropy / max(num_infosets, 1)),
+        'most_changed': most_changed,
+        'sampled': [(int(i), strategy) for i, strategy in zip(sampled_ids, sampled_strategies)],
+        'strategies': strategies,
+    }
+
+class ResultsReporter:
+    '''
+    Summarizes an InfoSetTable on a background thread during training, instead of printing the average strategy of every
+    information set. The training thread only copies the arrays of the table, and the summary statistics are computed
+    and written by a background thread, so reporting does not stall training on large games. Like the Checkpointer,
+    each summary waits for the previous one to be written first.
+    '''
+
+    def __init__(self, infosets, action_map, sink=None, top_k=10, sample_size=10, seed=0):
+        '''
+        :param infosets: The InfoSetTable being trained. Keys and actions are read from it by the background thread.
+        :param action_map: The name of each action, used to print strategies.
+        :param sink: A callable taking each summary, as returned by summarize with the keys and actions of the reported
+                     information sets added, or None to print each summary.
+        :param top_k: How many of the most changed information sets to report.
+        :param sample_size: How many information sets to sample uniformly for each report.
+        :param seed: The seed of the random number generator used to sample information sets.
+        '''
+        self.infosets = infosets
+        self.action_map = action_map
+        self.sink = sink if sink is not None else self.print_summary
+        self.top_k = top_k
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.previous = None
+        self.thread = None
+        self.error = None
+
+    def submit(self, expected_game_value, num_iterations):
+        '''
+        Copies the table and summarizes it on a background thread. Waits for the previous summary to be written first.
+
+        :param expected_game_value: The expected value of the first player, summed over every iteration.
+        :param num_iterations: What iteration of training the algorithm is on.
+        '''
+        self.wait()
+        args = (snapshot(self.infosets), expected_game_value, num_iterations)
+        self.thread = threading.Thread(target=self._write, args=args, daemon=True)
+        self.thread.start()
+
+    def wait(self):
+        '''
+        Waits for the summary being written to finish, and raises any error raised while writing it.
+        '''
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        '''
+        Waits for the last summary to be written.
+        '''
+        self.wait()
+
+    def _write(self, blocks, expected_game_value, num_iterations):
+        try:
+            summary = summarize(blocks, expected_game_value, num_iterations, self.previous, self.top_k, self.sample_size, self.rng)
+            self.previous = summary.pop('strategies')
+            keys, actions = self.infosets.keys_by_id, self.infosets.actions_by_id
+            summary['most_changed'] = [(keys[i], change) for i, change in summary['most_changed']]
+            summary['sampled'] = [(keys[i], self._format_strategy(actions[i], strategy)) for i, strategy in summary['sampled']]
+            self.sink(summary)
+
+        except Exception as error:
+            self.error = error
+
+    def _format_strategy(self, available_actions, strategy):
+        return [self.action_map[action] + ': ' + str(probability) for action, probability in zip(available_actions, strategy)]
+
+    def print_summary(self, summary):
+        '''
+        Prints a summary in the format of Trainer._print_results.
+        '''
+        lines = [
+            'Iteration: ' + str(summary['iteration']),
+            'Player 1 Expected Value: ' + str(summary['expected_value'][0]),
+            'Player 2 Expected Value: ' + str(summary['expected_value'][1]),
+            'Information Sets: {}  Average Regret: {:.6g}  Max Regret: {:.6g}  Mean Entropy: {:.4f}'.format(summary['num_infosets'], summary['average_regret'], summary['max_infoset_regret'], summary['mean_entropy']),
+            '',
+        ]
+
+        if summary['most_changed']:
+            lines.append('Most changed:')
+            lines.extend('{} {:.6f}'.format(key, change) for key, change in summary['most_changed'])
+            lines.append('')
+
+        if summary['sampled']:
+            lines.append('Sampled:')
+            lines.extend('{} {}'.format(key, strategy) for key, strategy in summary['sampled'])
+            lines.append('')
+
+        print('\n'.join(lines), flush=True)
@@ -1,83 +1,561 @@
+import copy
 import numpy as np
 import os
 import pickle
+import random
+import sys
+import time
+import warnings
 from tqdm import tqdm
 
-_ROOT_DIR = os.getcwd()
+from .Checkpoint import Checkpointer, load_checkpoint
+from .Exploitability import BestResponse
+from .InfoSetTable import InfoSetTable
+from .Metrics import MetricsRecorder, NullRecorder
+from .Parallel import ChanceSplitPool, SamplingPool
+from .Reporting import ResultsReporter
+from .TrainingOptions import BudgetOptions, CheckpointOptions, ParallelOptions, ReportOptions, TreeOptions
+from .games import CompiledTree, GameState, LazyTree
+from .minimizers.Alternation import get_traverser
+from .minimizers.Sampler import Sampler
 
+# The keyword arguments Trainer.train took before its options were grouped into objects, mapped onto the option object
+# and attribute that replace them
+DEPRECATED_OPTIONS = {
+    'build_dag': ('tree', 'build_dag'),
+    'lazy_tree_size': ('tree', 'lazy_tree_size'),
+    'tree_free': ('tree', 'tree_free'),
+    'workers': ('parallel', 'workers'),
+    'sync_interval': ('parallel', 'sync_interval'),
+    'batch_size': ('parallel', 'batch_size'),
+    'time_budget': ('budget', 'time'),
+    'node_budget': ('budget', 'nodes'),
+    'target_exploitability': ('budget', 'target_exploitability'),
+    'exploitability_freq': ('budget', 'exploitability_freq'),
+    'budget_check_freq': ('budget', 'check_freq'),
+    'display_results': ('report', 'display'),
+    'display_freq': ('report', 'display_freq'),
+    'summary_results': ('report', 'summary'),
+    'metrics': ('report', 'metrics'),
+    'metrics_freq': ('report', 'metrics_freq'),
+    'save_results': ('checkpoints', 'save_results'),
+    'save_freq': ('checkpoints', 'save_freq'),
+    'save_dir': ('checkpoints', 'save_dir'),
+}
 class Trainer:
     '''
     A class that runs a specified CFR variant on a game.
     '''
 
-    def __init__(self, game, minimizer):
+    def __init__(self, game, minimizer, discounting=None):
         '''
         Initializes the Trainer object.
 
         :param game: An implementation of the Game abstract base class.
         :param minimizer: The CFR variant to use, selected from the minimizers directory.
+        :param discounting: A function from minimizers.Discounting, or any function of the iteration returning (positive
+                            regret, negative regret, strategy sum) discount factors, which the minimizer's update applies
+                            after each iteration. Only supported by minimizers with DISCOUNTABLE = True.
         '''
+        if discounting is not None and not getattr(minimizer, 'DISCOUNTABLE', False):
+            raise ValueError('The minimizer does not support discounting')
+
         self.game = game
         self.minimizer = minimizer
+        self.discounting = discounting
+        self.traversals_per_second = None # Measured during the last call to train
+        self.exploitability_history = [] # (iteration, exploitability) pairs measured during the last call to train
+        self.training_summary = None # What the last call to train achieved within its budgets
 
-    def train(self, iterations=1000, display_results=True, display_freq=100, save_results=False, save_freq=100, save_dir=_ROOT_DIR):
+    def train(self, iterations=1000, tree=None, parallel=None, budget=None, report=None, checkpoints=None, resume_from=None, seed=None, precision='double', return_summary=False, **deprecated_options):
         '''
-        Runs the specified CFR minimizer on the game and attempts to solve for the games Nash equilibrium.
+        Runs the specified CFR minimizer on the game and attempts to solve for the games Nash equilibrium. Every option
+        is validated against the minimizer and the other options before anything is built, as described in _validate.
 
-        :param iterations: How many iterations to run the algorithm for.
-        :param display_results: If player expected values and information state average strategies should be printed before
-                                the end of training.
-        :param display_freq: How frequently results should be displayed.
-        :param save_results: If information set objects should be saved.
-        :param save_freq: How many iterations between each save.
-        :param save_dir: The directory to which results should be saved.
-        :return: The dictionary of all InformationSet objects and the expected game value for the first player.
+        :param iterations: How many iterations to run the algorithm for, including those already run by a resumed
+                           checkpoint, or None to run until a time, node or exploitability budget is reached.
+        :param tree: A TrainingOptions.TreeOptions object choosing how the game tree is held in memory. Defaults to
+                     building the whole tree.
+        :param parallel: A TrainingOptions.ParallelOptions object choosing the worker processes and batch size. Defaults
+                         to unbatched traversals in a single process.
+        :param budget: A TrainingOptions.BudgetOptions object giving the time, node and exploitability budgets, and how
+                       often exploitability is measured. Defaults to no budgets.
+        :param report: A TrainingOptions.ReportOptions object choosing what is displayed and measured. Defaults to
+                       printing every average strategy every 100 iterations.
+        :param checkpoints: A TrainingOptions.CheckpointOptions object choosing where and how often checkpoints are
+                            written, or None if nothing is saved.
+        :param resume_from: The path of a checkpoint written by a previous call to train with the same game and
+                            minimizer. Training continues from the information sets, iteration, traverser, expected game
+                            value, and random number generator states stored in the checkpoint, so a run resumed from
+                            iteration n gives the same result as an uninterrupted run.
+        :param seed: The seed of the Sampler used by sampling minimizers. If None, a seed is drawn from np.random.
+        :param precision: The precision of the InfoSetTable: 'double' for float64 arrays, 'mixed' for float32 regrets,
+                          strategies, and reach probabilities with float64 sums, or 'single' for float32 arrays.
+        :param return_summary: If the training summary should be returned as well as stored in training_summary.
+        :param deprecated_options: The keyword arguments train took before its options were grouped into objects, such as
+                                   display_results=False or workers=4. Each is mapped onto the option object listed in
+                                   DEPRECATED_OPTIONS with a DeprecationWarning, and may not be combined with that
+                                   object. Checkpoints are only written if save_results=True.
+        :return: The InfoSetTable of all information sets and the expected game value for the first player, followed by
+                 the training summary described in _summarize if return_summary is True. What training achieved is
+                 always stored in training_summary.
         '''
-        infosets = {}
+        if deprecated_options:
+            tree, parallel, budget, report, checkpoints = self._convert_deprecated_options(deprecated_options, tree, parallel, budget, report, checkpoints)
+
+        infosets, expected_game_value = self._train(iterations, tree, parallel, budget, report, checkpoints, resume_from, seed, precision)
+
+        if return_summary:
+            return infosets, expected_game_value, self.training_summary
+
+        return infosets, expected_game_value
+
+    def _convert_deprecated_options(self, deprecated_options, tree, parallel, budget, report, checkpoints):
+        '''
+        Maps the keyword arguments train used to take onto option objects, warning that they are deprecated.
+
+        :param deprecated_options: The keyword arguments, keyed by their old names in DEPRECATED_OPTIONS.
+        :return: The tree, parallel, budget, report and checkpoints options of train, in that order.
+        '''
+        unknown = sorted(set(deprecated_options) - set(DEPRECATED_OPTIONS))
+
+        if unknown:
+            raise TypeError("train() got an unexpected keyword argument '" + unknown[0] + "'")
+
+        warnings.warn('The ' + ', '.join(sorted(deprecated_options)) + ' arguments of Trainer.train are deprecated. Use the '
+                      'option objects in TrainingOptions instead.', DeprecationWarning, stacklevel=3)
+
+        options = {'tree': tree, 'parallel': parallel, 'budget': budget, 'report': report, 'checkpoints': checkpoints}
+        option_types = {'tree': TreeOptions, 'parallel': ParallelOptions, 'budget': BudgetOptions, 'report': ReportOptions, 'checkpoints': CheckpointOptions}
+
+        for name, option_type in option_types.items():
+            arguments = {DEPRECATED_OPTIONS[old][1]: value for old, value in deprecated_options.items() if DEPRECATED_OPTIONS[old][0] == name}
+
+            if not arguments:
+                continue
+
+            if options[name] is not None:
+                raise ValueError('Deprecated arguments cannot be combined with the ' + name + ' option object they map onto')
+
+            if name == 'checkpoints': # Like before, save_dir and save_freq do nothing unless save_results is set
+                if not arguments.pop('save_results', False):
+                    continue
+
+            options[name] = option_type(**arguments)
+
+        return options['tree'], options['parallel'], options['budget'], options['report'], options['checkpoints']
+
+    def _train(self, iterations, tree, parallel, budget, report, checkpoints, resume_from, seed, precision):
+        '''
+        Runs train once its deprecated arguments have been mapped onto option objects. The parameters are those of train.
+
+        :return: The InfoSetTable of all information sets and the expected game value for the first player.
+        '''
+        train_start = time.perf_counter()
+        tree = tree or TreeOptions()
+        parallel = parallel or ParallelOptions()
+        budget = budget or BudgetOptions()
+        report = report or ReportOptions()
+        self._validate(iterations, tree, parallel, budget)
+
+        recorder = MetricsRecorder(report.metrics or [], report.metrics_freq) if report.metrics is not None or budget.nodes is not None else NullRecorder()
         expected_game_value = 0  # The expected value the player will win following the nash equilibrium (average strategy)
-        traverser = 0
-        starting_node = self.game.build_game_tree()  # The GameNode object representing the root of the game tree
+        start = 0 # The number of iterations already run
+        infosets = InfoSetTable(precision)
+        sampling = getattr(self.minimizer, 'SAMPLING', False)
+        sampler = Sampler(seed if seed is not None else np.random.randint(2 ** 31)) if sampling else None
+        batched = parallel.batch_size > 1
+        traverse = self.minimizer.cfr_state if tree.tree_free else self.minimizer.cfr_compiled if tree.compiled else self.minimizer.cfr
 
-        for i in tqdm(range(iterations)):
-            reach_probs = np.ones(self.game.num_players)
-            chance_prob = 1
+        if resume_from is not None:
+            infosets, state = load_checkpoint(resume_from, precision)
+            start, expected_game_value = self._restore_state(state, infosets, sampler)
 
-            if self.minimizer.ALTERNATING == True:
-                expected_game_value += self.minimizer.cfr(self.game, starting_node, infosets, reach_probs, chance_prob, i + 1, traverser)
+        if tree.tree_free: # Information sets are added to the table as they are first visited
+            starting_node = GameState(self.game)
 
-            else:
-                expected_game_value += self.minimizer.cfr(self.game, starting_node, infosets, reach_probs, chance_prob, i + 1)
+        elif tree.lazy: # Information sets are added to the table as the nodes of the tree are created
+            starting_node = LazyTree(self.game, tree.lazy_tree_size, infosets).root
 
-            self.minimizer.update(infosets)
-            traverser = (traverser + 1) % 2
+        else:
+            starting_node = self.game.build_game_dag() if tree.build_dag else self.game.build_game_tree()  # The GameNode object representing the root of the game tree
 
-            if i > 0 and display_results and i % display_freq == 0:
-                self._print_results(infosets, expected_game_value, (i + 1))
+            if getattr(self.minimizer, 'COMPILED', False) or batched or tree.compiled: # Vectorized minimizers traverse a flat, array-backed game tree
+                starting_node = CompiledTree(self.game, starting_node)
 
-            if i > 0 and save_results and i % save_freq == 0:
-                name = 'results_' + str(i) + '.pickle'
-                path = os.path.join(save_dir, name)
+            else: # Compute every information set key once, rather than on every visit
+                infosets.intern_tree(self.game, starting_node)
 
-                with open(path, 'wb') as file:
-                    pickle.dump(infosets, file, protocol=pickle.HIGHEST_PROTOCOL)
+        checkpointer = Checkpointer(checkpoints.save_dir) if checkpoints is not None else None
+        evaluator = None
+        self.exploitability_history = []
 
-        if save_results:
-            name = 'results_final.pickle'
-            path = os.path.join(save_dir, name)
+        if budget.exploitability_freq is not None: # Created before any worker pool, since it adds every information set to the table
+            evaluation_tree = starting_node if isinstance(starting_node, CompiledTree) else CompiledTree(self.game, starting_node)
+            evaluator = BestResponse(evaluation_tree, infosets)
 
-            with open(path, 'wb') as file:
-                pickle.dump(infosets, file, protocol=pickle.HIGHEST_PROTOCOL)
+        reporter = None
 
-        if display_results:
-            self._print_results(infosets, expected_game_value, iterations)
+        if report.summary:
+            reporter = ResultsReporter(infosets, self.game.action_map, report.summary if callable(report.summary) else None)
+
+        total = iterations # Shown by the progress bar
+        iterations = iterations if iterations is not None else sys.maxsize
+
+        if parallel.workers > 1 and sampling:
+            return self._train_sampling(starting_node, infosets, start, iterations, total, sampler, expected_game_value, parallel, budget, report, checkpoints, checkpointer, evaluator, recorder, reporter, train_start)
+
+        sampler_args = {'sampler': sampler} if sampling else {}
+        update_args = {'discounting': self.discounting} if self.discounting is not None else {}
+
+        pool = None
+
+        if parallel.workers > 1:
+            pool = ChanceSplitPool(self.game, starting_node, self.minimizer, infosets, parallel.workers)
+
+        start_time = time.perf_counter()
+        recorder.attach(starting_node, infosets, start, pool is None and not batched, counted=tree.compiled and not batched)
+        stop_reason = None
+        num_nodes = None
+        i = start - 1
+
+        try:
+            for i in tqdm(range(start, iterations), initial=start, total=total):
+                reach_probs = np.ones(self.game.num_players)
+                chance_prob = 1
+                traverser = get_traverser(i + 1)
+                recorder.mark()
+
+                if pool is not None:
+                    expected_game_value += pool.cfr(i + 1, traverser if self.minimizer.ALTERNATING else None)
+
+                elif batched:
+                    expected_game_value += self.minimizer.cfr_batch(self.game, starting_node, infosets, reach_probs, chance_prob, i + 1, sampler, parallel.batch_size) / parallel.batch_size
+
+                elif self.minimizer.ALTERNATING == True:
+                    expected_game_value += traverse(self.game, starting_node, infosets, reach_probs, chance_prob, i + 1, traverser, **sampler_args)
+
+                else:
+                    expected_game_value += traverse(self.game, starting_node, infosets, reach_probs, chance_prob, i + 1, **sampler_args)
+
+                recorder.lap('traverse')
+                recorder.count_touched(infosets)
+                recorder.mark()
+                self.minimizer.update(infosets, i + 1, **update_args)
+                recorder.lap('update')
+
+                if i > 0 and report.display and i % report.display_freq == 0:
+                    with recorder.timed('display'):
+                        self._display_results(reporter, infosets, expected_game_value, (i + 1))
+
+                if i > 0 and checkpointer is not None and i % checkpoints.save_freq == 0:
+                    with recorder.timed('checkpoint'):
+                        checkpointer.save(infosets, i + 1, self._training_state(infosets, i + 1, expected_game_value, sampler))
+
+                if evaluator is not None and (i + 1) % budget.exploitability_freq == 0:
+                    with recorder.timed('evaluation'):
+                        converged = self._converged(evaluator, i + 1, budget.target_exploitability, report.display)
+
+                    if converged:
+                        stop_reason = 'exploitability'
+                        recorder.iteration(i + 1, infosets)
+                        break
+
+                recorder.iteration(i + 1, infosets)
+
+                if (i + 1 - start) % budget.check_freq == 0:
+                    stop_reason = self._exhausted_budget(train_start, budget, recorder.num_nodes(i + 1))
+
+                    if stop_reason is not None:
+                        break
+
+            iterations = i + 1
+            num_nodes = recorder.num_nodes(iterations)
+            self.traversals_per_second = (iterations - start) * parallel.batch_size / (time.perf_counter() - start_time)
+
+        finally:
+            self._close(recorder, i + 1, infosets, pool)
+
+        return self._finish(infosets, iterations, expected_game_value, sampler, report, checkpoints, checkpointer, reporter, train_start, num_nodes, stop_reason)
+
+    def _train_sampling(self, starting_node, infosets, start, iterations, total, sampler, expected_game_value, parallel, budget, report, checkpoints, checkpointer, evaluator, recorder, reporter, train_start):
+        '''
+        Runs a sampling minimizer in a pool of worker processes that merge their regrets into a shared table every
+        sync_interval traversals. Results are displayed and checkpointed at the first merge after each multiple of
+        display_freq, save_freq and exploitability_freq traversals, metrics records are written at the first merge after
+        every metrics_freq traversals, and the time budget is checked at every merge. The option objects are those of
+        train, and the other parameters are the state train has built: the number of iterations and expected game value
+        of a resumed checkpoint, the total iterations shown by the progress bar, which is None if training is unbounded,
+        the Checkpointer, BestResponse evaluator and ResultsReporter, each None if unused, the MetricsRecorder or
+        NullRecorder, and the time training started.
+
+        :return: The InfoSetTable of all information sets and the expected game value for the first player.
+        '''
+        pool = SamplingPool(self.game, starting_node, self.minimizer, infosets, parallel.workers, parallel.sync_interval, sampler)
+        done = start
+
+        recorder.attach(starting_node, infosets, start, False)
+        stop_reason = None
+
+        try:
+            with tqdm(initial=start, total=total) as progress:
+                while done < iterations:
+                    recorder.mark()
+                    num_traversals, value = pool.run(done, iterations - done)
+                    recorder.lap('traverse')
+                    expected_game_value += value
+                    previous, done = done, done + num_traversals
+                    progress.update(num_traversals)
+                    progress.set_postfix(traversals_per_second=int(pool.traversals_per_second()))
+
+                    if report.display and done < iterations and done // report.display_freq > previous // report.display_freq:
+                        with recorder.timed('display'):
+                            self._display_results(reporter, infosets, expected_game_value, done)
+
+                    if checkpointer is not None and done < iterations and done // checkpoints.save_freq > previous // checkpoints.save_freq:
+                        with recorder.timed('checkpoint'):
+                            checkpointer.save(infosets, done, self._training_state(infosets, done, expected_game_value, sampler))
+
+                    if evaluator is not None and done // budget.exploitability_freq > previous // budget.exploitability_freq:
+                        with recorder.timed('evaluation'):
+                            converged = self._converged(evaluator, done, budget.target_exploitability, report.display)
+
+                        if converged:
+                            stop_reason = 'exploitability'
+                            recorder.iteration(done, infosets)
+                            break
+
+                    recorder.iteration(done, infosets)
+                    stop_reason = self._exhausted_budget(train_start, budget, None)
+
+                    if stop_reason is not None:
+                        break
+
+            self.traversals_per_second = pool.traversals_per_second()
+
+        finally:
+            self._close(recorder, done, infosets, pool)
+
+        result = self._finish(infosets, done, expected_game_value, sampler, report, checkpoints, checkpointer, reporter, train_start, None, stop_reason)
+
+        if report.display:
+            print('Sampled traversals per second: ', self.traversals_per_second)
+
+        return result
+
+    def _validate(self, iterations, tree, parallel, budget):
+        '''
+        Raises a ValueError if the options of train cannot be combined with each other or with the minimizer. Options
+        that only conflict with each other are rejected by the option objects themselves. Combinations that are
+        rejected here are:
+
+            An unbounded run: iterations of None without a time, node or exploitability budget.
+            A lazy or tree free traversal by a COMPILED minimizer, in several processes or batches, or with
+            exploitability_freq, which needs the whole tree, or a tree free traversal by a minimizer without cfr_state.
+            A compiled traversal by a minimizer without cfr_compiled, or in several processes.
+            Several workers for a minimizer with neither CHANCE_SPLIT nor SAMPLING, which could only traverse serially.
+            A batch size above one for a minimizer without cfr_batch.
+            A node budget for batched traversals or traversals in several processes, whose nodes cannot be counted.
+
+        :param iterations: The iterations passed to train.
+        :param tree: The TreeOptions passed to train.
+        :param parallel: The ParallelOptions passed to train.
+        :param budget: The BudgetOptions passed to train.
+        '''
+        minimizer = self.minimizer
+
+        if iterations is None and not budget.bounded:
+            raise ValueError('iterations may only be None if training has a time, node or exploitability budget')
+
+        if not tree.in_memory and (getattr(minimizer, 'COMPILED', False) or parallel.workers > 1 or parallel.batch_size > 1 or budget.exploitability_freq is not None):
+            raise ValueError('Lazy trees and tree free traversals are only supported in a single process by minimizers that traverse GameNode objects, without exploitability_freq')
+
+        if tree.tree_free and not hasattr(minimizer, 'cfr_state'):
+            raise ValueError('The minimizer does not support tree free traversals')
+
+        if tree.compiled and (not hasattr(minimizer, 'cfr_compiled') or parallel.workers > 1):
+            raise ValueError('Compiled traversals are only supported in a single process by minimizers with a cfr_compiled function')
+
+        if parallel.workers > 1 and not (getattr(minimizer, 'CHANCE_SPLIT', False) or getattr(minimizer, 'SAMPLING', False)):
+            raise ValueError('The minimizer does not support training in several processes')
+
+        if parallel.batch_size > 1 and not hasattr(minimizer, 'cfr_batch'):
+            raise ValueError('The minimizer does not support batched traversals')
+
+        if budget.nodes is not None and (parallel.workers > 1 or parallel.batch_size > 1):
+            raise ValueError('Node budgets are only supported for unbatched traversals in a single process')
+
+    def _close(self, recorder, iterations, infosets, pool):
+        '''
+        Detaches the recorder and closes the worker pool, if any. Called whether or not training finished normally.
+
+        :param recorder: The MetricsRecorder or NullRecorder of the run.
+        :param iterations: The number of iterations run.
+        :param infosets: The InfoSetTable being trained.
+        :param pool: The ChanceSplitPool or SamplingPool, or None.
+        '''
+        try:
+            recorder.detach(iterations, infosets)
+
+        finally:
+            if pool is not None:
+                pool.close()
+
+    def _finish(self, infosets, iterations, expected_game_value, sampler, report, checkpoints, checkpointer, reporter, train_start, num_nodes, stop_reason):
+        '''
+        Writes the final checkpoint and results, displays the final results, waits for the reporter, and stores the
+        training summary. Shared by every way train runs.
+
+        :param infosets: The InfoSetTable being trained.
+        :param iterations: The number of iterations run, including those run by a resumed checkpoint.
+        :param expected_game_value: The running sum of the first player's utility.
+        :param sampler: The Sampler of a sampling minimizer, or None.
+        :param report: The ReportOptions of the run.
+        :param checkpoints: The CheckpointOptions of the run, or None.
+        :param checkpointer: The Checkpointer of the run, or None.
+        :param reporter: The ResultsReporter of the run, or None.
+        :param train_start: The time training started, from time.perf_counter.
+        :param num_nodes: The number of node visits, or None if they were not counted.
+        :param stop_reason: What ended training, or None if every iteration was run.
+        :return: The InfoSetTable of all information sets and the expected game value for the first player.
+        '''
+        if checkpointer is not None:
+            checkpointer.save(infosets, iterations, self._training_state(infosets, iterations, expected_game_value, sampler))
+            checkpointer.close()
+            self._save_results(infosets, 'results_final.pickle', checkpoints.save_dir)
+
+        if report.display:
+            self._display_results(reporter, infosets, expected_game_value, iterations)
+
+        if reporter is not None: # Waits for every queued summary to be written
+            reporter.close()
+
+        self.training_summary = self._summarize(train_start, iterations, num_nodes, stop_reason or 'iterations')
 
         return infosets, expected_game_value
 
+    def _exhausted_budget(self, train_start, budget, num_nodes):
+        '''
+        Checks the time and node budgets of training.
+
+        :param train_start: The time training started, from time.perf_counter.
+        :param budget: The BudgetOptions of the run.
+        :param num_nodes: The number of node visits so far, or None if they are not counted.
+        :return: 'time' or 'nodes' if that budget has been used up, else None.
+        '''
+        if budget.time is not None and time.perf_counter() - train_start >= budget.time:
+            return 'time'
+
+        if budget.nodes is not None and num_nodes >= budget.nodes:
+            return 'nodes'
+
+        return None
+
+    def _summarize(self, train_start, iterations, num_nodes, stop_reason):
+        '''
+        Returns a dictionary of what training achieved, with the following fields:
+
+            iterations: The number of iterations run, including those run by a resumed checkpoint.
+            seconds: The wall clock time of the call to train, including building the tree.
+            nodes: The number of node visits, or None if they were not counted. They are counted if metrics or
+                   a node budget are given and traversals are unbatched and in a single process.
+            exploitability: The last exploitability measured, or None if it was not measured.
+            stop_reason: 'iterations', 'time', 'nodes', or 'exploitability', whichever ended training.
+        '''
+        return {
+            'iterations': iterations,
+            'seconds': time.perf_counter() - train_start,
+            'nodes': num_nodes,
+            'exploitability': self.exploitability_history[-1][1] if self.exploitability_history else None,
+            'stop_reason': stop_reason,
+        }
+
+    def _converged(self, evaluator, iteration, target_exploitability, display_results):
+        '''
+        Computes the exploitability of the average strategies and records it in exploitability_history.
+
+        :param evaluator: The BestResponse object evaluating the information set table.
+        :param iteration: The number of iterations completed.
+        :param target_exploitability: The exploitability at which training stops, or None.
+        :param display_results: If the exploitability should be printed.
+        :return: True iff training should stop.
+        '''
+        exploitability = evaluator.exploitability()
+        self.exploitability_history.append((iteration, exploitability))
+
+        if display_results:
+            print('Iteration: ', iteration, ' Exploitability: ', exploitability)
+
+        return target_exploitability is not None and exploitability <= target_exploitability
+
+    def _training_state(self, infosets, iteration, expected_game_value, sampler):
+        '''
+        Returns the state needed to resume training from a checkpoint. The table's minimizer state is copied, since the
+        checkpoint is written on a background thread while training continues.
+
+        :param infosets: The InfoSetTable being trained.
+        :param iteration: The number of iterations completed.
+        :param expected_game_value: The running sum of the first player's utility.
+        :param sampler: The Sampler of a sampling minimizer, or None.
+        :return: A dictionary of training state, including the traverser of the next iteration.
+        '''
+        return {'iteration': iteration, 'traverser': get_traverser(iteration + 1), 'expected_game_value': expected_game_value,
+                'random_state': random.getstate(), 'numpy_random_state': np.random.get_state(),
+                'sampler_state': None if sampler is None else sampler.get_state(),
+                'minimizer_state': copy.deepcopy(infosets.minimizer_state)}
+
+    def _restore_state(self, state, infosets, sampler):
+        '''
+        Restores the random number generator states and the minimizer state stored by _training_state.
+
+        :param state: A dictionary of training state loaded from a checkpoint.
+        :param infosets: The InfoSetTable loaded from the checkpoint.
+        :param sampler: The Sampler of a sampling minimizer, or None.
+        :return: The number of iterations completed and the expected game value.
+        '''
+        random.setstate(state['random_state'])
+        np.random.set_state(state['numpy_random_state'])
+
+        if sampler is not None and state['sampler_state'] is not None:
+            sampler.set_state(state['sampler_state'])
+
+        infosets.minimizer_state = state.get('minimizer_state') # Absent from checkpoints written before it was stored
+
+        return state['iteration'], state['expected_game_value']
+
+    def _save_results(self, infosets, name, save_dir):
+        '''
+        Pickles the InfoSetTable to a file in the save directory.
+
+        :param infosets: The InfoSetTable containing all of the information sets traversed by the Trainer.
+        :param name: The name of the file.
+        :param save_dir: The directory to which results should be saved.
+        '''
+        path = os.path.join(save_dir, name)
+
+        with open(path, 'wb') as file:
+            pickle.dump(infosets, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _display_results(self, reporter, infosets, expected_game_value, num_iterations):
+        '''
+        Prints every average strategy if reporter is None, else queues a summary on the reporter.
+
+        :param reporter: The ResultsReporter, or None.
+        :param infosets: The InfoSetTable containing all of the information sets traversed by the Trainer.
+        :param expected_game_value: The expected value of the first player.
+        :param num_iterations: What iteration of training the algorithm is on.
+        '''
+        if reporter is None:
+            self._print_results(infosets, expected_game_value, num_iterations)
+
+        else:
+            reporter.submit(expected_game_value, num_iterations)
+
     def _print_results(self, infosets, expected_game_value, num_iterations):
         '''
         Prints the expected game value for each player and the average strategy for each information set.
 
-        :param infosets: A dictionary containing all of the InformationSet objects traversed by the Trainer.
+        :param infosets: The InfoSetTable containing all of the information sets traversed by the Trainer.
         :param expected_game_value: The expected value of the first player.
         :param num_iterations: What iteration of training the algorithm is on.
         '''
@@ -0,0 +1,160 @@
+import os
+
+class TreeOptions:
+    '''
+    How the game tree is held in memory while training. By default the whole tree is built with game.build_game_tree.
+    At most one of build_dag, lazy_tree_size and tree_free may be given, and compiled may not be combined with
+    lazy_tree_size or tree_free.
+    '''
+
+    def __init__(self, build_dag=False, lazy_tree_size=None, tree_free=False, compiled=False):
+        '''
+        :param build_dag: If the game tree should be built with game.build_game_dag, which builds the subtrees of histories
+                          with the same canonical state once.
+        :param lazy_tree_size: If not None, the game tree is not built up front. Instead, nodes are created from the game's
+                               rules the first time they are visited, and the children of at most lazy_tree_size of the
+                               most recently visited nodes are kept in memory. Suits sampling minimizers on trees too large
+                               to build.
+        :param tree_free: If the game should be traversed with a GameState cursor, which keeps only the path to the current
+                          state in memory and never creates GameNode objects, instead of a game tree. Requires a
+                          minimizer with a cfr_state function.
+        :param compiled: If the game tree should be flattened into a CompiledTree once built, and traversed by the
+                         minimizer's cfr_compiled function, which indexes the flat node arrays instead of following
+                         GameNode objects. Requires a minimizer with a cfr_compiled function. COMPILED minimizers always
+                         traverse a CompiledTree.
+        '''
+        if build_dag + (lazy_tree_size is not None) + tree_free > 1:
+            raise ValueError('Only one of build_dag, lazy_tree_size and tree_free may be given')
+
+        if lazy_tree_size is not None and lazy_tree_size < 1:
+            raise ValueError('lazy_tree_size must be at least 1')
+
+        if compiled and (lazy_tree_size is not None or tree_free):
+            raise ValueError('compiled may not be combined with lazy_tree_size or tree_free')
+
+        self.build_dag = build_dag
+        self.lazy_tree_size = lazy_tree_size
+        self.tree_free = tree_free
+        self.compiled = compiled
+
+    @property
+    def lazy(self):
+        return self.lazy_tree_size is not None
+
+    @property
+    def in_memory(self):
+        '''
+        True iff the whole game tree is built before training.
+        '''
+        return not (self.lazy or self.tree_free)
+
+class ParallelOptions:
+    '''
+    How traversals are spread over processes and batches.
+    '''
+
+    def __init__(self, workers=1, sync_interval=100, batch_size=1):
+        '''
+        :param workers: The number of processes to traverse the game tree with. Minimizers with CHANCE_SPLIT = True split
+                        the subtrees below the root chance nodes between the workers. Minimizers with SAMPLING = True
+                        sample independent traversals in each worker, and each iteration is one sampled traversal.
+        :param sync_interval: How many traversals each worker of a sampling minimizer runs between merges of its regrets
+                              into the shared table.
+        :param batch_size: How many trajectories minimizers with a cfr_batch function sample in lockstep per iteration.
+        '''
+        if workers < 1 or sync_interval < 1 or batch_size < 1:
+            raise ValueError('workers, sync_interval and batch_size must be at least 1')
+
+        if workers > 1 and batch_size > 1:
+            raise ValueError('Batched traversals are only supported in a single process')
+
+        self.workers = workers
+        self.sync_interval = sync_interval
+        self.batch_size = batch_size
+
+class BudgetOptions:
+    '''
+    When training stops before its iterations are run, and how often exploitability is measured.
+    '''
+
+    def __init__(self, time=None, nodes=None, target_exploitability=None, exploitability_freq=None, check_freq=10):
+        '''
+        :param time: The number of seconds after which training stops, counted from the start of the call to train, so
+                     that building the tree counts against the budget. Checked every check_freq iterations.
+        :param nodes: The number of node visits after which training stops, counted as described in
+                      Metrics.MetricsRecorder. Checked every check_freq iterations. Only supported for unbatched
+                      traversals in a single process.
+        :param target_exploitability: If not None, training stops once the exploitability is at most this value.
+                                      Requires exploitability_freq.
+        :param exploitability_freq: If not None, the exploitability of the average strategies is computed exactly every
+                                    exploitability_freq iterations and recorded in Trainer.exploitability_history.
+                                    Requires the whole game tree in memory.
+        :param check_freq: How many iterations to run between each check of time and nodes. Sampling pools check the
+                           budgets at every merge instead.
+        '''
+        if target_exploitability is not None and exploitability_freq is None:
+            raise ValueError('target_exploitability requires exploitability_freq')
+
+        if check_freq < 1 or (exploitability_freq is not None and exploitability_freq < 1):
+            raise ValueError('check_freq and exploitability_freq must be at least 1')
+
+        self.time = time
+        self.nodes = nodes
+        self.target_exploitability = target_exploitability
+        self.exploitability_freq = exploitability_freq
+        self.check_freq = check_freq
+
+    @property
+    def bounded(self):
+        '''
+        True iff training stops on a budget without an iteration count.
+        '''
+        return self.time is not None or self.nodes is not None or self.target_exploitability is not None
+
+class ReportOptions:
+    '''
+    What is displayed and measured while training.
+    '''
+
+    def __init__(self, display=True, display_freq=100, summary=False, metrics=None, metrics_freq=1):
+        '''
+        :param display: If player expected values and information state average strategies should be printed before the
+                        end of training.
+        :param display_freq: How frequently results should be displayed.
+        :param summary: If True, displayed results are summary statistics of the table computed on a background thread
+                        by a Reporting.ResultsReporter, instead of the average strategy of every information set. If
+                        callable, it is called with each summary instead of printing it. Requires display.
+        :param metrics: A sink or list of sinks to write metrics records to, such as a Metrics.JSONLSink. A sink may be any
+                        callable taking a record dictionary. Records report the time spent in each phase of training, the
+                        nodes and information sets visited, and memory growth, as described in Metrics.MetricsRecorder.
+                        Nothing is measured if None.
+        :param metrics_freq: How many iterations each metrics record covers.
+        '''
+        if summary and not display:
+            raise ValueError('Summaries are only computed when results are displayed')
+
+        if display_freq < 1 or metrics_freq < 1:
+            raise ValueError('display_freq and metrics_freq must be at least 1')
+
+        self.display = display
+        self.display_freq = display_freq
+        self.summary = summary
+        self.metrics = metrics
+        self.metrics_freq = metrics_freq
+
+class CheckpointOptions:
+    '''
+    Where and how often training is checkpointed. Incremental checkpoints are written to save_dir every save_freq
+    iterations and at the end of training, and the final table is also pickled to results_final.pickle.
+    '''
+
+    def __init__(self, save_dir=None, save_freq=100):
+        '''
+        :param save_dir: The directory to which results should be saved. Defaults to the working directory.
+        :param save_freq: How many iterations between each checkpoint.
+        '''
+        if save_freq < 1:
+            raise ValueError('save_freq must be at least 1')
+
+        self.save_dir = save_dir if save_dir is not None else os.getcwd()
+        self.save_freq = save_freq
@@ -1,2 +1,10 @@
+from .Checkpoint import Checkpointer, load_checkpoint
+from .Exploitability import BestResponse, exploitability
 from .InfoSet import InformationSet
-from .Trainer import Trainer
\ No newline at end of file
+from .InfoSetTable import InfoSetTable
+from .Metrics import JSONLSink, MetricsRecorder
+from .Policy import Policy
+from .PolicyServer import PolicyServer
+from .Reporting import ResultsReporter
+from .Trainer import Trainer
+from .TrainingOptions import BudgetOptions, CheckpointOptions, ParallelOptions, ReportOptions, TreeOptions
\ No newline at end of file
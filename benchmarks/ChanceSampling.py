@@ -0,0 +1,93 @@
+'''
+Compares the convergence of ChanceSampling with VanillaCFR and MCCFR_External per second of training on Kuhn poker and
+bucketed Texas Hold-Em. Each minimizer is trained for the same wall clock budget on each game, and the exploitability of
+its average strategies is measured at evenly spaced times. The time spent measuring exploitability is not counted.
+
+Run from the directory containing the openCFR package:
+
+    python -m openCFR.benchmarks.ChanceSampling --seconds 30
+'''
+
+import argparse
+import numpy as np
+import random
+import time
+
+from ..Exploitability import BestResponse
+from ..InfoSetTable import InfoSetTable
+from ..games import CompiledTree
+from ..games.sample_games import Kuhn, TexasHoldEm
+from ..minimizers import ChanceSampling, MCCFR_External, VanillaCFR
+from ..minimizers.Sampler import Sampler
+
+MINIMIZERS = (VanillaCFR, ChanceSampling, MCCFR_External)
+
+def benchmark(game, minimizer, seconds, num_measurements, seed):
+    '''
+    Trains a minimizer on a game for a number of seconds.
+
+    :param game: An implementation of the Game abstract base class.
+    :param minimizer: The minimizer module to train.
+    :param seconds: The training time budget, excluding time spent measuring exploitability.
+    :param num_measurements: How many times to measure exploitability, evenly spaced over the budget.
+    :param seed: The seed of the random number generators.
+    :return: A list of (seconds, iterations, exploitability) tuples.
+    '''
+    np.random.seed(seed)
+    random.seed(seed)
+
+    root = game.build_game_tree()
+
+    infosets = InfoSetTable()
+    infosets.intern_tree(game, root)
+    evaluator = BestResponse(CompiledTree(game, root), infosets)
+    sampler_args = {'sampler': Sampler(seed)} if getattr(minimizer, 'SAMPLING', False) else {}
+    results = []
+    elapsed = 0
+    iteration = 0
+    traverser = 0
+
+    for measurement in range(1, num_measurements + 1):
+        start = time.perf_counter()
+
+        while elapsed + time.perf_counter() - start < seconds * measurement / num_measurements:
+            reach_probs = np.ones(game.num_players)
+            iteration += 1
+
+            if minimizer.ALTERNATING:
+                minimizer.cfr(game, root, infosets, reach_probs, 1, iteration, traverser, **sampler_args)
+                traverser = (traverser + 1) % 2
+
+            else:
+                minimizer.cfr(game, root, infosets, reach_probs, 1, iteration, **sampler_args)
+
+            minimizer.update(infosets, iteration)
+
+        elapsed += time.perf_counter() - start
+        results.append((elapsed, iteration, evaluator.exploitability()))
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares ChanceSampling with VanillaCFR and MCCFR_External.')
+    parser.add_argument('--seconds', type=float, default=10, help='The training time budget of each minimizer on each game.')
+    parser.add_argument('--measurements', type=int, default=5, help='How many times to measure exploitability.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the random number generators.')
+    args = parser.parse_args()
+
+    games = [('Kuhn', Kuhn()), ('TexasHoldEm(1, 2, 8)', TexasHoldEm(1, 2, 8))]
+
+    for game_name, game in games:
+        print(game_name)
+        print('{:<16}{:>10}{:>12}{:>16}'.format('Minimizer', 'Seconds', 'Iterations', 'Exploitability'))
+
+        for minimizer in MINIMIZERS:
+            name = minimizer.__name__.rsplit('.', 1)[-1]
+
+            for seconds, iterations, exploitability in benchmark(game, minimizer, args.seconds, args.measurements, args.seed):
+                print('{:<16}{:>10.2f}{:>12}{:>16.6f}'.format(name, seconds, iterations, exploitability))
+
+        print()
+
+if __name__ == '__main__':
+    main()
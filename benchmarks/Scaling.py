@@ -0,0 +1,92 @@
+'''
+Measures how the wall clock time of training scales with the number of worker processes, for full width minimizers
+split between a ChanceSplitPool on bucketed Texas Hold-Em and sampling minimizers run in a SamplingPool on Kuhn poker.
+Each minimizer is trained for the same number of iterations with every worker count, and the time of the call to train,
+its speedup over the first worker count, and the exploitability of the result are printed, together with the number of
+CPU cores available.
+
+Run from the directory containing the openCFR package:
+
+    python -m openCFR.benchmarks.Scaling --workers 1 2 4
+'''
+
+import argparse
+import numpy as np
+import os
+import random
+import time
+
+from .. import minimizers
+from ..Exploitability import exploitability
+from ..Trainer import Trainer
+from ..TrainingOptions import ParallelOptions, ReportOptions
+from ..games import CompiledTree
+from ..games.sample_games import Kuhn, TexasHoldEm
+
+# (pool, minimizer, game, iterations) of each run. texas:<stack> is TexasHoldEm(1, 2, stack)
+CASES = (
+    ('chance_split', 'CFRPlus', 'texas:8', 50),
+    ('chance_split', 'VanillaCFR', 'texas:8', 50),
+    ('sampling', 'MCCFR_External', 'kuhn', 200000),
+    ('sampling', 'MCCFR_Outcome', 'kuhn', 200000),
+)
+
+def make_game(name):
+    '''
+    Returns the game described by a name from CASES.
+    '''
+    if name == 'kuhn':
+        return Kuhn()
+
+    if name.startswith('texas:'):
+        return TexasHoldEm(1, 2, int(name.split(':')[1]))
+
+    raise ValueError('Unknown game: ' + name)
+
+def benchmark(game, minimizer, iterations, workers, sync_interval, seed):
+    '''
+    Trains a minimizer on a game with a number of workers.
+
+    :param game: An implementation of the Game abstract base class.
+    :param minimizer: The minimizer module to train.
+    :param iterations: How many iterations to train for.
+    :param workers: The number of worker processes.
+    :param sync_interval: How many traversals each sampling worker runs between merges.
+    :param seed: The seed of the random number generators.
+    :return: The seconds taken by the call to train, the traversals per second, and the InfoSetTable.
+    '''
+    np.random.seed(seed)
+    random.seed(seed)
+    trainer = Trainer(game, minimizer)
+    start = time.perf_counter()
+    infosets, _ = trainer.train(iterations, parallel=ParallelOptions(workers, sync_interval), report=ReportOptions(display=False), seed=seed)
+
+    return time.perf_counter() - start, trainer.traversals_per_second, infosets
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures how training scales with the number of worker processes.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='The worker counts to measure.')
+    parser.add_argument('--pools', nargs='+', default=['chance_split', 'sampling'], choices=['chance_split', 'sampling'], help='Which worker pools to measure.')
+    parser.add_argument('--sync-interval', type=int, default=1000, help='How many traversals sampling workers run between merges.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the random number generators.')
+    args = parser.parse_args()
+
+    print('CPU cores:', os.cpu_count(), ' usable:', len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count())
+    print('{:<14}{:<16}{:<10}{:>12}{:>9}{:>10}{:>16}{:>16}'.format('Pool', 'Minimizer', 'Game', 'Iterations', 'Workers', 'Seconds', 'Speedup', 'Exploitability'))
+
+    for mode, minimizer_name, game_name, iterations in CASES:
+        if mode not in args.pools:
+            continue
+
+        minimizer = getattr(minimizers, minimizer_name)
+        game = make_game(game_name)
+        tree = CompiledTree(game, game.build_game_tree())
+        baseline = None
+
+        for workers in args.workers:
+            seconds, _, infosets = benchmark(game, minimizer, iterations, workers, args.sync_interval, args.seed)
+            baseline = baseline or seconds
+            print('{:<14}{:<16}{:<10}{:>12}{:>9}{:>10.2f}{:>15.2f}x{:>16.6f}'.format(mode, minimizer_name, game_name, iterations, workers, seconds, baseline / seconds, exploitability(game, tree, infosets)), flush=True)
+
+if __name__ == '__main__':
+    main()
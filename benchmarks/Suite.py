@@ -0,0 +1,282 @@
+'''
+Benchmarks every minimizer on every sample game and on larger parametrized games, and writes the results as JSON so
+that the results of two releases can be compared. For each minimizer and game, the tree build time, the number of
+iterations, nodes, and information sets traversed per second, the peak resident set size, the bytes used per
+information set, and the exploitability of the average strategies at evenly spaced wall clock times are recorded. Each
+case runs in a fresh process, so peak memory is measured per case.
+
+Nodes per second are measured by counting the nodes visited on a few extra iterations after the timed run, since
+counting slows traversals down. Compiled minimizers visit the whole tree on every iteration.
+
+The peak resident set size is that of training alone. The average strategies at each measurement are written to
+temporary files, and the CompiledTree and BestResponse evaluator that compute their exploitability are only built once
+the peak has been read, since they can take more memory than training itself. Only compiled minimizers train on a
+CompiledTree.
+
+Run from the directory containing the openCFR package:
+
+    python -m openCFR.benchmarks.Suite --seconds 10 --output results.json
+    python -m openCFR.benchmarks.Suite --games kuhn texas:8 --minimizers VanillaCFR CFRPlus --compare results.json
+'''
+
+import argparse
+import json
+import multiprocessing
+import numpy as np
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from .. import minimizers
+from ..Exploitability import BestResponse
+from ..InfoSetTable import PRECISIONS, InfoSetTable
+from ..games import CompiledTree, NodeCounter
+from ..games.sample_games import Kuhn, RPS, TexasHoldEm
+from ..minimizers.Alternation import get_traverser
+from ..minimizers.Sampler import Sampler
+
+MINIMIZERS = ('VanillaCFR', 'CFRPlus', 'LinearCFR', 'DCFR', 'RBP_CFR', 'ChanceSampling', 'MCCFR_External', 'MCCFR_Outcome', 'VectorizedCFR', 'VectorizedCFRPlus')
+GAMES = ('rps', 'kuhn', 'texas:8', 'texas:14') # texas:<stack> is TexasHoldEm(1, 2, stack)
+COUNTED_ITERATIONS = 20 # How many extra iterations are traversed to count the nodes visited per iteration
+
+def make_game(name):
+    '''
+    Returns the game described by a name from GAMES.
+    '''
+    if name == 'rps':
+        return RPS()
+
+    if name == 'kuhn':
+        return Kuhn()
+
+    if name.startswith('texas:'):
+        return TexasHoldEm(1, 2, int(name.split(':')[1]))
+
+    raise ValueError('Unknown game: ' + name)
+
+def _peak_rss():
+    '''
+    Returns the peak resident set size of the process in bytes.
+    '''
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak if sys.platform == 'darwin' else peak * 1024 # Reported in kilobytes on Linux
+
+def _save_average_strategy(infosets, directory):
+    '''
+    Writes the strategy sums and reach probability sums of every block of a table to a new directory, so that the
+    average strategies can be evaluated after training without keeping copies of the table in memory.
+    '''
+    os.makedirs(directory)
+
+    for num_actions, block in infosets.blocks.items():
+        np.save(os.path.join(directory, '{}_strategy_sum.npy'.format(num_actions)), block.strategy_sum[:block.size])
+        np.save(os.path.join(directory, '{}_reach_prob_sum.npy'.format(num_actions)), block.reach_prob_sum[:block.size])
+
+def _load_average_strategy(infosets, directory):
+    '''
+    Overwrites the strategy sums and reach probability sums of a table with those written by _save_average_strategy.
+    '''
+    for num_actions, block in infosets.blocks.items():
+        strategy_sum = np.load(os.path.join(directory, '{}_strategy_sum.npy'.format(num_actions)))
+        block.strategy_sum[:len(strategy_sum)] = strategy_sum
+        block.reach_prob_sum[:len(strategy_sum)] = np.load(os.path.join(directory, '{}_reach_prob_sum.npy'.format(num_actions)))
+
+def _traverse(minimizer, game, root, infosets, iteration, sampler_args):
+    reach_probs = np.ones(game.num_players)
+
+    if minimizer.ALTERNATING:
+        minimizer.cfr(game, root, infosets, reach_probs, 1, iteration, get_traverser(iteration), **sampler_args)
+
+    else:
+        minimizer.cfr(game, root, infosets, reach_probs, 1, iteration, **sampler_args)
+
+def run_case(game_name, minimizer_name, seconds, num_measurements, seed, precision='double'):
+    '''
+    Trains a minimizer on a game for a number of seconds and measures its performance.
+
+    :param game_name: The name of the game, from GAMES.
+    :param minimizer_name: The name of a module in minimizers.
+    :param seconds: The training time budget, excluding time spent measuring exploitability.
+    :param num_measurements: How many times to measure exploitability, evenly spaced over the budget.
+    :param seed: The seed of the random number generators.
+    :param precision: The precision of the InfoSetTable, from InfoSetTable.PRECISIONS.
+    :return: A dictionary of the results.
+    '''
+    np.random.seed(seed)
+    random.seed(seed)
+    minimizer = getattr(minimizers, minimizer_name)
+    game = make_game(game_name)
+    baseline_rss = _peak_rss()
+
+    start = time.perf_counter()
+    root = game.build_game_tree()
+    build_seconds = time.perf_counter() - start
+
+    compiled = getattr(minimizer, 'COMPILED', False)
+    infosets = InfoSetTable(precision)
+    tree = CompiledTree(game, root) if compiled else None
+
+    if not compiled:
+        infosets.intern_tree(game, root)
+
+    traversed = tree if compiled else root
+    sampler_args = {'sampler': Sampler(seed)} if getattr(minimizer, 'SAMPLING', False) else {}
+    curve = []
+    elapsed = 0
+    iteration = 0
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        for measurement in range(1, num_measurements + 1):
+            start = time.perf_counter()
+
+            while elapsed + time.perf_counter() - start < seconds * measurement / num_measurements:
+                iteration += 1
+                _traverse(minimizer, game, traversed, infosets, iteration, sampler_args)
+                minimizer.update(infosets, iteration)
+
+            elapsed += time.perf_counter() - start
+            curve.append({'seconds': elapsed, 'iterations': iteration})
+            _save_average_strategy(infosets, os.path.join(snapshot_dir, str(measurement)))
+
+        if compiled:
+            nodes_per_iteration = tree.num_nodes
+            infosets_per_iteration = len(infosets)
+
+        else:
+            touched = 0
+
+            with NodeCounter(infosets) as counter:
+                for i in range(iteration + 1, iteration + COUNTED_ITERATIONS + 1):
+                    _traverse(minimizer, game, root, infosets, i, sampler_args)
+                    touched += sum(int(np.count_nonzero(block.touched[:block.size])) for block in infosets.blocks.values())
+                    minimizer.update(infosets, i)
+
+            nodes_per_iteration = sum(counter.counts) / COUNTED_ITERATIONS
+            infosets_per_iteration = touched / COUNTED_ITERATIONS
+
+        peak_rss = _peak_rss() # Before the evaluator is built
+        tree = tree if compiled else CompiledTree(game, root)
+        evaluator = BestResponse(tree, infosets)
+
+        for measurement, point in enumerate(curve, 1):
+            _load_average_strategy(infosets, os.path.join(snapshot_dir, str(measurement)))
+            point['exploitability'] = evaluator.exploitability()
+
+    iterations_per_second = iteration / elapsed
+
+    return {
+        'game': game_name,
+        'minimizer': minimizer_name,
+        'precision': precision,
+        'build_seconds': build_seconds,
+        'num_nodes': int(tree.num_nodes),
+        'num_infosets': len(infosets),
+        'iterations': iteration,
+        'iterations_per_second': iterations_per_second,
+        'nodes_per_second': nodes_per_iteration * iterations_per_second,
+        'infosets_per_second': infosets_per_iteration * iterations_per_second,
+        'peak_rss_bytes': peak_rss,
+        'baseline_rss_bytes': baseline_rss,
+        'table_bytes': infosets.nbytes(),
+        'bytes_per_infoset': infosets.nbytes() / max(len(infosets), 1),
+        'exploitability': curve,
+    }
+
+def run_suite(games=GAMES, minimizer_names=MINIMIZERS, seconds=10, num_measurements=5, seed=0, display=True, precision='double'):
+    '''
+    Runs every minimizer on every game, each in a fresh process.
+
+    :return: A dictionary of the environment the suite ran in and a list of the results of each case.
+    '''
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    for game_name in games:
+        for minimizer_name in minimizer_names:
+            with context.Pool(1) as pool:
+                result = pool.apply(run_case, (game_name, minimizer_name, seconds, num_measurements, seed, precision))
+
+            results.append(result)
+
+            if display:
+                print('{:<12}{:<20}{:>10.0f} it/s{:>14.0f} nodes/s{:>10.0f} MB{:>14.6f}'.format(
+                    game_name, minimizer_name, result['iterations_per_second'], result['nodes_per_second'],
+                    result['peak_rss_bytes'] / 1e6, result['exploitability'][-1]['exploitability']), flush=True)
+
+    environment = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seconds': seconds,
+        'seed': seed,
+        'precision': precision,
+    }
+
+    return {'environment': environment, 'results': results}
+
+def compare(baseline, suite, tolerance=0.2):
+    '''
+    Finds the cases whose throughput or peak memory regressed by more than a fraction of the baseline.
+
+    :param baseline: The output of run_suite for the previous release, as loaded from JSON.
+    :param suite: The output of run_suite for the current release.
+    :param tolerance: The largest fraction by which a metric may get worse before it counts as a regression.
+    :return: A list of (game, minimizer, metric, baseline value, current value) tuples.
+    '''
+    previous = {(result['game'], result['minimizer']): result for result in baseline['results']}
+    regressions = []
+
+    for result in suite['results']:
+        old = previous.get((result['game'], result['minimizer']))
+
+        if old is None:
+            continue
+
+        for metric in ('iterations_per_second', 'nodes_per_second'):
+            if result[metric] < old[metric] * (1 - tolerance):
+                regressions.append((result['game'], result['minimizer'], metric, old[metric], result[metric]))
+
+        for metric in ('peak_rss_bytes', 'build_seconds'):
+            if result[metric] > old[metric] * (1 + tolerance):
+                regressions.append((result['game'], result['minimizer'], metric, old[metric], result[metric]))
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks every minimizer on every sample game.')
+    parser.add_argument('--games', nargs='+', default=list(GAMES), help='The games to run, from: rps, kuhn, texas:<stack>.')
+    parser.add_argument('--minimizers', nargs='+', default=list(MINIMIZERS), help='The minimizers to run.')
+    parser.add_argument('--seconds', type=float, default=10, help='The training time budget of each minimizer on each game.')
+    parser.add_argument('--measurements', type=int, default=5, help='How many times to measure exploitability.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the random number generators.')
+    parser.add_argument('--precision', default='double', choices=list(PRECISIONS), help='The precision of the information set table.')
+    parser.add_argument('--output', help='The path of the JSON file to write the results to.')
+    parser.add_argument('--compare', help='The path of a JSON file of previous results to check for regressions.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='The fraction by which a metric may regress.')
+    args = parser.parse_args()
+
+    suite = run_suite(args.games, args.minimizers, args.seconds, args.measurements, args.seed, precision=args.precision)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(suite, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), suite, args.tolerance)
+
+        for game_name, minimizer_name, metric, old, new in regressions:
+            print('Regression: {} {} {} {:.4g} -> {:.4g}'.format(game_name, minimizer_name, metric, old, new))
+
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
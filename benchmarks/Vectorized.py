@@ -0,0 +1,105 @@
+'''
+Measures the time per iteration of the vectorized minimizers against the recursive minimizers they reproduce. Each
+iteration is one traversal followed by the minimizer's update, as in Trainer.train, without building the tree or
+measuring anything else. Iterations are timed in blocks, the blocks of the two minimizers of a pair alternate so that
+both see the same load on the machine, and the fastest block of each is reported.
+
+Run from the directory containing the openCFR package:
+
+    python -m openCFR.benchmarks.Vectorized
+    python -m openCFR.benchmarks.Vectorized --games kuhn texas:8 --blocks 50 --block-size 100
+'''
+
+import argparse
+import numpy as np
+import platform
+import time
+
+from .. import minimizers
+from ..InfoSetTable import InfoSetTable
+from ..games import CompiledTree
+from .Suite import _traverse, make_game
+
+PAIRS = (('VanillaCFR', 'VectorizedCFR'), ('CFRPlus', 'VectorizedCFRPlus')) # (recursive, vectorized) minimizers
+
+class Run:
+    '''
+    The training state of one minimizer on one game, advanced a block of iterations at a time.
+    '''
+
+    def __init__(self, minimizer, game, root):
+        '''
+        :param minimizer: The minimizer module to time.
+        :param game: An implementation of the Game abstract base class.
+        :param root: The root GameNode of the game tree, compiled for COMPILED minimizers.
+        '''
+        self.minimizer = minimizer
+        self.game = game
+        self.infosets = InfoSetTable()
+        self.iteration = 0
+        self.best = float('inf')
+
+        if getattr(minimizer, 'COMPILED', False):
+            self.root = CompiledTree(game, root)
+
+        else:
+            self.root = root
+            self.infosets.intern_tree(game, root)
+
+    def advance(self, iterations):
+        '''
+        Runs a number of iterations and returns the seconds they took.
+        '''
+        start = time.perf_counter()
+
+        for iteration in range(self.iteration + 1, self.iteration + iterations + 1):
+            _traverse(self.minimizer, self.game, self.root, self.infosets, iteration, {})
+            self.minimizer.update(self.infosets, iteration)
+
+        self.iteration += iterations
+
+        return time.perf_counter() - start
+
+def benchmark(game_name, recursive_name, vectorized_name, blocks, block_size):
+    '''
+    Times a recursive minimizer and its vectorized counterpart on a game.
+
+    :param game_name: The name of the game, from Suite.GAMES.
+    :param recursive_name: The name of the recursive minimizer in minimizers.
+    :param vectorized_name: The name of the vectorized minimizer in minimizers.
+    :param blocks: How many blocks of iterations to time for each minimizer.
+    :param block_size: The number of iterations in a block.
+    :return: The fastest seconds per iteration of the recursive and of the vectorized minimizer.
+    '''
+    game = make_game(game_name)
+    root = game.build_game_tree()
+    runs = [Run(getattr(minimizers, name), game, root) for name in (recursive_name, vectorized_name)]
+
+    for run in runs: # The first iteration of a compiled tree creates its layout
+        run.advance(1)
+
+    for _ in range(blocks):
+        for run in runs:
+            run.best = min(run.best, run.advance(block_size) / block_size)
+
+    return runs[0].best, runs[1].best
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the time per iteration of the vectorized minimizers.')
+    parser.add_argument('--games', nargs='+', default=['kuhn', 'texas:8'], help='The games to run, from: rps, kuhn, texas:<stack>.')
+    parser.add_argument('--blocks', type=int, default=30, help='How many blocks of iterations to time for each minimizer.')
+    parser.add_argument('--block-size', type=int, default=None, help='The iterations per block. Defaults to 200, or 2 on Texas Hold-Em.')
+    args = parser.parse_args()
+
+    print('Python', platform.python_version(), ' NumPy', np.__version__, ' ', platform.processor() or platform.machine())
+    print('{:<10}{:<14}{:>12}{:<20}{:>12}{:>10}'.format('Game', 'Recursive', 'us/it', '  Vectorized', 'us/it', 'Speedup'))
+
+    for game_name in args.games:
+        block_size = args.block_size or (2 if game_name.startswith('texas:') else 200)
+
+        for recursive_name, vectorized_name in PAIRS:
+            recursive, vectorized = benchmark(game_name, recursive_name, vectorized_name, args.blocks, block_size)
+            print('{:<10}{:<14}{:>12.1f}{:<20}{:>12.1f}{:>9.1f}x'.format(game_name, recursive_name, recursive * 1e6, '  ' + vectorized_name, vectorized * 1e6, recursive / vectorized), flush=True)
+
+if __name__ == '__main__':
+    main()
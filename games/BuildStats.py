@@ -0,0 +1,71 @@
+import sys
+import time
+
+class BuildStats:
+    '''
+    Counts the nodes built by Game.build_game_tree and the memory they use, by node type. The bytes of a node are the
+    shallow sizes of the GameNode, its attribute dictionary, its history entry and event, its next_nodes list, and its
+    available actions, chance outcomes and probabilities, or terminal utility, which approximates the memory the node
+    adds to the tree.
+    '''
+
+    NODE_TYPES = ('decision', 'chance', 'terminal')
+
+    def __init__(self):
+        '''
+        Initializes the statistics with the following variables:
+
+            counts: The number of nodes built of each node type.
+            bytes: The number of bytes used by the nodes of each node type.
+            shared: The number of times a node was reused for a history with the same canonical state instead of being
+                    built, when building a DAG.
+            start_time: When the build started, as returned by time.perf_counter.
+        '''
+        self.counts = dict.fromkeys(self.NODE_TYPES, 0)
+        self.bytes = dict.fromkeys(self.NODE_TYPES, 0)
+        self.shared = 0
+        self.start_time = time.perf_counter()
+
+    def record(self, node):
+        '''
+        Adds a newly built GameNode to the statistics.
+        '''
+        node_type = 'terminal' if node.is_terminal_node else 'chance' if node.is_chance_node else 'decision'
+        size = sys.getsizeof(node) + sys.getsizeof(node.__dict__) + sys.getsizeof(node.history) + sys.getsizeof(node.next_nodes)
+        event = getattr(node.history, 'event', None)
+
+        if event is not None:
+            size += sys.getsizeof(event)
+
+        for value in (node.available_actions, node.chance_outcomes, node.chance_probs, node.chance_cdf, node.terminal_utility):
+            if value is not None:
+                size += sys.getsizeof(value)
+
+        self.counts[node_type] += 1
+        self.bytes[node_type] += size
+
+    @property
+    def num_nodes(self):
+        return sum(self.counts.values())
+
+    @property
+    def total_bytes(self):
+        return sum(self.bytes.values())
+
+    def bytes_per_node(self, node_type):
+        '''
+        Returns the average number of bytes used by a node of the given node type.
+        '''
+        return self.bytes[node_type] / self.counts[node_type] if self.counts[node_type] else 0.0
+
+    def elapsed(self):
+        '''
+        Returns the number of seconds since the build started.
+        '''
+        return time.perf_counter() - self.start_time
+
+    def __str__(self):
+        types = ', '.join('{} {:,} ({:.0f} B/node)'.format(node_type, self.counts[node_type], self.bytes_per_node(node_type)) for node_type in self.NODE_TYPES)
+        shared = ', {:,} shared'.format(self.shared) if self.shared else ''
+
+        return '{:,} nodes, {:.1f} MB in {:.1f}s: {}{}'.format(self.num_nodes, self.total_bytes / 1e6, self.elapsed(), types, shared)
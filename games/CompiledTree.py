@@ -0,0 +1,260 @@
+import numpy as np
+from collections import deque
+
+DECISION_NODE = 0
+CHANCE_NODE = 1
+TERMINAL_NODE = 2
+
+class CompiledTree:
+    '''
+    A flat, array-backed representation of a game tree built from GameNode objects. Nodes are numbered in breadth-first
+    order, so the children of every node occupy a contiguous range of node ids and every depth of the tree occupies a
+    contiguous range of node ids. Once compiled, the GameNode tree is no longer referenced and can be garbage collected.
+    Traversed by the minimizers with COMPILED = True, by MCCFR_Outcome.cfr_batch, and by Exploitability.BestResponse.
+    '''
+
+    def __init__(self, game, root):
+        '''
+        Compiles a GameNode tree into the following NumPy arrays, each indexed by node id:
+
+            node_type: DECISION_NODE, CHANCE_NODE or TERMINAL_NODE.
+            player: The player whose turn it is to act at the node.
+            parent: The node id of the parent node. -1 for the root.
+            action_index: The index of the node in its parent's next_nodes list. -1 for the root.
+            first_child: The node id of the first child. Children are stored at first_child ... first_child +
+                         num_children - 1. -1 for terminal nodes.
+            num_children: The number of children of the node.
+            depth: The depth of the node in the tree. The root has a depth of zero.
+            edge_prob: The chance probability of the edge leading into the node. One if the parent is not a chance node.
+            edge_sign: The utility multiplier applied to the node's value by its parent. Matches the utility_multiplier
+                       used by the recursive minimizers. One if the parent is a chance node.
+            terminal_utility: The utility at each terminal node. Zero for non-terminal nodes.
+            infoset_index: The index of the information set the node belongs to. -1 for chance and terminal nodes.
+            child_cdf: The cumulative probability of the node among its siblings, offset by the parent's node id. Used
+                       by sample_children.
+
+        As well as the following per information set values, indexed by infoset_index:
+
+            infoset_keys: The key of the information set as returned by game.get_infoset_key.
+            infoset_actions: The available actions at the information set.
+            infoset_num_actions: The number of actions available at the information set.
+
+        :param game: An implementation of the Game abstract base class.
+        :param root: The GameNode object representing the root of the game tree.
+        '''
+        self.num_players = game.num_players
+        node_type = []
+        player = []
+        parent = []
+        action_index = []
+        first_child = []
+        num_children = []
+        depth = []
+        edge_prob = []
+        edge_sign = []
+        terminal_utility = []
+        infoset_index = []
+
+        self.infoset_keys = []
+        self.infoset_actions = []
+        self.dynamic_utilities = [] # The UtilityNode objects of terminal nodes whose utility is not static
+        dynamic_terminals = []
+        key_to_index = {}
+
+        queue = deque([(root, -1, -1, 0, 1.0, 1.0)])
+        next_id = 1
+
+        while queue:
+            node, parent_id, index, node_depth, prob, sign = queue.popleft()
+            node_id = len(node_type)
+
+            parent.append(parent_id)
+            action_index.append(index)
+            depth.append(node_depth)
+            edge_prob.append(prob)
+            edge_sign.append(sign)
+            player.append(node.player)
+
+            if node.is_terminal_node:
+                node_type.append(TERMINAL_NODE)
+                first_child.append(-1)
+                num_children.append(0)
+                infoset_index.append(-1)
+
+                if getattr(node.terminal_utility, 'STATIC', False):
+                    terminal_utility.append(node.terminal_utility.get_utility())
+
+                else:
+                    terminal_utility.append(0)
+                    dynamic_terminals.append(node_id)
+                    self.dynamic_utilities.append(node.terminal_utility)
+
+                continue
+
+            terminal_utility.append(0)
+            first_child.append(next_id)
+            num_children.append(len(node.next_nodes))
+            next_id += len(node.next_nodes)
+
+            if node.is_chance_node:
+                node_type.append(CHANCE_NODE)
+                infoset_index.append(-1)
+
+                for i, next_node in enumerate(node.next_nodes):
+                    queue.append((next_node, node_id, i, node_depth + 1, node.chance_probs[i], 1.0))
+
+            else:
+                node_type.append(DECISION_NODE)
+                infoset_key = game.get_infoset_key(list(node.history))
+
+                if infoset_key not in key_to_index:
+                    key_to_index[infoset_key] = len(self.infoset_keys)
+                    self.infoset_keys.append(infoset_key)
+                    self.infoset_actions.append(node.available_actions)
+
+                infoset_index.append(key_to_index[infoset_key])
+
+                for i, next_node in enumerate(node.next_nodes):
+                    utility_multiplier = 1.0 if game.num_players == 1 or node.player == next_node.player else -1.0
+                    queue.append((next_node, node_id, i, node_depth + 1, 1.0, utility_multiplier))
+
+        self.num_nodes = len(node_type)
+        self.node_type = np.array(node_type, dtype=np.int8)
+        self.player = np.array(player, dtype=np.int32)
+        self.parent = np.array(parent, dtype=np.int64)
+        self.action_index = np.array(action_index, dtype=np.int32)
+        self.first_child = np.array(first_child, dtype=np.int64)
+        self.num_children = np.array(num_children, dtype=np.int32)
+        self.depth = np.array(depth, dtype=np.int32)
+        self.edge_prob = np.array(edge_prob, dtype=np.float64)
+        self.edge_sign = np.array(edge_sign, dtype=np.float64)
+        self.terminal_utility = np.array(terminal_utility, dtype=np.float64)
+        self.infoset_index = np.array(infoset_index, dtype=np.int64)
+        self.dynamic_terminals = np.array(dynamic_terminals, dtype=np.int64)
+        self.utility_samplers = [] # (terminal node ids, sampler) pairs for utility classes that can be sampled at once
+        self.unbatched_utilities = [] # (terminal node id, UtilityNode) pairs that must be sampled one at a time
+
+        for utility_class in dict.fromkeys(type(utility_node) for utility_node in self.dynamic_utilities):
+            indices = [i for i, utility_node in enumerate(self.dynamic_utilities) if type(utility_node) is utility_class]
+            utility_nodes = [self.dynamic_utilities[i] for i in indices]
+            sampler = utility_class.batch_sampler(utility_nodes) if hasattr(utility_class, 'batch_sampler') else None
+
+            if sampler is not None:
+                self.utility_samplers.append((self.dynamic_terminals[indices], sampler))
+
+            else:
+                self.unbatched_utilities += [(self.dynamic_terminals[i], self.dynamic_utilities[i]) for i in indices]
+
+        self.infoset_num_actions = np.array([len(actions) for actions in self.infoset_actions], dtype=np.int32)
+        self.num_infosets = len(self.infoset_keys)
+        self.num_levels = int(self.depth[-1]) + 1
+        self.level_offsets = np.searchsorted(self.depth, np.arange(self.num_levels + 1)) # Nodes at depth d are level_offsets[d] ... level_offsets[d + 1] - 1
+        self.child_cdf = self._child_cdf()
+        self.expected_utility = None # Computed by expected_utilities
+
+    def _child_cdf(self):
+        '''
+        Computes the cumulative probability of each node among its siblings, using the chance probabilities for the
+        children of chance nodes and uniform probabilities for the children of decision nodes. Each value is offset by
+        the id of the node's parent, which keeps the array sorted, so a child of many nodes can be sampled at once with a
+        single searchsorted call. See sample_children.
+        '''
+        child_cdf = np.zeros(self.num_nodes)
+
+        if self.num_nodes == 1:
+            return child_cdf
+
+        parent = self.parent[1:]
+        rank = self.action_index[1:]
+        probs = np.where(self.node_type[parent] == CHANCE_NODE, self.edge_prob[1:], 1 / self.num_children[parent])
+        cumulative = probs.copy()
+
+        for i in range(1, int(rank.max()) + 1): # Accumulate one sibling rank at a time so each sum stays exact
+            nodes = np.flatnonzero(rank == i)
+            cumulative[nodes] += cumulative[nodes - 1]
+
+        last_sibling = self.first_child[parent] + self.num_children[parent] - 2 # Index into cumulative of each node's last sibling
+        child_cdf[1:] = parent + cumulative / cumulative[last_sibling]
+
+        return child_cdf
+
+    def sample_children(self, node_ids, uniforms):
+        '''
+        Samples one child of each of a set of non-terminal nodes by inverse-CDF lookup, using chance probabilities at
+        chance nodes and uniform probabilities at decision nodes.
+
+        :param node_ids: An array of node ids.
+        :param uniforms: An array of the same length of uniform random numbers in [0, 1).
+        :return: An array of the sampled child node ids.
+        '''
+        children = np.searchsorted(self.child_cdf, node_ids + uniforms, side='right')
+        first_child = self.first_child[node_ids]
+
+        return np.clip(children, first_child, first_child + self.num_children[node_ids] - 1)
+
+    def level(self, depth):
+        '''
+        Returns a slice over the node ids at a given depth of the tree.
+        '''
+        return slice(self.level_offsets[depth], self.level_offsets[depth + 1])
+
+    def children(self, node_id):
+        '''
+        Returns a range over the node ids of the children of a node.
+        '''
+        start = self.first_child[node_id]
+
+        return range(start, start + self.num_children[node_id])
+
+    def sample_utilities(self):
+        '''
+        Refreshes the utility of every terminal node whose UtilityNode is not static, and returns the full terminal
+        utility array. Utility classes that define a batch_sampler are sampled all at once, all others by calling
+        get_utility() on each node. Called once per traversal of the tree.
+        '''
+        for node_ids, sampler in self.utility_samplers:
+            self.terminal_utility[node_ids] = sampler()
+
+        for node_id, utility_node in self.unbatched_utilities:
+            self.terminal_utility[node_id] = utility_node.get_utility()
+
+        return self.terminal_utility
+
+    def sample_terminal_utilities(self, node_ids):
+        '''
+        Returns a separately sampled utility for each entry of an array of terminal node ids, by calling get_utility()
+        once per entry whose UtilityNode is not static, as a traversal of the GameNode tree does on each visit. Used by
+        sampled traversals that reach a few terminal nodes, for which sample_utilities would sample every terminal node.
+
+        :param node_ids: An array of terminal node ids, which may repeat.
+        :return: An array with one utility per entry of node_ids.
+        '''
+        utilities = self.terminal_utility[node_ids]
+        positions = np.searchsorted(self.dynamic_terminals, node_ids) # Node ids are assigned in order, so the array is sorted
+        in_range = positions < len(self.dynamic_terminals)
+        dynamic = np.flatnonzero(in_range)[self.dynamic_terminals[positions[in_range]] == node_ids[in_range]]
+
+        for i in dynamic:
+            utilities[i] = self.dynamic_utilities[positions[i]].get_utility()
+
+        return utilities
+
+    def expected_utilities(self):
+        '''
+        Returns a terminal utility array in which the utility of every terminal node whose UtilityNode is not static is
+        replaced by its expected utility. Computed on the first call.
+        '''
+        if self.expected_utility is None:
+            self.expected_utility = self.terminal_utility.copy()
+            self.expected_utility[self.dynamic_terminals] = [utility_node.get_expected_utility() for utility_node in self.dynamic_utilities]
+
+        return self.expected_utility
+
+    def nbytes(self):
+        '''
+        Returns the number of bytes used by the node arrays.
+        '''
+        arrays = [self.node_type, self.player, self.parent, self.action_index, self.first_child, self.num_children,
+                  self.depth, self.edge_prob, self.edge_sign, self.terminal_utility, self.infoset_index]
+
+        return sum(array.nbytes for array in arrays)
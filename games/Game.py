@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
 
+from .BuildStats import BuildStats
+from .GameNode import GameNode
+from .History import History
+from .UtilityNode import StaticUtility, UtilityNode
+
 class Game(ABC):
     '''
     An abstract base class that is used to define a game.
@@ -44,7 +49,8 @@ class Game(ABC):
     @abstractmethod
     def get_terminal_utility(self, history):
         '''
-        Returns the utility at a terminal node for the player who just acted.
+        Returns the utility at a terminal node for the player who just acted, either as a number or as a UtilityNode
+        for utilities that are sampled on each traversal. The tree builders wrap numbers in a StaticUtility.
         '''
         return None
 
@@ -70,9 +76,148 @@ class Game(ABC):
         '''
         return None
 
-    @abstractmethod
-    def build_game_tree(self):
+    def get_chance_events(self, history, chance_outcomes):
+        '''
+        Returns the event appended to the history for each outcome of a chance node. Defaults to ('r', outcome).
+        '''
+        return [('r', outcome) for outcome in chance_outcomes]
+
+    def get_action_events(self, history, player, available_actions):
+        '''
+        Returns the event appended to the history for each action available to the player at a decision node. Defaults
+        to (player, action).
         '''
-        Recursively builds a game tree consisting of GameNode objects.
+        return [(player, action) for action in available_actions]
+
+    def get_node_fields(self, history):
+        '''
+        Applies the rule functions to a history.
+
+        :param history: The history of the node, as a list.
+        :return: The player who acts at the node, the keyword arguments of its GameNode other than its history, player
+                 and next_nodes, and the event appended to its history for each of its children. There are no events
+                 for terminal nodes.
+        '''
+        player = self.get_player(history)
+
+        if self.is_terminal_node(history):
+            terminal_utility = self.get_terminal_utility(history)
+
+            if not isinstance(terminal_utility, UtilityNode):
+                terminal_utility = StaticUtility(terminal_utility)
+
+            return player, {'is_terminal_node': True, 'terminal_utility': terminal_utility}, []
+
+        if self.is_chance_node(history):
+            chance_outcomes, chance_probs = self.handle_chance(history)
+
+            return player, {'is_chance_node': True, 'chance_outcomes': chance_outcomes, 'chance_probs': chance_probs}, self.get_chance_events(history, chance_outcomes)
+
+        available_actions = self.get_available_actions(history)
+
+        return player, {'available_actions': available_actions}, self.get_action_events(history, player, available_actions)
+
+    def create_node(self, node_history, history=None, node_class=GameNode):
         '''
-        return None
\ No newline at end of file
+        Creates the node of a history from the rule functions, without its children. Its next_nodes list holds None
+        for each child until the children are created.
+
+        :param node_history: The History of the node.
+        :param history: The same history as a list, if one has already been made.
+        :param node_class: The class of the node, GameNode or a subclass with the same constructor.
+        :return: The node, and the event appended to its history for each of its children. There are no events for
+                 terminal nodes.
+        '''
+        if history is None:
+            history = list(node_history) # The game functions are called with a list, which is faster to index
+
+        player, fields, events = self.get_node_fields(history)
+
+        return node_class(node_history, player, [None] * len(events), **fields), events
+
+    def build_game_tree(self, history=None, memo=None, progress=None, progress_freq=100000):
+        '''
+        Builds a game tree consisting of GameNode objects depth first, with an explicit stack instead of recursion. The
+        history of each node is a History that points to its parent's history, so each node stores one event. The game
+        functions are called with a list of the events, which is kept up to date as the stack is popped rather than
+        rebuilt from the History, and is copied once per node. If memo is a dictionary, the subtree of every history with
+        a canonical state is stored in it under that state, and is reused instead of being built again when another
+        history has the same state.
+
+        :param history: The history of the root, as a list of events or a History. Defaults to the empty history.
+        :param memo: A dictionary of the nodes of each canonical state, or None to build a tree.
+        :param progress: If True, the BuildStats of the build are printed every progress_freq nodes and at the end. If
+                         callable, it is called with the BuildStats instead.
+        :param progress_freq: How many nodes to build between each progress report.
+        :return: The GameNode object representing the root of the game tree. The BuildStats of the build are stored in
+                 build_stats.
+        '''
+        if not isinstance(history, History):
+            history = History.from_list(history or [])
+
+        report = print if progress is True else progress
+        stats = BuildStats()
+        root = [None]
+        stack = [(history, root, 0)] # The history of each node left to build, and the list and index to store it at
+        path = list(history) # The events of the last node built, whose prefixes are the histories of the nodes on the stack
+
+        while stack:
+            node_history, parent_nodes, index = stack.pop()
+
+            if node_history.parent is not None: # Replace the events after the node's parent with its last event
+                del path[len(node_history) - 1:]
+                path.append(node_history.event)
+
+            history = path.copy() # The game functions are called with a list, which is faster to index
+            state = None if memo is None else self.get_canonical_state(history)
+
+            if state is not None and state in memo:
+                parent_nodes[index] = memo[state]
+                stats.shared += 1
+                continue
+
+            node, events = self.create_node(node_history, history)
+            stats.record(node)
+
+            for i in reversed(range(len(events))): # Pushed in reverse so children are built in order
+                stack.append((History(node_history, events[i]), node.next_nodes, i))
+
+            if state is not None:
+                memo[state] = node
+
+            parent_nodes[index] = node
+
+            if report is not None and stats.num_nodes % progress_freq == 0:
+                report(stats)
+
+        if report is not None:
+            report(stats)
+
+        self.build_stats = stats
+
+        return root[0]
+
+    def get_canonical_state(self, history):
+        '''
+        Returns a hashable summary of the game state after a history, such that any two histories with equal states
+        have identical subtrees: the same players, available actions, chance outcomes and probabilities, terminal
+        utilities, and information set keys at every node below them. Returns None if the subtree should not be
+        shared, which is the default for every history.
+        '''
+        return None
+
+    def build_game_dag(self, **kwargs):
+        '''
+        Builds the game tree as a directed acyclic graph, in which the subtrees of histories with the same canonical
+        state are built once and shared by every parent. The history of a shared GameNode is the history it was first
+        built for. Keyword arguments are passed to build_game_tree.
+        '''
+        return self.build_game_tree(memo={}, **kwargs)
+
+    def compile_game_tree(self):
+        '''
+        Builds the game tree and compiles it into a flat, array-backed CompiledTree.
+        '''
+        from .CompiledTree import CompiledTree
+
+        return CompiledTree(self, self.build_game_tree())
\ No newline at end of file
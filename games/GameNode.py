@@ -1,14 +1,17 @@
+from itertools import accumulate
+
 class GameNode:
     '''
     A class representing a single game node.
     '''
 
-    def __init__(self, history, player, next_nodes=[], available_actions=None, is_chance_node=False, chance_outcomes=None, chance_probs=None, is_terminal_node=False, terminal_utility=None):
+    def __init__(self, history, player, next_nodes=[], available_actions=None, is_chance_node=False, chance_outcomes=None, chance_probs=None, is_terminal_node=False, terminal_utility=None, infoset_id=None):
         '''
         Initializes the game node with the following variables:
 
-        history: A list of actions taken in the game, where each element of history is a (player, action) tuple. How
-                 player and action are represented are game specific.
+        history: The actions taken in the game, where each element of history is a (player, action) tuple. How player
+                 and action are represented are game specific. Game.build_game_tree stores it as a History, which
+                 shares its prefix with the parent node's history.
         player: The player whose turn it is to act.
         next_nodes: An array of the same length as available_actions or chance_outcomes depending on whether or not
                     is_chance_node is True. Contains an array of GameNode objects representing the next action in the
@@ -18,8 +21,13 @@ class GameNode:
         chance_outcomes: An array where each index contains a token representing a chance_action in the game.
         chance_probs: An array of the same length as chance_outcomes, where each index contains the probability of the
                       chance outcome at the same index in chance_outcomes occuring.
+        chance_cdf: The cumulative sum of chance_probs, computed once so that sampling minimizers can pick a chance
+                    outcome by inverse-CDF lookup. None if the node is not a chance node.
         is_terminal_node: Whether or not the node is a terminal node.
         terminal_utility: The terminal utility for player given the game history.
+        infoset_id: The dense integer id of the node's information set in an InfoSetTable, assigned once by
+                    InfoSetTable.intern_tree so that minimizers do not rebuild the information set key on every visit.
+                    None if the node has not been interned.
         '''
         self.history = history
         self.player = player
@@ -28,5 +36,7 @@ class GameNode:
         self.is_chance_node = is_chance_node
         self.chance_outcomes = chance_outcomes
         self.chance_probs = chance_probs
+        self.chance_cdf = None if chance_probs is None else [float(p) for p in accumulate(chance_probs)]
         self.is_terminal_node = is_terminal_node
-        self.terminal_utility = terminal_utility
\ No newline at end of file
+        self.terminal_utility = terminal_utility
+        self.infoset_id = infoset_id
\ No newline at end of file
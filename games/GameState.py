@@ -0,0 +1,86 @@
+from itertools import accumulate
+
+class GameState:
+    '''
+    A cursor over the states of a game that is moved with push and pop instead of walking a stored tree. The history
+    of the current state and the rule function results of every state on the path to it are kept on an undo stack, so
+    a traversal uses memory proportional to the depth of the game rather than the size of its tree, and no GameNode
+    objects are created. The attributes of the current state have the same names as those of a GameNode.
+    '''
+
+    infoset_id = None # States are not interned, so InfoSetTable.lookup builds the information set key of each visit
+
+    def __init__(self, game, history=None):
+        '''
+        Initializes the cursor at a history with the following variables:
+
+            game: An implementation of the Game abstract base class.
+            history: The list of events leading to the current state. Must not be modified except through push and
+                     pop.
+            stack: The player, GameNode keyword arguments, chance cdf, and child events of each state on the path from
+                   the first state to the current one, as returned by Game.get_node_fields.
+        '''
+        self.game = game
+        self.history = list(history or [])
+        self.stack = []
+        self._enter()
+
+    def _enter(self):
+        player, fields, events = self.game.get_node_fields(self.history)
+        chance_probs = fields.get('chance_probs')
+        chance_cdf = None if chance_probs is None else [float(p) for p in accumulate(chance_probs)]
+        self.stack.append((player, fields, chance_cdf, events))
+
+    def push(self, i):
+        '''
+        Moves to the i-th child of the current state, the result of its i-th available action or chance outcome.
+        '''
+        self.history.append(self.stack[-1][3][i])
+        self._enter()
+
+    def pop(self):
+        '''
+        Moves back to the parent of the current state.
+        '''
+        self.stack.pop()
+        self.history.pop()
+
+    @property
+    def depth(self):
+        return len(self.stack) - 1
+
+    @property
+    def player(self):
+        return self.stack[-1][0]
+
+    @property
+    def is_terminal_node(self):
+        return self.stack[-1][1].get('is_terminal_node', False)
+
+    @property
+    def is_chance_node(self):
+        return self.stack[-1][1].get('is_chance_node', False)
+
+    @property
+    def available_actions(self):
+        return self.stack[-1][1].get('available_actions')
+
+    @property
+    def chance_outcomes(self):
+        return self.stack[-1][1].get('chance_outcomes')
+
+    @property
+    def chance_probs(self):
+        return self.stack[-1][1].get('chance_probs')
+
+    @property
+    def chance_cdf(self):
+        return self.stack[-1][2]
+
+    @property
+    def terminal_utility(self):
+        return self.stack[-1][1].get('terminal_utility')
+
+    @property
+    def num_children(self):
+        return len(self.stack[-1][3])
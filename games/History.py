@@ -0,0 +1,84 @@
+class History:
+    '''
+    An immutable game history stored as the history before its last event plus that event, so that the histories of a
+    node's children share their prefix instead of each copying it. Supports the read-only list operations used by Game
+    implementations: len, indexing, slicing, iteration, and concatenation with a list, which returns a list. Indexing
+    walks back from the last event, so history[-k] takes k steps and history[0] takes len(history) steps. Convert the
+    history to a list first to index it repeatedly.
+    '''
+
+    __slots__ = ('parent', 'event', 'length')
+
+    def __init__(self, parent=None, event=None):
+        '''
+        Initializes the history with the following variables:
+
+            parent: The History before the last event. None for the empty history.
+            event: The last event of the history, such as a (player, action) tuple. None for the empty history.
+            length: The number of events in the history.
+        '''
+        self.parent = parent
+        self.event = event
+        self.length = 0 if parent is None else parent.length + 1
+
+    @classmethod
+    def from_list(cls, events):
+        '''
+        Returns the History of a list of events.
+        '''
+        history = cls()
+
+        for event in events:
+            history = cls(history, event)
+
+        return history
+
+    def append(self, event):
+        '''
+        Returns a new History with event added to the end of this one.
+        '''
+        return History(self, event)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        events = []
+        history = self
+
+        while history.parent is not None:
+            events.append(history.event)
+            history = history.parent
+
+        return reversed(events)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        if index < 0:
+            index += self.length
+
+        if not 0 <= index < self.length:
+            raise IndexError('history index out of range')
+
+        history = self
+
+        for _ in range(self.length - 1 - index):
+            history = history.parent
+
+        return history.event
+
+    def __add__(self, events):
+        return list(self) + list(events)
+
+    def __eq__(self, other):
+        if isinstance(other, (History, list, tuple)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+from .GameNode import GameNode
+from .History import History
+
+class LazyGameNode(GameNode):
+    '''
+    A GameNode whose children are created from the rules of its game the first time next_nodes is read, rather than
+    when the tree is built. Created by a LazyTree, which bounds how many nodes keep their children.
+    '''
+
+    @property
+    def next_nodes(self):
+        if self.is_terminal_node:
+            return self._next_nodes
+
+        return self.tree.expand(self)
+
+    @next_nodes.setter
+    def next_nodes(self, next_nodes):
+        self._next_nodes = next_nodes
+
+class LazyTree:
+    '''
+    Expands a game tree on demand while it is traversed. The children of the max_expanded most recently visited nodes
+    are kept in a least recently used cache. When a node is evicted its children are released, and they are created
+    again from the game's rule functions on the node's next visit, so memory stays bounded however large the tree is.
+    Sampling minimizers only visit a small part of the tree on each traversal, so most of their visits hit the cache.
+    '''
+
+    def __init__(self, game, max_expanded=100000, infosets=None):
+        '''
+        Initializes the tree with the following variables:
+
+            game: An implementation of the Game abstract base class.
+            max_expanded: The number of nodes whose children are kept.
+            infosets: If not None, an InfoSetTable that the information set of every new decision node is added to, storing
+                      its id on the node as InfoSetTable.intern_tree does.
+            expanded: The expanded nodes in order of their last visit, keyed by the node's id.
+            num_created: The number of nodes created, including nodes created again after their parent was evicted.
+            num_evicted: The number of nodes whose children have been released.
+            root: The LazyGameNode object representing the root of the game tree.
+        '''
+        self.game = game
+        self.max_expanded = max_expanded
+        self.infosets = infosets
+        self.expanded = OrderedDict()
+        self.num_created = 0
+        self.num_evicted = 0
+        self.root = self.create_node(History())
+
+    def create_node(self, node_history):
+        '''
+        Creates the LazyGameNode of a history without its children.
+        '''
+        history = list(node_history)
+        node, events = self.game.create_node(node_history, history, LazyGameNode)
+        node.tree = self
+        node.child_events = events
+        self.num_created += 1
+
+        if not node.is_terminal_node:
+            node.next_nodes = None
+
+            if not node.is_chance_node and self.infosets is not None:
+                counter = self.infosets.node_counter # Times the key while nodes are counted
+                key = self.game.get_infoset_key(history) if counter is None else counter.build_key(self.game, history)
+                node.infoset_id = self.infosets.add(key, node.available_actions).id
+
+        return node
+
+    def expand(self, node):
+        '''
+        Returns the children of a node, creating them if the node is not in the cache, and marks the node as the most
+        recently visited one.
+        '''
+        next_nodes = node._next_nodes
+
+        if next_nodes is not None:
+            self.expanded.move_to_end(id(node))
+
+            return next_nodes
+
+        next_nodes = node._next_nodes = [self.create_node(History(node.history, event)) for event in node.child_events]
+        self.expanded[id(node)] = node
+
+        while len(self.expanded) > self.max_expanded:
+            _, evicted = self.expanded.popitem(last=False)
+            evicted._next_nodes = None
+            self.num_evicted += 1
+
+        return next_nodes
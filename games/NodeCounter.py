@@ -0,0 +1,88 @@
+import time
+
+class NodeCounter:
+    '''
+    Counts the visits to the decision, chance, and terminal nodes of a game while it is traversed by the recursive
+    minimizers, and times the information set keys built while it does. Used as a context manager: on entry the counter
+    is set as the node_counter of an InfoSetTable, and on exit it is removed. The minimizers call visit on every node
+    they traverse while a table has a node counter, and InfoSetTable.lookup times each key it builds, so traversals of
+    a table without one only pay for the check. Works with GameNode trees, compiled trees, lazy trees, and GameState
+    cursors, but only counts traversals in the process that holds the table.
+    '''
+
+    NODE_TYPES = ('decision', 'chance', 'terminal')
+
+    def __init__(self, infosets):
+        '''
+        Initializes the counter with the following variables:
+
+            infosets: The InfoSetTable whose traversals are counted.
+            counts: The number of visits to each node type, in the order of NODE_TYPES.
+            key_seconds: The seconds spent building information set keys.
+
+        :param infosets: The InfoSetTable whose traversals are counted.
+        '''
+        self.infosets = infosets
+        self.counts = [0, 0, 0]
+        self.key_seconds = 0.0
+
+    def visit(self, node):
+        '''
+        Counts a visit to a node. Called by the minimizers.
+
+        :param node: A GameNode, LazyGameNode, or GameState.
+        '''
+        if node.is_chance_node:
+            self.counts[1] += 1
+
+        elif node.is_terminal_node:
+            self.counts[2] += 1
+
+        else:
+            self.counts[0] += 1
+
+    def count(self, node_type):
+        '''
+        Counts a visit to a node of a CompiledTree. Called by the cfr_compiled functions of the minimizers.
+
+        :param node_type: The node_type of the node in the CompiledTree, which indexes counts.
+        '''
+        self.counts[node_type] += 1
+
+    def build_key(self, game, history):
+        '''
+        Builds an information set key with game.get_infoset_key, adding the time taken to key_seconds. Called by
+        InfoSetTable.lookup.
+        '''
+        start = time.perf_counter()
+        key = game.get_infoset_key(history)
+        self.key_seconds += time.perf_counter() - start
+
+        return key
+
+    def reset(self):
+        '''
+        Returns the visit counts of each node type as a dictionary and sets them to zero.
+        '''
+        counts = dict(zip(self.NODE_TYPES, self.counts))
+        self.counts[:] = [0, 0, 0]
+
+        return counts
+
+    def take_key_seconds(self):
+        '''
+        Returns the seconds spent building keys since the last call, and sets them to zero.
+        '''
+        seconds, self.key_seconds = self.key_seconds, 0.0
+
+        return seconds
+
+    def __enter__(self):
+        self.infosets.node_counter = self
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.infosets.node_counter = None
+
+        return False
\ No newline at end of file
@@ -5,6 +5,8 @@ class UtilityNode(ABC):
     An abstract base class used to define a terminal utility node.
     '''
 
+    STATIC = False # Whether get_utility returns the same value on every call. Static utilities can be cached
+
     def __init__(self):
         super().__init__()
 
@@ -16,4 +18,40 @@ class UtilityNode(ABC):
 
         :return: An int defining utility.
         '''
-        return 0
\ No newline at end of file
+        return 0
+
+    def get_expected_utility(self):
+        '''
+        The expected value of get_utility, used to evaluate strategies exactly. Defaults to calling get_utility, which is
+        exact for static utilities. Utilities that sample values should override it.
+
+        :return: A number defining expected utility.
+        '''
+        return self.get_utility()
+
+    @classmethod
+    def batch_sampler(cls, utility_nodes):
+        '''
+        Optionally returns a function that samples the utility of every node in utility_nodes at once, where each node
+        is an instance of this class. Used by CompiledTree to avoid calling get_utility on each node one at a time.
+
+        :param utility_nodes: A list of UtilityNode objects of this class.
+        :return: A function that takes no arguments and returns a NumPy array of utilities with the same length as
+                 utility_nodes, or None if the utility nodes must be sampled one at a time.
+        '''
+        return None
+
+class StaticUtility(UtilityNode):
+    '''
+    A utility node that returns the same utility on every call. The game tree builders wrap numeric terminal utilities
+    returned by Game.get_terminal_utility in it.
+    '''
+
+    STATIC = True
+
+    def __init__(self, utility):
+        self.utility = utility
+        super().__init__()
+
+    def get_utility(self):
+        return self.utility
\ No newline at end of file
@@ -1,3 +1,9 @@
 from .Game import Game
 from .GameNode import GameNode
-from .UtilityNode import UtilityNode
\ No newline at end of file
+from .History import History
+from .BuildStats import BuildStats
+from .UtilityNode import UtilityNode, StaticUtility
+from .CompiledTree import CompiledTree
+from .LazyGameNode import LazyGameNode, LazyTree
+from .GameState import GameState
+from .NodeCounter import NodeCounter
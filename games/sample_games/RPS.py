@@ -1,25 +1,11 @@
 import numpy as np
 
 from .. import Game
-from .. import GameNode
-from .. import UtilityNode
 
 NUM_ACTIONS = 3 # Rock, Paper, Scissors
 NUM_PLAYERS = 1
 ACTION_MAP = ['Rock', 'Paper', 'Scissors']
 
-class Utility(UtilityNode):
-    '''
-    Define utility at each terminal node.
-    '''
-
-    def __init__(self, utility):
-        self.utility = utility
-        super().__init__()
-
-    def get_utility(self):
-        return self.utility
-
 class RPS(Game):
     '''
     Rock-Paper-Scissors
@@ -88,36 +74,12 @@ class RPS(Game):
         '''
         return 'Shoot'
 
-    def build_game_tree(self, history=[]):
+    def get_canonical_state(self, history):
         '''
-        Recursively builds a game tree consisting of GameNode objects.
+        Returns the player and utility of terminal states, so that terminal nodes with the same utility are shared by
+        build_game_dag. Returns None for every other state, since their subtrees contain information sets.
         '''
-        player = self.get_player(history)
-        is_chance_node = self.is_chance_node(history)
-        is_terminal_node = self.is_terminal_node(history)
-
-        if is_terminal_node:
-            terminal_utility = self.get_terminal_utility(history)
-            utility_node = Utility(terminal_utility)
-
-            return GameNode(history, player, is_terminal_node=True, terminal_utility=utility_node)
-
-        elif is_chance_node:
-            chance_outcomes, chance_probs = self.handle_chance(history)
-            next_nodes = []
-
-            for outcome in chance_outcomes:
-                next_history = history + [('r', outcome)]
-                next_nodes.append(self.build_game_tree(history=next_history))
-
-            return GameNode(history, player, next_nodes, is_chance_node=True, chance_outcomes=chance_outcomes, chance_probs=chance_probs)
-
-        else:
-            available_actions = self.get_available_actions(history)
-            next_nodes = []
-
-            for action in available_actions:
-                next_history = history + [(player, action)]
-                next_nodes.append(self.build_game_tree(history=next_history))
+        if not self.is_terminal_node(history):
+            return None
 
-            return GameNode(history, player, next_nodes, available_actions)
\ No newline at end of file
+        return ('terminal', self.get_player(history), self.get_terminal_utility(history))
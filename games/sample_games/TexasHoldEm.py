@@ -2,7 +2,6 @@ import numpy as np
 import random
 
 from .. import Game
-from .. import GameNode
 from .. import UtilityNode
 
 NUM_ACTIONS = 6 # Check, Bet 3 x Big Blind, Bet 6 x Big Blind, Bet 9 x Big Blind, Call, Fold
@@ -23,6 +22,8 @@ class StaticUtility(UtilityNode):
     Define utility at each terminal node where each call to get_utility returns the same value.
     '''
 
+    STATIC = True
+
     def __init__(self, utility):
         self.utility = utility
         super().__init__()
@@ -67,6 +68,31 @@ class DynamicUtility(UtilityNode):
         if hand == opp_hand:
             return 0
 
+    def get_expected_utility(self):
+        num_hands = {'Strong': 323, 'Average': 1288, 'Weak': 1717}.get(self.bucket, 4138)
+        win_prob = (num_hands - 1) / (2 * num_hands) # Both hands are drawn uniformly, and tie with probability 1 / num_hands
+
+        return win_prob * (self.pot_size - self.pot_contribution) - win_prob * self.pot_contribution
+
+    @classmethod
+    def batch_sampler(cls, utility_nodes):
+        '''
+        Returns a function that samples the utility of every node in utility_nodes at once using NumPy's random number
+        generator.
+        '''
+        bucket_sizes = {'Strong': 323, 'Average': 1288, 'Weak': 1717}
+        pot_size = np.array([node.pot_size for node in utility_nodes], dtype=np.float64)
+        pot_contribution = np.array([node.pot_contribution for node in utility_nodes], dtype=np.float64)
+        num_hands = np.array([bucket_sizes.get(node.bucket, 4138) for node in utility_nodes])
+
+        def sample():
+            hand = np.random.randint(1, num_hands + 1)
+            opp_hand = np.random.randint(1, num_hands + 1)
+
+            return np.where(hand > opp_hand, pot_size - pot_contribution, np.where(hand < opp_hand, -pot_contribution, 0))
+
+        return sample
+
 class TexasHoldEm(Game):
     '''
     An implementation of Heads Up No Limit Texas Hold-Em.
@@ -380,101 +406,112 @@ class TexasHoldEm(Game):
 
         return player_0_action, player_1_action
 
-    def build_game_tree(self, history=[]):
+    def get_canonical_state(self, history):
         '''
-        Recursively builds a game tree consisting of GameNode objects.
+        Returns a canonical state for the histories whose subtrees contain no information sets, so that build_game_dag
+        builds each of them once. Returns None for every other history, since information set keys include the whole
+        betting history and so differ between any two histories that reach a decision.
+
+        Terminal states are identified by the player and terminal utility. Once both players are all in, only chance
+        nodes and terminals follow, and the game's functions only read the last three events of the history, the last
+        two deals, the last state of each player, and the number of deals, which identify the runout.
         '''
+        if len(history) <= 2:
+            return None
+
         player = self.get_player(history)
-        is_chance_node = self.is_chance_node(history)
-        is_terminal_node = self.is_terminal_node(history)
+
+        if self.is_terminal_node(history):
+            utility = self.get_terminal_utility(history)
+
+            if isinstance(utility, DynamicUtility):
+                return ('terminal', player, utility.pot_size, utility.pot_contribution, utility.bucket)
+
+            return ('terminal', player, utility.utility)
 
         chance_nodes = [i for i in history if i[0] == 'r']  # A list of all previously visited chance nodes
         action_nodes = [i for i in history if i[0] != 'r']  # A list of all actions taken by players
-
         player_0_last_state, player_1_last_state = self.get_last_state(action_nodes)
-        last_state, opp_last_state = (player_0_last_state, player_1_last_state) if player == 0 else (player_1_last_state, player_0_last_state)
 
-        if is_terminal_node:
-            terminal_utility = self.get_terminal_utility(history)
+        if player_0_last_state and player_1_last_state and player_0_last_state[3] == 0 and player_1_last_state[3] == 0: # If both players are all in
+            return ('all_in', player, len(chance_nodes), tuple(history[-3:]), tuple(chance_nodes[-2:]), action_nodes[-1], player_0_last_state, player_1_last_state)
 
-            return GameNode(history, player, is_terminal_node=True, terminal_utility=terminal_utility)
+        return None
 
-        elif is_chance_node:
-            chance_outcomes, chance_probs = self.handle_chance(history)
-            next_nodes = []
+    def get_chance_events(self, history, chance_outcomes):
+        '''
+        Returns the event appended to the history for each outcome of a chance node, a ('r', stage, outcome) tuple.
+        '''
+        chance_nodes = [i for i in history if i[0] == 'r']  # A list of all previously visited chance nodes
 
-            if len(chance_nodes) in [0, 1]:
-                stage = 'preflop'
+        if len(chance_nodes) in [0, 1]:
+            stage = 'preflop'
 
-            elif len(chance_nodes) in [2, 3]:
-                stage = 'flop'
+        elif len(chance_nodes) in [2, 3]:
+            stage = 'flop'
 
-            elif len(chance_nodes) in [4, 5]:
-                stage = 'turn'
+        elif len(chance_nodes) in [4, 5]:
+            stage = 'turn'
 
-            else:
-                stage = 'river'
+        else:
+            stage = 'river'
 
-            for outcome in chance_outcomes:
-                next_history = history + [('r', stage, outcome)]
-                next_nodes.append(self.build_game_tree(history=next_history))
+        return [('r', stage, outcome) for outcome in chance_outcomes]
 
-            return GameNode(history, player, next_nodes, is_chance_node=True, chance_outcomes=chance_outcomes, chance_probs=chance_probs)
+    def get_action_events(self, history, player, available_actions):
+        '''
+        Returns the event appended to the history for each available action, a (player, action, pot size, stack size)
+        tuple of the pot and the player's stack after the action.
+        '''
+        action_nodes = [i for i in history if i[0] != 'r']  # A list of all actions taken by players
 
-        else:
-            available_actions = self.get_available_actions(history)
-            next_nodes = []
+        player_0_last_state, player_1_last_state = self.get_last_state(action_nodes)
+        last_state, opp_last_state = (player_0_last_state, player_1_last_state) if player == 0 else (player_1_last_state, player_0_last_state)
 
-            last_pot_size = self.big_blind + self.small_blind if len(action_nodes) == 0 else action_nodes[-1][2]
+        last_pot_size = self.big_blind + self.small_blind if len(action_nodes) == 0 else action_nodes[-1][2]
 
-            if len(action_nodes) == 0:
-                last_stack_size = self.starting_stack - self.small_blind
-                last_opp_stack_size = self.starting_stack - self.small_blind
+        if len(action_nodes) == 0:
+            last_stack_size = self.starting_stack - self.small_blind
+            last_opp_stack_size = self.starting_stack - self.small_blind
 
-            elif len(action_nodes) == 1:
-                last_stack_size = self.starting_stack - self.big_blind
-                last_opp_stack_size = opp_last_state[3]
+        elif len(action_nodes) == 1:
+            last_stack_size = self.starting_stack - self.big_blind
+            last_opp_stack_size = opp_last_state[3]
 
-            else:
-                last_stack_size = last_state[3]
-                last_opp_stack_size = opp_last_state[3]
+        else:
+            last_stack_size = last_state[3]
+            last_opp_stack_size = opp_last_state[3]
 
-            for action in available_actions:
-                if action == 0 or action == 5: # If the player checked or folded
-                    next_history = history + [(player, action, last_pot_size, last_stack_size)]
-                    next_nodes.append(self.build_game_tree(history=next_history))
+        opening = history[-1][0] == 'r' and history[-1][1] == 'preflop' # If the small blind is opening the betting
+        events = []
 
-                elif action == 1:
-                    if last_opp_stack_size >= 3 * self.big_blind: # If the opponent has enough money to call a full bet
-                        next_history = history + [(player, action, last_pot_size + 3 * self.big_blind, last_stack_size - 3 * self.big_blind)]
-                        next_nodes.append(self.build_game_tree(history=next_history))
+        for action in available_actions:
+            if action == 0 or action == 5: # If the player checked or folded
+                events.append((player, action, last_pot_size, last_stack_size))
 
-                    else: # If the opponent does not have enough to bet 3BB but has money remaining
-                        next_history = history + [(player, action, last_pot_size + last_opp_stack_size, last_stack_size - last_opp_stack_size)]
-                        next_nodes.append(self.build_game_tree(history=next_history))
+            elif action == 1:
+                if last_opp_stack_size >= 3 * self.big_blind: # If the opponent has enough money to call a full bet
+                    events.append((player, action, last_pot_size + 3 * self.big_blind, last_stack_size - 3 * self.big_blind))
 
-                elif action == 2:
-                    if history[-1][0] == 'r' and history[-1][1] == 'preflop': # If the small blind is opening with a bet
-                        next_history = history + [(player, action, last_pot_size + (6 * self.big_blind) - self.small_blind, last_stack_size - (6 * self.big_blind) + self.small_blind)]
-                        next_nodes.append(self.build_game_tree(history=next_history))
+                else: # If the opponent does not have enough to bet 3BB but has money remaining
+                    events.append((player, action, last_pot_size + last_opp_stack_size, last_stack_size - last_opp_stack_size))
 
-                    else:
-                        next_history = history + [(player, action, last_pot_size + 6 * self.big_blind, last_stack_size - 6 * self.big_blind)]
-                        next_nodes.append(self.build_game_tree(history=next_history))
+            elif action == 2:
+                if opening:
+                    events.append((player, action, last_pot_size + (6 * self.big_blind) - self.small_blind, last_stack_size - (6 * self.big_blind) + self.small_blind))
 
-                elif action == 3:
-                    if history[-1][0] == 'r' and history[-1][1] == 'preflop': # If the small blind is opening with a bet
-                        next_history = history + [(player, action, last_pot_size + (9 * self.big_blind) - self.small_blind, last_stack_size - (9 * self.big_blind) + self.small_blind)]
-                        next_nodes.append(self.build_game_tree(history=next_history))
+                else:
+                    events.append((player, action, last_pot_size + 6 * self.big_blind, last_stack_size - 6 * self.big_blind))
 
-                    else:
-                        next_history = history + [(player, action, last_pot_size + 9 * self.big_blind, last_stack_size - 9 * self.big_blind)]
-                        next_nodes.append(self.build_game_tree(history=next_history))
+            elif action == 3:
+                if opening:
+                    events.append((player, action, last_pot_size + (9 * self.big_blind) - self.small_blind, last_stack_size - (9 * self.big_blind) + self.small_blind))
 
-                elif action == 4:
-                    last_bet_size = abs(last_stack_size - last_opp_stack_size)
+                else:
+                    events.append((player, action, last_pot_size + 9 * self.big_blind, last_stack_size - 9 * self.big_blind))
 
-                    next_history = history + [(player, action, last_pot_size + last_bet_size, last_stack_size - last_bet_size)]
-                    next_nodes.append(self.build_game_tree(history=next_history))
+            elif action == 4:
+                last_bet_size = abs(last_stack_size - last_opp_stack_size)
+                events.append((player, action, last_pot_size + last_bet_size, last_stack_size - last_bet_size))
 
-            return GameNode(history, player, next_nodes, available_actions)
\ No newline at end of file
+        return events
@@ -0,0 +1,15 @@
+'''
+The order in which the players of a two player game traverse the tree with minimizers whose ALTERNATING flag is True.
+Those minimizers only update the regrets of one player, the traverser, on each iteration. The Trainer, the worker
+processes in Parallel and the benchmarks all take the traverser from get_traverser, so a minimizer is trained the same
+way whichever of them runs it.
+'''
+
+def get_traverser(iteration):
+    '''
+    Returns the player whose regrets are updated on an iteration. Training starts with the first player and alternates
+    between the two players every iteration.
+
+    :param iteration: The iteration of training, counted from one.
+    '''
+    return (iteration - 1) % 2
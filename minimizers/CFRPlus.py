@@ -1,19 +1,25 @@
 import numpy as np
 
-from ..InfoSet import InformationSet
-
 ALTERNATING = True # Whether player regrets are updated successively or alternatingly
+CHANCE_SPLIT = True # Whether the subtrees below the root chance nodes can be traversed in parallel
+DISCOUNTABLE = True # Whether update takes a discounting function
 
-def update(infosets):
+def update(infosets, iteration=None, discounting=None):
     '''
-    Update the strategy sum, strategy, and reach probability sum, and reset the reach probability for each
-    InformationSet following a traversal of the game tree.
+    Update the strategy sum, strategy, and reach probability sum, and reset the reach probability of every information
+    set in the table at once following a traversal of the game tree.
+
+    :param infosets: An InfoSetTable object.
+    :param iteration: The number of the iteration that has just been traversed, passed to discounting.
+    :param discounting: A function of the iteration returning the discount factors to apply, from Discounting, or None
+                        to not discount.
     '''
-    for _, infoset in infosets.items():
-        infoset.update()
-        infoset.reset_regret()
+    if discounting is not None and iteration is None:
+        raise ValueError('Discounting requires the number of the iteration')
+
+    discounts = discounting(iteration) if discounting is not None else None
 
-    return infosets
+    return infosets.update(reset_regret=True, discounts=discounts)
 
 def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverser):
     '''
@@ -21,8 +27,7 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverse
 
     :param game: An implementation of the Game abstract base class.
     :param game_node: A GameNode object representing the current state of the game.
-    :param infosets: A dictionary mapping information set keys to an InformationSet object. The key has the same values
-                     as InformationSet.key.
+    :param infosets: An InfoSetTable mapping information set keys to the values of each information set.
     :param reach_probs: The probability contribution of each player to reaching the current game state, indexed by
                         player.
     :param chance_prob: The probability contribution of chance events to reaching the current game state.
@@ -30,6 +35,9 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverse
     :param traverser: The player who is traversing the game tree. Regret is only updated for information states this player visits.
     :return: The utility of the first player for the single traversal of the game tree.
     '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(game_node)
+
     if game_node.is_chance_node: # If the game is at a chance node
         expected_value = 0
 
@@ -44,16 +52,9 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverse
     if game_node.is_terminal_node: # If the game is at a terminal node
         return game_node.terminal_utility.get_utility()
 
-    infoset_key = game.get_infoset_key(game_node.history)
+    infoset = infosets.lookup(game, game_node)
     available_actions = game_node.available_actions
 
-    if infoset_key not in infosets: # Create a new InformationSet object if this is a new game state
-        infoset = InformationSet(infoset_key, available_actions)
-        infosets[infoset_key] = infoset
-
-    else:
-        infoset = infosets[infoset_key]
-
     player = game_node.player
 
     if player == traverser:
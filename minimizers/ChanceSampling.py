@@ -0,0 +1,172 @@
+import numpy as np
+
+from . import VectorizedEngine
+from .Sampler import default_sampler
+from ..games.CompiledTree import CHANCE_NODE, TERMINAL_NODE
+
+ALTERNATING = False # Whether player regrets are updated successively or alternatingly
+SAMPLING = True # Whether the minimizer samples the game tree, so traversals can run in parallel against a shared table
+
+def update(infosets, iteration=None):
+    '''
+    Update the strategy sum, strategy, and reach probability sum of every information set visited on the last traversal
+    at once.
+    '''
+    return infosets.update(touched_only=True)
+
+def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, sampler=None):
+    '''
+    The chance sampling counterfactual regret minimization algorithm. A single outcome is sampled at every chance node,
+    and every action of every player is traversed below it. Since each outcome is sampled with its chance probability,
+    the sampled counterfactual values are unbiased without weighting them by the probability of the chance events.
+
+    :param game: An implementation of the Game abstract base class.
+    :param game_node: A GameNode object representing the current state of the game.
+    :param infosets: An InfoSetTable mapping information set keys to the values of each information set.
+    :param reach_probs: The probability contribution of each player to reaching the current game state, indexed by
+                        player.
+    :param chance_prob: The probability contribution of chance events to reaching the current game state. Is not changed
+                        by sampled chance events.
+    :param iteration: How many iterations of CFR have been run.
+    :param sampler: The Sampler used to choose chance outcomes. Defaults to a shared module level sampler.
+    :return: The utility of the first player for the single traversal of the game tree.
+    '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(game_node)
+
+    if sampler is None:
+        sampler = default_sampler()
+
+    if game_node.is_chance_node: # If the game is at a chance node
+        next_node = game_node.next_nodes[sampler.choice(game_node.chance_cdf)] # Sample a single chance outcome
+
+        return cfr(game, next_node, infosets, reach_probs, chance_prob, iteration, sampler)
+
+    if game_node.is_terminal_node: # If the game is at a terminal node
+        return game_node.terminal_utility.get_utility()
+
+    infoset = infosets.lookup(game, game_node)
+    available_actions = game_node.available_actions
+
+    player = game_node.player
+    infoset.reach_prob += reach_probs[player]
+
+    action_utils = np.zeros(len(available_actions))
+    strategy = infoset.strategy
+
+    for i in range(len(game_node.next_nodes)): # Sample every possible action
+        next_node = game_node.next_nodes[i]
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        utility_multiplier = 1 if game.num_players == 1 or player == next_node.player else -1
+        action_utils[i] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration, sampler)
+
+    util = np.sum(action_utils * strategy)
+    regrets = action_utils - util
+    opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
+    infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
+
+def cfr_state(game, state, infosets, reach_probs, chance_prob, iteration, sampler=None):
+    '''
+    The chance sampling counterfactual regret minimization algorithm, traversing the game with a GameState cursor
+    instead of a game tree. Takes the same parameters as cfr, with state in place of game_node, and leaves the cursor
+    where it was.
+    '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(state)
+
+    if sampler is None:
+        sampler = default_sampler()
+
+    if state.is_chance_node: # If the game is at a chance node
+        state.push(sampler.choice(state.chance_cdf)) # Sample a single chance outcome
+        value = cfr_state(game, state, infosets, reach_probs, chance_prob, iteration, sampler)
+        state.pop()
+
+        return value
+
+    if state.is_terminal_node: # If the game is at a terminal node
+        return state.terminal_utility.get_utility()
+
+    infoset = infosets.lookup(game, state)
+    available_actions = state.available_actions
+
+    player = state.player
+    infoset.reach_prob += reach_probs[player]
+
+    action_utils = np.zeros(len(available_actions))
+    strategy = infoset.strategy
+
+    for i in range(len(available_actions)): # Sample every possible action
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        state.push(i)
+        utility_multiplier = 1 if game.num_players == 1 or player == state.player else -1
+        action_utils[i] = utility_multiplier * cfr_state(game, state, infosets, next_reach_probs, chance_prob, iteration, sampler)
+        state.pop()
+
+    util = np.sum(action_utils * strategy)
+    regrets = action_utils - util
+    opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
+    infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
+
+def cfr_compiled(game, tree, infosets, reach_probs, chance_prob, iteration, sampler=None):
+    '''
+    The chance sampling counterfactual regret minimization algorithm, traversing a CompiledTree instead of GameNode
+    objects. Takes the same parameters as cfr, with tree in place of game_node, and samples the same chance outcomes as
+    cfr does on the tree that was compiled given a sampler in the same state.
+    '''
+    if sampler is None:
+        sampler = default_sampler()
+
+    return _cfr_compiled(game, VectorizedEngine.get_node_lists(tree, infosets), 0, infosets, reach_probs, chance_prob, sampler)
+
+def _cfr_compiled(game, nodes, node, infosets, reach_probs, chance_prob, sampler):
+    '''
+    Traverses the subtree below a node of a CompiledTree for cfr_compiled.
+
+    :param nodes: The NodeLists of the CompiledTree.
+    :param node: The id of the current node.
+    '''
+    node_type = nodes.node_type[node]
+
+    if infosets.node_counter is not None:
+        infosets.node_counter.count(node_type)
+
+    if node_type == CHANCE_NODE: # If the game is at a chance node
+        next_node = nodes.first_child[node] + sampler.choice(nodes.chance_cdf[node]) # Sample a single chance outcome
+
+        return _cfr_compiled(game, nodes, next_node, infosets, reach_probs, chance_prob, sampler)
+
+    if node_type == TERMINAL_NODE: # If the game is at a terminal node
+        utility_node = nodes.utility_nodes[node]
+
+        return nodes.terminal_utility[node] if utility_node is None else utility_node.get_utility()
+
+    block, row = nodes.blocks[node], nodes.rows[node]
+    block.touched[row] = True
+    first_child = nodes.first_child[node]
+    num_children = nodes.num_children[node]
+
+    player = nodes.player[node]
+    block.reach_prob[row] += reach_probs[player]
+
+    action_utils = np.zeros(num_children)
+    strategy = block.strategy[row]
+
+    for i in range(num_children): # Sample every possible action
+        next_node = first_child + i
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        action_utils[i] = nodes.edge_sign[next_node] * _cfr_compiled(game, nodes, next_node, infosets, next_reach_probs, chance_prob, sampler)
+
+    util = (action_utils * strategy).sum()
+    regrets = action_utils - util
+    opp_contribution = reach_probs.prod() / (reach_probs[player] if reach_probs[player] != 0 else 1)
+    block.regret_sum[row] += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
@@ -0,0 +1,24 @@
+from . import Discounting
+from .VanillaCFR import cfr, cfr_state
+
+ALTERNATING = False # Whether player regrets are updated successively or alternatingly
+CHANCE_SPLIT = True # Whether the subtrees below the root chance nodes can be traversed in parallel
+ALPHA = 1.5 # The exponent of the discount applied to positive regrets
+BETA = 0 # The exponent of the discount applied to negative regrets
+GAMMA = 2 # The exponent of the weight of each iteration's strategy in the average strategy
+
+def update(infosets, iteration=None):
+    '''
+    Discount the regret sums and strategy sums of every information set in the table in place, then update the strategy
+    sum, strategy, and reach probability sum of every information set at once following a traversal of the game tree.
+    The game tree is traversed in the same way as by VanillaCFR.
+
+    :param infosets: An InfoSetTable object.
+    :param iteration: The number of the iteration that has just been traversed. Required, since the discounts depend on it.
+    '''
+    if iteration is None:
+        raise ValueError('DCFR requires the number of the iteration')
+
+    discounts = Discounting.dcfr_discounts(iteration, ALPHA, BETA, GAMMA)
+
+    return infosets.update(discounts=discounts)
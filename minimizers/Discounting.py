@@ -0,0 +1,36 @@
+'''
+Iteration-dependent discount factors for the accumulated regrets and strategy sums of the full-width minimizers. Each
+function takes the number of the iteration that has just been traversed, starting from one, and returns a (positive
+regret, negative regret, strategy sum) tuple of discount factors. The regret sums, which already include the regrets of
+that iteration, are multiplied by the regret factors, and the strategy sums are multiplied by the strategy factor before
+the strategy of that iteration is added to them.
+
+Pass one of these functions as the discounting of a Trainer running VanillaCFR, CFRPlus, VectorizedCFR or
+VectorizedCFRPlus to discount their sums, for example to give CFR+ linear averaging:
+
+    Trainer(game, CFRPlus, discounting=Discounting.linear_averaging)
+
+https://arxiv.org/abs/1809.04040
+'''
+
+def dcfr_discounts(iteration, alpha=1.5, beta=0, gamma=2):
+    '''
+    The discount factors of Discounted CFR. Positive regrets are multiplied by t^alpha / (t^alpha + 1), negative regrets
+    by t^beta / (t^beta + 1), and the strategy of iteration t is weighted by t^gamma in the average strategy.
+    '''
+    positive_weight = iteration ** alpha
+    negative_weight = iteration ** beta
+
+    return positive_weight / (positive_weight + 1), negative_weight / (negative_weight + 1), ((iteration - 1) / iteration) ** gamma
+
+def linear_discounts(iteration):
+    '''
+    The discount factors of Linear CFR, which weights the regrets and strategy of iteration t by t.
+    '''
+    return dcfr_discounts(iteration, 1, 1, 1)
+
+def linear_averaging(iteration):
+    '''
+    Weights the strategy of iteration t by t in the average strategy, without discounting regrets.
+    '''
+    return 1, 1, (iteration - 1) / iteration
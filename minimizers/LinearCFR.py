@@ -0,0 +1,22 @@
+from . import Discounting
+from .VanillaCFR import cfr, cfr_state
+
+ALTERNATING = False # Whether player regrets are updated successively or alternatingly
+CHANCE_SPLIT = True # Whether the subtrees below the root chance nodes can be traversed in parallel
+
+def update(infosets, iteration=None):
+    '''
+    Discount the regret sums and strategy sums of every information set in the table in place so that the regrets and
+    strategy of iteration t are weighted by t, then update the strategy sum, strategy, and reach probability sum of every
+    information set at once following a traversal of the game tree. The game tree is traversed in the same way as by
+    VanillaCFR.
+
+    :param infosets: An InfoSetTable object.
+    :param iteration: The number of the iteration that has just been traversed. Required, since the discounts depend on it.
+    '''
+    if iteration is None:
+        raise ValueError('LinearCFR requires the number of the iteration')
+
+    discounts = Discounting.linear_discounts(iteration)
+
+    return infosets.update(discounts=discounts)
@@ -1,55 +1,53 @@
 import numpy as np
 
-from ..InfoSet import InformationSet
+from . import VectorizedEngine
+from .Sampler import default_sampler
+from ..games.CompiledTree import CHANCE_NODE, TERMINAL_NODE
 
 ALTERNATING = True # Whether player regrets are updated successively or alternatingly
+SAMPLING = True # Whether the minimizer samples the game tree, so traversals can run in parallel against a shared table
 
-def update(infosets):
+def update(infosets, iteration=None):
     '''
-    Update the strategy sum, strategy, and reach probability sum for each InformationSet following a traversal of the
-    game tree.
+    Update the strategy sum, strategy, and reach probability sum of every information set in the table at once
+    following a traversal of the game tree.
     '''
-    for _, infoset in infosets.items():
-        infoset.update()
-        infoset.reset_regret()
+    return infosets.update(reset_regret=True, touched_only=True)
 
-    return infosets
-
-def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverser):
+def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverser, sampler=None):
     '''
     The monte carlo counterfactual regret minimization algorithm with external sampling (opponent actions and chance outcomes).
 
     :param game: An implementation of the Game abstract base class.
     :param game_node: A GameNode object representing the current state of the game.
-    :param infosets: A dictionary mapping information set keys to an InformationSet object. The key has the same values
-                     as InformationSet.key.
+    :param infosets: An InfoSetTable mapping information set keys to the values of each information set.
     :param reach_probs: The probability contribution of each player to reaching the current game state, indexed by
                         player.
     :param chance_prob: The probability contribution of chance events to reaching the current game state.
     :param iteration: How many iterations of CFR have been run.
     :param traverser: The player who is traversing the game tree. Regret is only updated for information states this player visits.
+    :param sampler: The Sampler used to choose chance outcomes and actions. Defaults to a shared module level sampler.
     :return: The utility of the first player for the single traversal of the game tree.
     '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(game_node)
+
+    if sampler is None:
+        sampler = default_sampler()
+
     if game_node.is_chance_node: # If the game is at a chance node
-        next_node_idx = np.random.choice(np.arange((len(game_node.next_nodes))), p=game_node.chance_probs)
+        next_node_idx = sampler.choice(game_node.chance_cdf)
         next_node = game_node.next_nodes[next_node_idx]
         chance = game_node.chance_probs[next_node_idx]
 
-        return cfr(game, next_node, infosets, reach_probs, chance_prob * chance, iteration, traverser)
+        return cfr(game, next_node, infosets, reach_probs, chance_prob * chance, iteration, traverser, sampler)
 
     if game_node.is_terminal_node: # If the game is at a terminal node
         return game_node.terminal_utility.get_utility()
 
-    infoset_key = game.get_infoset_key(game_node.history)
+    infoset = infosets.lookup(game, game_node)
     available_actions = game_node.available_actions
 
-    if infoset_key not in infosets: # Create a new InformationSet object if this is a new game state
-        infoset = InformationSet(infoset_key, available_actions)
-        infosets[infoset_key] = infoset
-
-    else:
-        infoset = infosets[infoset_key]
-
     player = game_node.player
 
     if player == traverser:
@@ -64,15 +62,73 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverse
             next_reach_probs = reach_probs.copy()
             next_reach_probs[player] *= strategy[i]
             utility_multiplier = 1 if game.num_players == 1 or player == next_node.player else -1
-            action_utils[i] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration, traverser)
+            action_utils[i] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration, traverser, sampler)
 
     else:
-        next_node_idx = np.random.choice(np.arange(len(game_node.next_nodes)))  # Uniformly sample a single action
+        next_node_idx = sampler.randint(len(game_node.next_nodes))  # Uniformly sample a single action
         next_node = game_node.next_nodes[next_node_idx]
         next_reach_probs = reach_probs.copy()
         next_reach_probs[player] *= strategy[next_node_idx]
         utility_multiplier = 1 if game.num_players == 1 or player == next_node.player else -1
-        action_utils[next_node_idx] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration, traverser)
+        action_utils[next_node_idx] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration, traverser, sampler)
+
+    util = np.sum(action_utils * strategy)
+    regrets = action_utils - util
+    opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
+
+    if player == traverser:
+        infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
+
+def cfr_state(game, state, infosets, reach_probs, chance_prob, iteration, traverser, sampler=None):
+    '''
+    The monte carlo counterfactual regret minimization algorithm with external sampling, traversing the game with a
+    GameState cursor instead of a game tree. Takes the same parameters as cfr, with state in place of game_node, and
+    leaves the cursor where it was.
+    '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(state)
+
+    if sampler is None:
+        sampler = default_sampler()
+
+    if state.is_chance_node: # If the game is at a chance node
+        next_node_idx = sampler.choice(state.chance_cdf)
+        chance = state.chance_probs[next_node_idx]
+        state.push(next_node_idx)
+        value = cfr_state(game, state, infosets, reach_probs, chance_prob * chance, iteration, traverser, sampler)
+        state.pop()
+
+        return value
+
+    if state.is_terminal_node: # If the game is at a terminal node
+        return state.terminal_utility.get_utility()
+
+    infoset = infosets.lookup(game, state)
+    available_actions = state.available_actions
+
+    player = state.player
+
+    if player == traverser:
+        infoset.reach_prob += reach_probs[player]
+
+    action_utils = np.zeros(len(available_actions))
+    strategy = infoset.strategy
+
+    if player == traverser:
+        sampled_actions = range(len(available_actions)) # Sample every possible action
+
+    else:
+        sampled_actions = [sampler.randint(len(available_actions))] # Uniformly sample a single action
+
+    for i in sampled_actions:
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        state.push(i)
+        utility_multiplier = 1 if game.num_players == 1 or player == state.player else -1
+        action_utils[i] = utility_multiplier * cfr_state(game, state, infosets, next_reach_probs, chance_prob, iteration, traverser, sampler)
+        state.pop()
 
     util = np.sum(action_utils * strategy)
     regrets = action_utils - util
@@ -81,4 +137,72 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverse
     if player == traverser:
         infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
 
-    return util
\ No newline at end of file
+    return util
+
+def cfr_compiled(game, tree, infosets, reach_probs, chance_prob, iteration, traverser, sampler=None):
+    '''
+    The monte carlo counterfactual regret minimization algorithm with external sampling, traversing a CompiledTree
+    instead of GameNode objects. Takes the same parameters as cfr, with tree in place of game_node, and samples the same
+    chance outcomes and actions as cfr does on the tree that was compiled given a sampler in the same state.
+    '''
+    if sampler is None:
+        sampler = default_sampler()
+
+    return _cfr_compiled(game, VectorizedEngine.get_node_lists(tree, infosets), 0, infosets, reach_probs, chance_prob, traverser, sampler)
+
+def _cfr_compiled(game, nodes, node, infosets, reach_probs, chance_prob, traverser, sampler):
+    '''
+    Traverses the subtree below a node of a CompiledTree for cfr_compiled.
+
+    :param nodes: The NodeLists of the CompiledTree.
+    :param node: The id of the current node.
+    '''
+    node_type = nodes.node_type[node]
+
+    if infosets.node_counter is not None:
+        infosets.node_counter.count(node_type)
+
+    if node_type == CHANCE_NODE: # If the game is at a chance node
+        next_node_idx = sampler.choice(nodes.chance_cdf[node])
+        chance = nodes.chance_probs[node][next_node_idx]
+
+        return _cfr_compiled(game, nodes, nodes.first_child[node] + next_node_idx, infosets, reach_probs, chance_prob * chance, traverser, sampler)
+
+    if node_type == TERMINAL_NODE: # If the game is at a terminal node
+        utility_node = nodes.utility_nodes[node]
+
+        return nodes.terminal_utility[node] if utility_node is None else utility_node.get_utility()
+
+    block, row = nodes.blocks[node], nodes.rows[node]
+    block.touched[row] = True
+    first_child = nodes.first_child[node]
+    num_children = nodes.num_children[node]
+
+    player = nodes.player[node]
+
+    if player == traverser:
+        block.reach_prob[row] += reach_probs[player]
+
+    action_utils = np.zeros(num_children)
+    strategy = block.strategy[row]
+
+    if player == traverser:
+        sampled_actions = range(num_children) # Sample every possible action
+
+    else:
+        sampled_actions = [sampler.randint(num_children)] # Uniformly sample a single action
+
+    for i in sampled_actions:
+        next_node = first_child + i
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        action_utils[i] = nodes.edge_sign[next_node] * _cfr_compiled(game, nodes, next_node, infosets, next_reach_probs, chance_prob, traverser, sampler)
+
+    util = (action_utils * strategy).sum()
+    regrets = action_utils - util
+    opp_contribution = reach_probs.prod() / (reach_probs[player] if reach_probs[player] != 0 else 1)
+
+    if player == traverser:
+        block.regret_sum[row] += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
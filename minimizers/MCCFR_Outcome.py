@@ -1,70 +1,269 @@
 import numpy as np
 
-from ..InfoSet import InformationSet
+from . import VectorizedEngine
+from .Sampler import default_sampler
+from ..games.CompiledTree import CHANCE_NODE, TERMINAL_NODE
 
 ALTERNATING = False # Whether player regrets are updated successively or alternatingly
+SAMPLING = True # Whether the minimizer samples the game tree, so traversals can run in parallel against a shared table
 
-def update(infosets):
+def update(infosets, iteration=None):
     '''
-    Update the strategy sum, strategy, and reach probability sum for each InformationSet following a traversal of the
-    game tree.
+    Update the strategy sum, strategy, and reach probability sum of every information set in the table at once
+    following a traversal of the game tree.
     '''
-    for _, infoset in infosets.items():
-        infoset.update()
+    return infosets.update(touched_only=True)
 
-    return infosets
-
-def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration):
+def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, sampler=None):
     '''
     The monte carlo counterfactual regret minimization algorithm with outcome sampling (all player actions, opponent
     actions, and chance outcomes to get to a single outcome).
 
     :param game: An implementation of the Game abstract base class.
     :param game_node: A GameNode object representing the current state of the game.
-    :param infosets: A dictionary mapping information set keys to an InformationSet object. The key has the same values
-                     as InformationSet.key.
+    :param infosets: An InfoSetTable mapping information set keys to the values of each information set.
     :param reach_probs: The probability contribution of each player to reaching the current game state, indexed by
                         player.
     :param chance_prob: The probability contribution of chance events to reaching the current game state.
     :param iteration: How many iterations of CFR have been run.
+    :param sampler: The Sampler used to choose chance outcomes and actions. Defaults to a shared module level sampler.
     :return: The utility of the first player for the single traversal of the game tree.
     '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(game_node)
+
+    if sampler is None:
+        sampler = default_sampler()
+
     if game_node.is_chance_node: # If the game is at a chance node
-        next_node_idx = np.random.choice(np.arange((len(game_node.next_nodes))), p=game_node.chance_probs)
+        next_node_idx = sampler.choice(game_node.chance_cdf)
         next_node = game_node.next_nodes[next_node_idx]
         chance = game_node.chance_probs[next_node_idx]
 
-        return cfr(game, next_node, infosets, reach_probs, chance_prob * chance, iteration)
+        return cfr(game, next_node, infosets, reach_probs, chance_prob * chance, iteration, sampler)
 
     if game_node.is_terminal_node: # If the game is at a terminal node
         return game_node.terminal_utility.get_utility()
 
-    infoset_key = game.get_infoset_key(game_node.history)
+    infoset = infosets.lookup(game, game_node)
     available_actions = game_node.available_actions
 
-    if infoset_key not in infosets: # Create a new InformationSet object if this is a new game state
-        infoset = InformationSet(infoset_key, available_actions)
-        infosets[infoset_key] = infoset
-
-    else:
-        infoset = infosets[infoset_key]
-
     player = game_node.player
     infoset.reach_prob += reach_probs[player]
 
     action_utils = np.zeros(len(available_actions))
     strategy = infoset.strategy
 
-    next_node_idx = np.random.choice(np.arange(len(game_node.next_nodes))) # Uniformly sample a single action
+    next_node_idx = sampler.randint(len(game_node.next_nodes)) # Uniformly sample a single action
     next_node = game_node.next_nodes[next_node_idx]
     next_reach_probs = reach_probs.copy()
     next_reach_probs[player] *= strategy[next_node_idx]
     utility_multiplier = 1 if game.num_players == 1 or player == next_node.player else -1
-    action_utils[next_node_idx] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration)
+    action_utils[next_node_idx] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration, sampler)
+
+    util = np.sum(action_utils * strategy)
+    regrets = action_utils - util
+    opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
+    infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
+
+def cfr_state(game, state, infosets, reach_probs, chance_prob, iteration, sampler=None):
+    '''
+    The monte carlo counterfactual regret minimization algorithm with outcome sampling, traversing the game with a
+    GameState cursor instead of a game tree. Takes the same parameters as cfr, with state in place of game_node, and
+    leaves the cursor where it was.
+    '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(state)
+
+    if sampler is None:
+        sampler = default_sampler()
+
+    if state.is_chance_node: # If the game is at a chance node
+        next_node_idx = sampler.choice(state.chance_cdf)
+        chance = state.chance_probs[next_node_idx]
+        state.push(next_node_idx)
+        value = cfr_state(game, state, infosets, reach_probs, chance_prob * chance, iteration, sampler)
+        state.pop()
+
+        return value
+
+    if state.is_terminal_node: # If the game is at a terminal node
+        return state.terminal_utility.get_utility()
+
+    infoset = infosets.lookup(game, state)
+    available_actions = state.available_actions
+
+    player = state.player
+    infoset.reach_prob += reach_probs[player]
+
+    action_utils = np.zeros(len(available_actions))
+    strategy = infoset.strategy
+
+    next_node_idx = sampler.randint(len(available_actions)) # Uniformly sample a single action
+    next_reach_probs = reach_probs.copy()
+    next_reach_probs[player] *= strategy[next_node_idx]
+    state.push(next_node_idx)
+    utility_multiplier = 1 if game.num_players == 1 or player == state.player else -1
+    action_utils[next_node_idx] = utility_multiplier * cfr_state(game, state, infosets, next_reach_probs, chance_prob, iteration, sampler)
+    state.pop()
 
     util = np.sum(action_utils * strategy)
     regrets = action_utils - util
     opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
     infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
 
-    return util
\ No newline at end of file
+    return util
+
+def cfr_compiled(game, tree, infosets, reach_probs, chance_prob, iteration, sampler=None):
+    '''
+    The monte carlo counterfactual regret minimization algorithm with outcome sampling, following a single trajectory
+    through a CompiledTree instead of GameNode objects. Takes the same parameters as cfr, with tree in place of
+    game_node, and samples the same trajectory as cfr does on the tree that was compiled given a sampler in the same
+    state. Use cfr_batch to sample many trajectories at once.
+    '''
+    if sampler is None:
+        sampler = default_sampler()
+
+    return _cfr_compiled(game, VectorizedEngine.get_node_lists(tree, infosets), 0, infosets, reach_probs, chance_prob, sampler)
+
+def _cfr_compiled(game, nodes, node, infosets, reach_probs, chance_prob, sampler):
+    '''
+    Traverses the subtree below a node of a CompiledTree for cfr_compiled.
+
+    :param nodes: The NodeLists of the CompiledTree.
+    :param node: The id of the current node.
+    '''
+    node_type = nodes.node_type[node]
+
+    if infosets.node_counter is not None:
+        infosets.node_counter.count(node_type)
+
+    if node_type == CHANCE_NODE: # If the game is at a chance node
+        next_node_idx = sampler.choice(nodes.chance_cdf[node])
+        chance = nodes.chance_probs[node][next_node_idx]
+
+        return _cfr_compiled(game, nodes, nodes.first_child[node] + next_node_idx, infosets, reach_probs, chance_prob * chance, sampler)
+
+    if node_type == TERMINAL_NODE: # If the game is at a terminal node
+        utility_node = nodes.utility_nodes[node]
+
+        return nodes.terminal_utility[node] if utility_node is None else utility_node.get_utility()
+
+    block, row = nodes.blocks[node], nodes.rows[node]
+    block.touched[row] = True
+    num_children = nodes.num_children[node]
+
+    player = nodes.player[node]
+    block.reach_prob[row] += reach_probs[player]
+
+    action_utils = np.zeros(num_children)
+    strategy = block.strategy[row]
+
+    next_node_idx = sampler.randint(num_children) # Uniformly sample a single action
+    next_node = nodes.first_child[node] + next_node_idx
+    next_reach_probs = reach_probs.copy()
+    next_reach_probs[player] *= strategy[next_node_idx]
+    action_utils[next_node_idx] = nodes.edge_sign[next_node] * _cfr_compiled(game, nodes, next_node, infosets, next_reach_probs, chance_prob, sampler)
+
+    util = (action_utils * strategy).sum()
+    regrets = action_utils - util
+    opp_contribution = reach_probs.prod() / (reach_probs[player] if reach_probs[player] != 0 else 1)
+    block.regret_sum[row] += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
+
+def cfr_batch(game, tree, infosets, reach_probs, chance_prob, iteration, sampler=None, batch_size=64):
+    '''
+    Runs batch_size outcome sampling traversals of a CompiledTree in lockstep. Every trajectory advances one node per
+    step, with the children of all trajectories sampled by a single inverse-CDF lookup, and regrets are then accumulated
+    for every step of every trajectory at once. Equivalent to calling cfr batch_size times without updating the
+    strategies in between: the utility of each trajectory's terminal node is sampled separately, as cfr samples it on
+    each visit.
+
+    :param game: An implementation of the Game abstract base class.
+    :param tree: A CompiledTree object representing the game tree.
+    :param infosets: An InfoSetTable object.
+    :param reach_probs: The probability contribution of each player to reaching the root of the game tree, indexed by
+                        player.
+    :param chance_prob: The probability contribution of chance events to reaching the root of the game tree.
+    :param iteration: How many iterations of CFR have been run.
+    :param sampler: The Sampler used to choose chance outcomes and actions. Defaults to a shared module level sampler.
+    :param batch_size: The number of trajectories to sample.
+    :return: The sum of the utilities of the first player over every trajectory.
+    '''
+    if sampler is None:
+        sampler = default_sampler()
+
+    layout = VectorizedEngine.get_layout(tree, infosets)
+    trajectories = np.arange(batch_size)
+    nodes = np.zeros(batch_size, dtype=np.int64)
+    reach = np.tile(np.asarray(reach_probs, dtype=np.float64), (batch_size, 1))
+    chance = np.full(batch_size, float(chance_prob))
+    steps = [] # (trajectories, nodes, sampled children, sampled action probabilities, reach, chance) at decision nodes
+
+    while len(trajectories) > 0: # Top-down pass, sampling one child of every unfinished trajectory per step
+        current = nodes[trajectories]
+        node_type = tree.node_type[current]
+        unfinished = node_type != TERMINAL_NODE
+        trajectories, current, node_type = trajectories[unfinished], current[unfinished], node_type[unfinished]
+
+        if len(trajectories) == 0:
+            break
+
+        children = tree.sample_children(current, sampler.uniforms(len(trajectories)))
+        is_chance = node_type == CHANCE_NODE
+        chance[trajectories[is_chance]] *= tree.edge_prob[children[is_chance]]
+
+        decisions = trajectories[~is_chance]
+        decision_nodes, decision_children = current[~is_chance], children[~is_chance]
+        probs = _action_probs(layout, decision_nodes, tree.action_index[decision_children])
+        steps.append((decisions, decision_nodes, decision_children, probs, reach[decisions], chance[decisions]))
+        reach[decisions, tree.player[decision_nodes]] *= probs
+        nodes[trajectories] = children
+
+    value = tree.sample_terminal_utilities(nodes)
+
+    for decisions, decision_nodes, children, probs, step_reach, step_chance in reversed(steps): # Bottom-up pass
+        action_util = tree.edge_sign[children] * value[decisions]
+        util = probs * action_util
+        player_reach = step_reach[np.arange(len(decisions)), tree.player[decision_nodes]]
+        opp_contribution = np.prod(step_reach, axis=1) / np.where(player_reach != 0, player_reach, 1)
+        weight = opp_contribution * step_chance
+
+        for i, group in enumerate(layout.groups):
+            mask = layout.group_by_node[decision_nodes] == i
+
+            if not np.any(mask):
+                continue
+
+            block, rows = group.block, layout.row_by_node[decision_nodes[mask]]
+            np.add.at(block.regret_sum, rows, -(weight[mask] * util[mask])[:, None]) # Regret of every action is minus the node's utility ...
+            np.add.at(block.regret_sum, (rows, tree.action_index[children[mask]]), weight[mask] * action_util[mask]) # ... plus the sampled action's utility
+            np.add.at(block.reach_prob, rows, player_reach[mask])
+            block.touched[rows] = True
+
+        value[decisions] = util
+
+    return np.sum(value)
+
+def _action_probs(layout, nodes, actions):
+    '''
+    Returns the current strategy's probability of taking an action at each of a set of decision nodes.
+
+    :param layout: The TreeLayout of the tree.
+    :param nodes: An array of decision node ids.
+    :param actions: The index of the action taken at each node.
+    :return: An array with one probability per node.
+    '''
+    probs = np.empty(len(nodes))
+    groups = layout.group_by_node[nodes]
+
+    for i, group in enumerate(layout.groups):
+        mask = groups == i
+
+        if np.any(mask):
+            probs[mask] = group.block.strategy[layout.row_by_node[nodes[mask]], actions[mask]]
+
+    return probs
@@ -1,45 +1,102 @@
-import math
 import numpy as np
 
-from ..InfoSet import InformationSet
+from . import VectorizedEngine
+from ..games.CompiledTree import CHANCE_NODE, TERMINAL_NODE
 
-ALTERNATING = False # Whether player regrets are updated successively or alternatingly
+ALTERNATING = True # Whether player regrets are updated successively or alternatingly
+PRUNING = True # Whether subtrees that cannot change the table are skipped. Only turned off to measure what pruning saves
 
-def compute_regret_threshold(available_actions, iteration):
+class PruningState:
     '''
-    Computes a dynamic regret threshold used to prune actions.
-    https://www.cs.cmu.edu/~sandholm/dynamicThresholding.aaai17.pdf
+    How much of the game tree each traversal skipped, kept in an InfoSetTable's minimizer_state so that it is stored in
+    checkpoints along with the table.
     '''
-    C = 2
-    numerator = (C - 1) * (math.log(len(available_actions))) ** .5
-    denominator = (2 ** .5) * (len(available_actions)) ** 2 * (iteration ** .5)
 
-    return numerator / denominator
+    def __init__(self):
+        '''
+        Initializes the state with the following variables:
+
+            num_nodes: The number of nodes visited on the first iteration, on which every strategy is uniform and the
+                       whole tree is visited.
+            nodes_visited: The number of nodes visited on the current iteration.
+            skipped_actions: The number of actions skipped on the current iteration.
+            pruned_fractions: The fraction of the tree skipped on each iteration.
+            pruned_actions: The number of actions skipped on each iteration.
+        '''
+        self.num_nodes = None
+        self.nodes_visited = 0
+        self.skipped_actions = 0
+        self.pruned_fractions = []
+        self.pruned_actions = []
+
+def get_state(infosets):
+    '''
+    Returns the PruningState of an InfoSetTable, creating it on the first traversal.
+    '''
+    if infosets.minimizer_state is None:
+        infosets.minimizer_state = PruningState()
+
+    return infosets.minimizer_state
 
-def update(infosets):
+def pruning_stats(infosets):
     '''
-    Update the strategy sum, strategy, and reach probability sum for each InformationSet following a traversal of the
-    game tree.
+    Returns a dictionary of pruning statistics for an InfoSetTable trained with this minimizer: the fraction of the
+    tree skipped on each iteration, the fraction skipped on the last iteration, and the number of actions skipped on
+    the last iteration.
     '''
-    for _, infoset in infosets.items():
-        infoset.update()
+    state = get_state(infosets)
+    last = state.pruned_fractions[-1] if state.pruned_fractions else 0.0
 
-    return infosets
+    return {'pruned_fractions': list(state.pruned_fractions), 'pruned_fraction': last, 'pruned_actions': state.pruned_actions[-1] if state.pruned_actions else 0}
 
-def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration):
+def update(infosets, iteration=None):
     '''
-    The vanilla counterfactual regret minimization algorithm with regret based pruning.
+    Update the strategy sum, strategy, and reach probability sum of every information set in the table at once
+    following a traversal of the game tree, and record how much of the tree the traversal skipped.
+
+    :param infosets: An InfoSetTable object.
+    :param iteration: The number of the iteration that has just been traversed.
+    '''
+    state = get_state(infosets)
+
+    if state.num_nodes is None:
+        state.num_nodes = state.nodes_visited
+
+    state.pruned_fractions.append(1 - state.nodes_visited / state.num_nodes if state.num_nodes else 0.0)
+    state.pruned_actions.append(state.skipped_actions)
+    state.nodes_visited = 0
+    state.skipped_actions = 0
+
+    return infosets.update()
+
+def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration, traverser):
+    '''
+    The vanilla counterfactual regret minimization algorithm with alternating updates and regret based pruning. Once an
+    information set has an action with positive regret, regret matching gives every action without one a probability of
+    zero, and the subtree below an action the opponent of the traverser plays with probability zero is not traversed.
+    Pruning is exact: the opponent's reach probability is zero throughout that subtree, so it adds nothing to the
+    traverser's counterfactual regrets, to the opponent's reach probabilities, which the average strategies of the
+    opponent are accumulated from, or to the value of the opponent's information set. Actions of the traverser are never
+    pruned, since the regrets of the skipped iterations could only be estimated when their pruning ended.
+    https://proceedings.neurips.cc/paper/2015/file/c54e7837e0cd0ced286cb5995327d1ab-Paper.pdf
 
     :param game: An implementation of the Game abstract base class.
     :param game_node: A GameNode object representing the current state of the game.
-    :param infosets: A dictionary mapping information set keys to an InformationSet object. The key has the same values
-                     as InformationSet.key.
+    :param infosets: An InfoSetTable mapping information set keys to the values of each information set.
     :param reach_probs: The probability contribution of each player to reaching the current game state, indexed by
                         player.
     :param chance_prob: The probability contribution of chance events to reaching the current game state.
     :param iteration: How many iterations of CFR have been run.
+    :param traverser: The player who is traversing the game tree. Regret is only updated for information states this
+                      player visits, and the reach probabilities of the other player are accumulated.
     :return: The utility of the first player for the single traversal of the game tree.
     '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(game_node)
+
+    state = get_state(infosets)
+    state.nodes_visited += 1
+
     if game_node.is_chance_node: # If the game is at a chance node
         expected_value = 0
 
@@ -47,47 +104,111 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration):
             next_node = game_node.next_nodes[i]
             chance = game_node.chance_probs[i]
 
-            expected_value += chance * cfr(game, next_node, infosets, reach_probs, chance_prob * chance, iteration)
+            expected_value += chance * cfr(game, next_node, infosets, reach_probs, chance_prob * chance, iteration, traverser)
 
         return expected_value
 
     if game_node.is_terminal_node: # If the game is at a terminal node
         return game_node.terminal_utility.get_utility()
 
-    infoset_key = game.get_infoset_key(game_node.history)
+    infoset = infosets.lookup(game, game_node)
     available_actions = game_node.available_actions
 
-    if infoset_key not in infosets: # Create a new InformationSet object if this is a new game state
-        infoset = InformationSet(infoset_key, available_actions)
-        infosets[infoset_key] = infoset
-
-    else:
-        infoset = infosets[infoset_key]
-
     player = game_node.player
-    infoset.reach_prob += reach_probs[player]
+
+    if player != traverser:
+        infoset.reach_prob += reach_probs[player]
 
     action_utils = np.zeros(len(available_actions))
     strategy = infoset.strategy
-    strategy[strategy < compute_regret_threshold(available_actions, iteration)] = 0
-
-    if np.sum(strategy) > 0:
-        strategy /= np.sum(strategy)
+    prune = PRUNING and player != traverser
 
-    else:
-        strategy = np.repeat(1 / len(strategy), len(strategy))
+    for i in range(len(game_node.next_nodes)): # Sample every action that is not pruned
+        if prune and strategy[i] == 0:
+            state.skipped_actions += 1
+            continue
 
-    for i in range(len(game_node.next_nodes)): # Sample every possible action
-        if strategy[i] != 0:
-            next_node = game_node.next_nodes[i]
-            next_reach_probs = reach_probs.copy()
-            next_reach_probs[player] *= strategy[i]
-            utility_multiplier = 1 if game.num_players == 1 or player == next_node.player else -1
-            action_utils[i] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration)
+        next_node = game_node.next_nodes[i]
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        utility_multiplier = 1 if game.num_players == 1 or player == next_node.player else -1
+        action_utils[i] = utility_multiplier * cfr(game, next_node, infosets, next_reach_probs, chance_prob, iteration, traverser)
 
     util = np.sum(action_utils * strategy)
-    regrets = action_utils - util
-    opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
-    infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
 
-    return util
\ No newline at end of file
+    if player == traverser:
+        regrets = action_utils - util
+        opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
+        infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
+
+def cfr_compiled(game, tree, infosets, reach_probs, chance_prob, iteration, traverser):
+    '''
+    The vanilla counterfactual regret minimization algorithm with alternating updates and regret based pruning,
+    traversing a CompiledTree instead of GameNode objects. Takes the same parameters as cfr, with tree in place of
+    game_node, and prunes the same subtrees.
+    '''
+    return _cfr_compiled(game, VectorizedEngine.get_node_lists(tree, infosets), 0, infosets, get_state(infosets), reach_probs, chance_prob, traverser)
+
+def _cfr_compiled(game, nodes, node, infosets, state, reach_probs, chance_prob, traverser):
+    '''
+    Traverses the subtree below a node of a CompiledTree for cfr_compiled.
+
+    :param nodes: The NodeLists of the CompiledTree.
+    :param node: The id of the current node.
+    :param state: The PruningState of the table.
+    '''
+    node_type = nodes.node_type[node]
+
+    if infosets.node_counter is not None:
+        infosets.node_counter.count(node_type)
+
+    state.nodes_visited += 1
+
+    if node_type == CHANCE_NODE: # If the game is at a chance node
+        expected_value = 0
+        first_child = nodes.first_child[node]
+
+        for i, chance in enumerate(nodes.chance_probs[node]): # Sample every possible chance outcome
+            expected_value += chance * _cfr_compiled(game, nodes, first_child + i, infosets, state, reach_probs, chance_prob * chance, traverser)
+
+        return expected_value
+
+    if node_type == TERMINAL_NODE: # If the game is at a terminal node
+        utility_node = nodes.utility_nodes[node]
+
+        return nodes.terminal_utility[node] if utility_node is None else utility_node.get_utility()
+
+    block, row = nodes.blocks[node], nodes.rows[node]
+    block.touched[row] = True
+    first_child = nodes.first_child[node]
+    num_children = nodes.num_children[node]
+
+    player = nodes.player[node]
+
+    if player != traverser:
+        block.reach_prob[row] += reach_probs[player]
+
+    action_utils = np.zeros(num_children)
+    strategy = block.strategy[row]
+    prune = PRUNING and player != traverser
+
+    for i in range(num_children): # Sample every action that is not pruned
+        if prune and strategy[i] == 0:
+            state.skipped_actions += 1
+            continue
+
+        next_node = first_child + i
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        action_utils[i] = nodes.edge_sign[next_node] * _cfr_compiled(game, nodes, next_node, infosets, state, next_reach_probs, chance_prob, traverser)
+
+    util = (action_utils * strategy).sum()
+
+    if player == traverser:
+        regrets = action_utils - util
+        opp_contribution = reach_probs.prod() / (reach_probs[player] if reach_probs[player] != 0 else 1)
+        block.regret_sum[row] += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
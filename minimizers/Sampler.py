@@ -0,0 +1,101 @@
+import numpy as np
+from bisect import bisect_right
+
+class Sampler:
+    '''
+    A source of random choices for the sampling minimizers. Uniform random numbers are drawn from a seeded
+    numpy.random.Generator in large blocks, and outcomes are chosen by inverse-CDF lookup in cumulative probability tables,
+    which avoids the overhead of calling np.random.choice at every node.
+    '''
+
+    def __init__(self, seed=None, block_size=4096):
+        '''
+        Initializes the sampler with the following variables:
+
+            seed_sequence: The numpy.random.SeedSequence the generator was seeded from. Used to spawn independent
+                           samplers for worker processes.
+            generator: The numpy.random.Generator random numbers are drawn from.
+            block: The current block of pre-drawn uniform random numbers in [0, 1).
+            position: The index of the next unused number in block.
+
+        :param seed: An integer seed or numpy.random.SeedSequence. If None, a fresh seed is drawn from the operating
+                     system.
+        :param block_size: How many uniform random numbers to draw at once.
+        '''
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_sequence))
+        self.block_size = block_size
+        self.block = self.generator.random(block_size).tolist()
+        self.position = 0
+
+    def uniform(self):
+        '''
+        Returns the next uniform random number in [0, 1).
+        '''
+        if self.position == self.block_size:
+            self.block = self.generator.random(self.block_size).tolist()
+            self.position = 0
+
+        u = self.block[self.position]
+        self.position += 1
+
+        return u
+
+    def uniforms(self, n):
+        '''
+        Returns an array of the next n uniform random numbers in [0, 1), drawn directly from the generator.
+        '''
+        return self.generator.random(n)
+
+    def choice(self, cdf):
+        '''
+        Samples an index from a cumulative probability table, such as GameNode.chance_cdf.
+
+        :param cdf: A list of cumulative probabilities. The last element is the total probability, which need not be
+                    exactly one.
+        :return: The sampled index.
+        '''
+        return min(bisect_right(cdf, self.uniform() * cdf[-1]), len(cdf) - 1)
+
+    def randint(self, n):
+        '''
+        Samples an integer uniformly from 0 ... n - 1.
+        '''
+        return min(int(self.uniform() * n), n - 1)
+
+    def get_state(self):
+        '''
+        Returns the state of the sampler, including its unused pre-drawn numbers, so that sampling can be resumed exactly.
+        '''
+        return {'seed_sequence': self.seed_sequence, 'generator': self.generator.bit_generator.state, 'block': list(self.block), 'position': self.position}
+
+    def set_state(self, state):
+        '''
+        Restores a state returned by get_state.
+        '''
+        self.seed_sequence = state['seed_sequence']
+        self.generator.bit_generator.state = state['generator']
+        self.block = list(state['block'])
+        self.block_size = len(self.block)
+        self.position = state['position']
+
+    def spawn(self, n):
+        '''
+        Returns n independent samplers seeded from this sampler's seed sequence, one for each worker. The same seed always
+        spawns the same samplers.
+        '''
+        return [Sampler(seed_sequence, self.block_size) for seed_sequence in self.seed_sequence.spawn(n)]
+
+_default_sampler = None
+
+def default_sampler():
+    '''
+    Returns the sampler used when a minimizer is called without one, creating it on the first call with a seed drawn
+    from np.random, so that seeding np.random still makes training reproducible.
+    '''
+    global _default_sampler
+
+    if _default_sampler is None:
+        _default_sampler = Sampler(np.random.randint(2 ** 31))
+
+    return _default_sampler
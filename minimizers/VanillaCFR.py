@@ -1,18 +1,25 @@
 import numpy as np
 
-from ..InfoSet import InformationSet
-
 ALTERNATING = False # Whether player regrets are updated successively or alternatingly
+CHANCE_SPLIT = True # Whether the subtrees below the root chance nodes can be traversed in parallel
+DISCOUNTABLE = True # Whether update takes a discounting function
 
-def update(infosets):
+def update(infosets, iteration=None, discounting=None):
     '''
-    Update the strategy sum, strategy, and reach probability sum for each InformationSet following a traversal of the
-    game tree.
+    Update the strategy sum, strategy, and reach probability sum of every information set in the table at once
+    following a traversal of the game tree.
+
+    :param infosets: An InfoSetTable object.
+    :param iteration: The number of the iteration that has just been traversed, passed to discounting.
+    :param discounting: A function of the iteration returning the discount factors to apply, from Discounting, or None
+                        to not discount.
     '''
-    for _, infoset in infosets.items():
-        infoset.update()
+    if discounting is not None and iteration is None:
+        raise ValueError('Discounting requires the number of the iteration')
 
-    return infosets
+    discounts = discounting(iteration) if discounting is not None else None
+
+    return infosets.update(discounts=discounts)
 
 def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration):
     '''
@@ -20,14 +27,16 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration):
 
     :param game: An implementation of the Game abstract base class.
     :param game_node: A GameNode object representing the current state of the game.
-    :param infosets: A dictionary mapping information set keys to an InformationSet object. The key has the same values
-                     as InformationSet.key.
+    :param infosets: An InfoSetTable mapping information set keys to the values of each information set.
     :param reach_probs: The probability contribution of each player to reaching the current game state, indexed by
                         player.
     :param chance_prob: The probability contribution of chance events to reaching the current game state.
     :param iteration: How many iterations of CFR have been run.
     :return: The utility of the first player for the single traversal of the game tree.
     '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(game_node)
+
     if game_node.is_chance_node: # If the game is at a chance node
         expected_value = 0
 
@@ -42,16 +51,9 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration):
     if game_node.is_terminal_node: # If the game is at a terminal node
         return game_node.terminal_utility.get_utility()
 
-    infoset_key = game.get_infoset_key(game_node.history)
+    infoset = infosets.lookup(game, game_node)
     available_actions = game_node.available_actions
 
-    if infoset_key not in infosets: # Create a new InformationSet object if this is a new game state
-        infoset = InformationSet(infoset_key, available_actions)
-        infosets[infoset_key] = infoset
-
-    else:
-        infoset = infosets[infoset_key]
-
     player = game_node.player
     infoset.reach_prob += reach_probs[player]
 
@@ -70,4 +72,49 @@ def cfr(game, game_node, infosets, reach_probs, chance_prob, iteration):
     opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
     infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
 
-    return util
\ No newline at end of file
+    return util
+
+def cfr_state(game, state, infosets, reach_probs, chance_prob, iteration):
+    '''
+    The vanilla counterfactual regret minimization algorithm, traversing the game with a GameState cursor instead of a
+    game tree. Takes the same parameters as cfr, with state in place of game_node, and leaves the cursor where it was.
+    '''
+    if infosets.node_counter is not None:
+        infosets.node_counter.visit(state)
+
+    if state.is_chance_node: # If the game is at a chance node
+        expected_value = 0
+
+        for i, chance in enumerate(state.chance_probs): # Sample every possible chance outcome
+            state.push(i)
+            expected_value += chance * cfr_state(game, state, infosets, reach_probs, chance_prob * chance, iteration)
+            state.pop()
+
+        return expected_value
+
+    if state.is_terminal_node: # If the game is at a terminal node
+        return state.terminal_utility.get_utility()
+
+    infoset = infosets.lookup(game, state)
+    available_actions = state.available_actions
+
+    player = state.player
+    infoset.reach_prob += reach_probs[player]
+
+    action_utils = np.zeros(len(available_actions))
+    strategy = infoset.strategy
+
+    for i in range(len(available_actions)): # Sample every possible action
+        next_reach_probs = reach_probs.copy()
+        next_reach_probs[player] *= strategy[i]
+        state.push(i)
+        utility_multiplier = 1 if game.num_players == 1 or player == state.player else -1
+        action_utils[i] = utility_multiplier * cfr_state(game, state, infosets, next_reach_probs, chance_prob, iteration)
+        state.pop()
+
+    util = np.sum(action_utils * strategy)
+    regrets = action_utils - util
+    opp_contribution = np.prod(reach_probs) / (reach_probs[player] if reach_probs[player] != 0 else 1)
+    infoset.regret_sum += opp_contribution * chance_prob * regrets  # Update the regret sum
+
+    return util
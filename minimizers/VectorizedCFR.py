@@ -0,0 +1,37 @@
+from . import VectorizedEngine
+
+ALTERNATING = False # Whether player regrets are updated successively or alternatingly
+COMPILED = True # Whether the minimizer traverses a CompiledTree instead of GameNode objects
+DISCOUNTABLE = True # Whether update takes a discounting function
+
+def update(infosets, iteration=None, discounting=None):
+    '''
+    Update the strategy sum, strategy, and reach probability sum of every information set in the table at once
+    following a traversal of the game tree.
+
+    :param infosets: An InfoSetTable object.
+    :param iteration: The number of the iteration that has just been traversed, passed to discounting.
+    :param discounting: A function of the iteration returning the discount factors to apply, from Discounting, or None
+                        to not discount.
+    '''
+    if discounting is not None and iteration is None:
+        raise ValueError('Discounting requires the number of the iteration')
+
+    discounts = discounting(iteration) if discounting is not None else None
+
+    return infosets.update(discounts=discounts)
+
+def cfr(game, tree, infosets, reach_probs, chance_prob, iteration):
+    '''
+    The vanilla counterfactual regret minimization algorithm, vectorized over each depth of a CompiledTree.
+
+    :param game: An implementation of the Game abstract base class.
+    :param tree: A CompiledTree object representing the game tree.
+    :param infosets: An InfoSetTable object.
+    :param reach_probs: The probability contribution of each player to reaching the root of the game tree, indexed by
+                        player.
+    :param chance_prob: The probability contribution of chance events to reaching the root of the game tree.
+    :param iteration: How many iterations of CFR have been run.
+    :return: The utility of the first player for the single traversal of the game tree.
+    '''
+    return VectorizedEngine.traverse(tree, infosets, reach_probs, chance_prob)
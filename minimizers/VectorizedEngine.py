@@ -0,0 +1,436 @@
+import numpy as np
+from itertools import accumulate
+
+from ..games.CompiledTree import CHANCE_NODE, DECISION_NODE, TERMINAL_NODE
+
+PATH_SIZE = 2 ** 16 # The most path entries a tree may have to be traversed along its paths rather than one depth at a time
+
+class ActionGroup:
+    '''
+    Every decision node of a CompiledTree whose information set has a given number of available actions, together with
+    the rows of the InfoSetTable block storing those information sets.
+    '''
+
+    def __init__(self, tree, block, rows_by_infoset):
+        '''
+        Initializes the action group with the following variables:
+
+            block: The InfoSetBlock storing the information sets of the group.
+            num_actions: The number of actions available at every information set in the group.
+            nodes: The node ids of every decision node in the group.
+            rows: The block row of the information set each node in nodes belongs to.
+            children: The node ids of the children of each node in nodes, of shape (len(nodes), num_actions).
+            players: The player acting at each node in nodes.
+            selections: The nodes whose regrets are updated when each player is the traverser. The key None selects
+                        every node in the group.
+
+        :param tree: The CompiledTree the information sets belong to.
+        :param block: The InfoSetBlock storing the information sets of the group.
+        :param rows_by_infoset: The block row of each of the tree's information sets, indexed by infoset_index. -1 for
+                                information sets stored in other blocks.
+        '''
+        self.block = block
+        self.num_actions = block.num_actions
+
+        is_decision_node = tree.node_type == DECISION_NODE
+        self.nodes = np.flatnonzero(is_decision_node & (rows_by_infoset[np.maximum(tree.infoset_index, 0)] >= 0))
+        self.rows = rows_by_infoset[tree.infoset_index[self.nodes]]
+        self.children = tree.first_child[self.nodes][:, None] + np.arange(self.num_actions)
+        self.players = tree.player[self.nodes]
+        self.child_sign = tree.edge_sign[self.children]
+        self.reach_index = self.children * (tree.num_players + 1) + self.players[:, None] # Flat index of each edge's reach factor
+        self.selections = {None: self._select(tree, np.ones(len(self.nodes), dtype=bool))}
+
+        for player in range(tree.num_players):
+            self.selections[player] = self._select(tree, self.players == player)
+
+    def _select(self, tree, mask):
+        '''
+        Precomputes the indices needed to accumulate regrets for a subset of the nodes in the group.
+        '''
+        nodes = self.nodes[mask]
+        rows = self.rows[mask]
+        player_reach_index = nodes * (tree.num_players + 1) + self.players[mask]
+        flat_index = (rows[:, None] * self.num_actions + np.arange(self.num_actions)).ravel()
+
+        return nodes, rows, self.children[mask], self.child_sign[mask], player_reach_index, flat_index
+
+class TreeLayout:
+    '''
+    The index arrays used to traverse a CompiledTree one depth at a time against a given InfoSetTable. Every information
+    set in the tree is added to the table when the layout is created.
+    '''
+
+    def __init__(self, tree, infosets):
+        '''
+        Adds the information sets of the tree to the table and precomputes the layout of the tree.
+
+        :param tree: A CompiledTree object.
+        :param infosets: An InfoSetTable object.
+        '''
+        self.table = infosets
+        self.groups = []
+
+        infoset_ids = [infosets.add(key, tree.infoset_actions[i]).id for i, key in enumerate(tree.infoset_keys)]
+
+        for num_actions, block in infosets.blocks.items():
+            rows_by_infoset = np.full(max(tree.num_infosets, 1), -1, dtype=np.int64)
+
+            for i, infoset_id in enumerate(infoset_ids):
+                infoset_block, row = infosets.locate(infoset_id)
+
+                if infoset_block is block:
+                    rows_by_infoset[i] = row
+
+            if np.any(rows_by_infoset >= 0):
+                self.groups.append(ActionGroup(tree, block, rows_by_infoset))
+
+        # The group and block row of every decision node, used by minimizers that visit nodes one at a time
+        self.group_by_node = np.full(tree.num_nodes, -1, dtype=np.int64)
+        self.row_by_node = np.full(tree.num_nodes, -1, dtype=np.int64)
+
+        for i, group in enumerate(self.groups):
+            self.group_by_node[group.nodes] = i
+            self.row_by_node[group.nodes] = group.rows
+
+        # Reach probabilities are stored with one column per player followed by a column for chance. The edge into each
+        # node multiplies exactly one of those columns: the acting player's for decision nodes, chance's for chance nodes
+        num_players = tree.num_players
+        self.reach_factor = np.ones((tree.num_nodes, num_players + 1))
+        self.reach_factor[:, num_players] = tree.edge_prob
+        self.value_factor = tree.edge_sign * tree.edge_prob
+        self.levels = []
+
+        for depth in range(1, tree.num_levels):
+            level = tree.level(depth)
+            parents = tree.parent[level]
+            offset = tree.level_offsets[depth - 1]
+            self.levels.append((level, parents, parents - offset, slice(offset, tree.level_offsets[depth]), tree.level_offsets[depth] - offset))
+
+        self.paths = PathLayout(tree, self) if PathLayout.path_size(tree) <= PATH_SIZE else None
+
+class PathLayout:
+    '''
+    The paths of a small CompiledTree, used to traverse it with a fixed number of NumPy calls instead of a few calls per
+    depth. Every edge has a factor in one array: the chance probability of edges out of chance nodes, the strategy
+    probability of the action, copied from the rows of the table, for edges out of decision nodes, and the reach
+    probabilities passed to traverse for the root, followed by a padding factor of one. The reach probabilities of a node
+    are products of the factors on its path from the root, and the value of a node is a sum over the terminal nodes below
+    it of their signed utility, which also has a factor, times the product of the factors on the path down to them. All
+    of these products are computed by one gather and one product over a padded index array. The index arrays grow with
+    the number of nodes times the depth of the tree, so larger trees are traversed one depth at a time.
+    '''
+
+    def __init__(self, tree, layout):
+        '''
+        Initializes the path layout with the following variables:
+
+            factors: The factors of the edges out of chance nodes, indexed by node id, followed by the weight of every
+                     pair, the strategies of every group, the root reach probabilities, and the padding factor. Written
+                     by every traversal, so a tree with a PathLayout is traversed by one thread at a time.
+            weights, strategies, player_factors: Views of the pair weights, of the first num_rows rows of the strategy
+                                                 of each group, and of the root reach probabilities of the players in
+                                                 factors. The root reach probability of chance is at chance_factor.
+            num_rows: The number of block rows of each group whose strategies are copied to the factors.
+            pair_slots, pair_terminals, pair_signs: One entry for every terminal node below every node whose value is
+                        computed: the slot of the node, the terminal node, and the product of the signs of the edges
+                        from the node down to the terminal node, including the edge into the node for the children of
+                        decision nodes. The weight of a pair is the utility of its terminal node times its sign.
+            dynamic: Whether the tree has utilities that are sampled on every traversal, so that the weights are too.
+            num_slots: The number of nodes whose values are computed: the children of the decision nodes of each group,
+                       the decision nodes of each group, and the root, which has the last slot.
+            selections: For each key of the group selections, an index array with one column of factors for every
+                        pair, holding the factors on its path, then one for the acting player's reach probability of
+                        every selected node, then one for the counterfactual reach probability of every selected node.
+                        The columns are padded to the depth of the tree plus the number of reach probability columns,
+                        and stored along the first axis so that their products are taken row by row. It is followed by
+                        the number of selected nodes and one
+                        (group, child slots, node slots, rows, regret indices, number of rows, reach slice) tuple for
+                        each group with a selected node.
+            values_only: The index array and groups of a traverser who never acts, for whom only values are computed.
+
+        :param tree: A CompiledTree object.
+        :param layout: The TreeLayout being created for the tree.
+        '''
+        num_nodes, num_players = tree.num_nodes, tree.num_players
+        self.num_rows = [int(group.rows.max()) + 1 for group in layout.groups]
+        num_pairs = PathLayout.num_pairs(tree)
+        offsets = np.cumsum([num_nodes + num_pairs] + [num_rows * group.num_actions for num_rows, group in zip(self.num_rows, layout.groups)]).tolist()
+        root_factors = offsets[-1] # The reach probability of each player and of chance at the root, then the padding
+        padding = root_factors + num_players + 1
+        self.factors = np.ones(padding + 1)
+        self.factors[:num_nodes] = tree.edge_prob
+        self.weights = self.factors[num_nodes:num_nodes + num_pairs]
+        self.strategies = [self.factors[offset:offset + num_rows * group.num_actions].reshape(num_rows, group.num_actions) for offset, num_rows, group in zip(offsets, self.num_rows, layout.groups)]
+        self.player_factors = self.factors[root_factors:root_factors + num_players]
+        self.chance_factor = root_factors + num_players
+
+        parent, node_type, player = tree.parent.tolist(), tree.node_type.tolist(), tree.player.tolist()
+        first_child, num_children, edge_sign = tree.first_child.tolist(), tree.num_children.tolist(), tree.edge_sign.tolist()
+        edge_factor = list(range(num_nodes)) # The factor of the edge into each node
+
+        for i, group in enumerate(layout.groups):
+            for node, row in zip(group.nodes.tolist(), group.rows.tolist()):
+                for action in range(num_children[node]):
+                    edge_factor[first_child[node] + action] = offsets[i] + row * group.num_actions + action
+
+        paths = [[]] # The edges from the root to each node, as (factor, reach probability column) pairs
+        for node in range(1, num_nodes):
+            column = num_players if node_type[parent[node]] == CHANCE_NODE else player[parent[node]]
+            paths.append(paths[parent[node]] + [(edge_factor[node], column)])
+
+        width = max(tree.num_levels - 1, 1) + num_players + 1
+        slots = [(node, edge_sign[node]) for group in layout.groups for node in group.children.ravel().tolist()]
+        node_slots = len(slots)
+        slots += [(node, 1) for group in layout.groups for node in group.nodes.tolist()] + [(0, 1)]
+        self.num_slots = len(slots)
+        pair_slots, pair_terminals, pair_signs, pair_index = [], [], [], []
+
+        for slot, (node, sign) in enumerate(slots):
+            stack = [node]
+            depth = len(paths[node])
+
+            while stack: # Every terminal node below the slot
+                below = stack.pop()
+
+                if node_type[below] != TERMINAL_NODE:
+                    stack.extend(range(first_child[below], first_child[below] + num_children[below]))
+                    continue
+
+                pair_sign = sign
+                below_node = below
+
+                while len(paths[below_node]) > depth: # The signs of the edges from the slot down to the terminal node
+                    pair_sign *= edge_sign[below_node]
+                    below_node = parent[below_node]
+
+                edges = [factor for factor, _ in paths[below][depth:]] + [num_nodes + len(pair_slots)] # Ending with its weight
+                pair_slots.append(slot)
+                pair_terminals.append(below)
+                pair_signs.append(pair_sign)
+                pair_index.append(edges + [padding] * (width - len(edges)))
+
+        self.pair_slots = np.array(pair_slots, dtype=np.int64)
+        self.pair_terminals = np.array(pair_terminals, dtype=np.int64)
+        self.pair_signs = np.array(pair_signs, dtype=np.float64)
+        self.dynamic = len(tree.dynamic_terminals) > 0
+        self.weights[:] = tree.terminal_utility[self.pair_terminals] * self.pair_signs
+        self.selections = {}
+        self.values_only = (np.array(pair_index, dtype=np.int64).reshape(-1, width).T.copy(), 0, []) # For a traverser who never acts
+
+        for key in layout.groups[0].selections if layout.groups else [None]:
+            acting_index, counterfactual_index, groups = [], [], []
+            child_slot, group_slot = 0, node_slots
+
+            for group in layout.groups:
+                nodes, rows, _, _, _, _ = group.selections[key]
+                positions = np.flatnonzero(np.isin(group.nodes, nodes))
+
+                if len(nodes):
+                    start = len(acting_index)
+
+                    for node in nodes.tolist():
+                        acting = [factor for factor, column in paths[node] if column == player[node]] + [root_factors + player[node]]
+                        others = [factor for factor, column in paths[node] if column != player[node]] + [root_factors + column for column in range(num_players + 1) if column != player[node]]
+                        acting_index.append(acting + [padding] * (width - len(acting)))
+                        counterfactual_index.append(others + [padding] * (width - len(others)))
+
+                    child_slots = child_slot + positions[:, None] * group.num_actions + np.arange(group.num_actions)
+                    slots_of_nodes = (group_slot + positions)[:, None]
+                    regret_index = (rows[:, None] * group.num_actions + np.arange(group.num_actions)).ravel()
+                    groups.append((group, child_slots, slots_of_nodes, rows, regret_index, int(rows.max()) + 1, slice(start, len(acting_index))))
+
+                child_slot += len(group.nodes) * group.num_actions
+                group_slot += len(group.nodes)
+
+            index = np.array(pair_index + acting_index + counterfactual_index, dtype=np.int64).reshape(-1, width).T.copy()
+            self.selections[key] = (index, len(acting_index), groups)
+
+    @staticmethod
+    def num_pairs(tree):
+        '''
+        Returns the number of pairs of a tree without building them: the number of terminal nodes below each child of a
+        decision node, each decision node, and the root.
+        '''
+        terminals_below = (tree.node_type == TERMINAL_NODE).astype(np.int64)
+
+        for depth in reversed(range(1, tree.num_levels)):
+            level = tree.level(depth)
+            np.add.at(terminals_below, tree.parent[level], terminals_below[level])
+
+        is_decision = tree.node_type == DECISION_NODE
+
+        return int(terminals_below[1:][is_decision[tree.parent[1:]]].sum() + terminals_below[is_decision].sum() + terminals_below[0])
+
+    @staticmethod
+    def path_size(tree):
+        '''
+        Returns the number of entries of the index array gathered by each traversal of a tree with a PathLayout, without
+        building it: a column as long as the depth of the tree plus the number of reach probability columns for each
+        pair, and two for each decision node.
+        '''
+        num_decision_nodes = int(np.count_nonzero(tree.node_type == DECISION_NODE))
+
+        return (PathLayout.num_pairs(tree) + 2 * num_decision_nodes) * (max(tree.num_levels - 1, 1) + tree.num_players + 1)
+
+class NodeLists:
+    '''
+    The node arrays of a CompiledTree and the block rows of its TreeLayout as Python lists indexed by node id, for the
+    minimizers whose cfr_compiled visits one node of the tree at a time. Indexing a list with a Python int is several
+    times faster than indexing an array, and far faster than following the next_nodes lists of GameNode objects.
+    '''
+
+    def __init__(self, tree, layout):
+        '''
+        Initializes the lists with the following variables, each indexed by node id:
+
+            node_type, player, first_child, num_children, edge_sign: The arrays of the CompiledTree with the same names.
+            chance_probs: The chance probabilities of the children of each chance node. None for other nodes.
+            chance_cdf: The cumulative chance probabilities of the children of each chance node, computed as
+                        GameNode.chance_cdf is, so a Sampler chooses the same child of either. None for other nodes.
+            blocks: The InfoSetBlock storing the information set of each decision node. None for other nodes.
+            rows: The row of that information set in its block. -1 for other nodes.
+            terminal_utility: The utility of each terminal node whose UtilityNode is static.
+            utility_nodes: The UtilityNode of each terminal node whose utility is sampled on every visit. None for other
+                           nodes.
+
+        :param tree: A CompiledTree object.
+        :param layout: The TreeLayout of the tree for the InfoSetTable being trained.
+        '''
+        self.node_type = tree.node_type.tolist()
+        self.player = tree.player.tolist()
+        self.first_child = tree.first_child.tolist()
+        self.num_children = tree.num_children.tolist()
+        self.edge_sign = tree.edge_sign.tolist()
+        self.chance_probs = [None] * tree.num_nodes
+        self.chance_cdf = [None] * tree.num_nodes
+        edge_prob = tree.edge_prob.tolist()
+
+        for node in np.flatnonzero(tree.node_type == CHANCE_NODE).tolist():
+            start = self.first_child[node]
+            self.chance_probs[node] = edge_prob[start:start + self.num_children[node]]
+            self.chance_cdf[node] = [float(p) for p in accumulate(self.chance_probs[node])]
+
+        self.blocks = [layout.groups[group].block if group >= 0 else None for group in layout.group_by_node.tolist()]
+        self.rows = layout.row_by_node.tolist()
+        self.terminal_utility = tree.terminal_utility.tolist()
+        self.utility_nodes = [None] * tree.num_nodes
+
+        for node, utility_node in zip(tree.dynamic_terminals.tolist(), tree.dynamic_utilities):
+            self.utility_nodes[node] = utility_node
+
+def get_layout(tree, infosets):
+    '''
+    Returns the TreeLayout of a CompiledTree for an InfoSetTable, creating it on the first traversal.
+    '''
+    layout = getattr(tree, 'layout', None)
+
+    if layout is None or layout.table is not infosets:
+        layout = TreeLayout(tree, infosets)
+        tree.layout = layout
+
+    return layout
+
+def get_node_lists(tree, infosets):
+    '''
+    Returns the NodeLists of a CompiledTree for an InfoSetTable, creating them with its layout on the first traversal.
+    '''
+    layout = get_layout(tree, infosets)
+
+    if getattr(layout, 'node_lists', None) is None:
+        layout.node_lists = NodeLists(tree, layout)
+
+    return layout.node_lists
+
+def traverse(tree, infosets, reach_probs, chance_prob, traverser=None):
+    '''
+    A full-width traversal of a CompiledTree that processes the tree one depth at a time. A top-down pass computes the
+    reach probabilities of every node, and a bottom-up pass computes the value of every node. Counterfactual regrets and
+    reach probabilities are then accumulated for every information set at once.
+
+    :param tree: A CompiledTree object.
+    :param infosets: An InfoSetTable object.
+    :param reach_probs: The probability contribution of each player to reaching the root, indexed by player.
+    :param chance_prob: The probability contribution of chance events to reaching the root.
+    :param traverser: If not None, regret is only updated for information sets where this player acts.
+    :return: The utility of the first player for the single traversal of the game tree.
+    '''
+    layout = get_layout(tree, infosets)
+
+    if layout.paths is not None:
+        return _traverse_paths(tree, layout, reach_probs, chance_prob, traverser)
+
+    reach_factor = layout.reach_factor.copy()
+    value_factor = layout.value_factor.copy()
+    flat_reach_factor = reach_factor.reshape(-1)
+
+    for group in layout.groups:
+        strategy = group.block.strategy[group.rows]
+        flat_reach_factor[group.reach_index] = strategy
+        value_factor[group.children] = group.child_sign * strategy
+
+    reach = np.empty_like(reach_factor)
+    reach[0, :-1] = reach_probs
+    reach[0, -1] = chance_prob
+
+    for level, parents, _, _, _ in layout.levels: # Top-down pass
+        np.multiply(reach[parents], reach_factor[level], out=reach[level])
+
+    value = tree.sample_utilities().copy()
+
+    for level, _, parent_index, parent_level, parent_level_size in reversed(layout.levels): # Bottom-up pass
+        value[parent_level] += np.bincount(parent_index, weights=value_factor[level] * value[level], minlength=parent_level_size)
+
+    flat_reach = reach.reshape(-1)
+    total_reach = reach.prod(axis=1)
+
+    for group in layout.groups:
+        if traverser not in group.selections: # The traverser never acts in this group
+            continue
+
+        nodes, rows, children, child_sign, player_reach_index, flat_index = group.selections[traverser]
+
+        player_reach = flat_reach[player_reach_index]
+        counterfactual_reach = total_reach[nodes] / np.where(player_reach != 0, player_reach, 1) # The opponent and chance contribution
+        regrets = child_sign * value[children] - value[nodes][:, None]
+        regrets *= counterfactual_reach[:, None]
+
+        block = group.block
+        num_rows = block.size
+        block.regret_sum[:num_rows] += np.bincount(flat_index, weights=regrets.ravel(), minlength=num_rows * block.num_actions).reshape(num_rows, block.num_actions)
+        block.reach_prob[:num_rows] += np.bincount(rows, weights=player_reach, minlength=num_rows)
+
+    return value[0]
+
+def _traverse_paths(tree, layout, reach_probs, chance_prob, traverser):
+    '''
+    The traversal of traverse for a tree with a PathLayout, computing the values and reach probabilities of every node
+    along its paths instead of one depth at a time. Takes the same parameters as traverse, with the layout of the tree.
+    '''
+    paths = layout.paths
+    index, num_selected, groups = paths.selections.get(traverser, paths.values_only)
+
+    for strategy, group, num_rows in zip(paths.strategies, layout.groups, paths.num_rows):
+        strategy[:] = group.block.strategy[:num_rows]
+
+    paths.player_factors[:] = reach_probs
+    paths.factors[paths.chance_factor] = chance_prob
+
+    if paths.dynamic:
+        np.multiply(tree.sample_utilities()[paths.pair_terminals], paths.pair_signs, out=paths.weights)
+
+    products = paths.factors[index].prod(axis=0)
+    num_pairs = len(paths.pair_slots)
+    value = np.bincount(paths.pair_slots, weights=products[:num_pairs], minlength=paths.num_slots)
+    player_reach = products[num_pairs:num_pairs + num_selected]
+    counterfactual_reach = (products[num_pairs + num_selected:] * (player_reach != 0))[:, None] # No regret is accumulated where the player never acts
+
+    for group, child_slots, node_slots, rows, regret_index, num_rows, selected in groups:
+        regrets = value[child_slots] - value[node_slots]
+        regrets *= counterfactual_reach[selected]
+
+        block = group.block
+        block.regret_sum[:num_rows] += np.bincount(regret_index, weights=regrets.ravel(), minlength=num_rows * block.num_actions).reshape(num_rows, block.num_actions)
+        block.reach_prob[:num_rows] += np.bincount(rows, weights=player_reach[selected], minlength=num_rows)
+
+    return value[-1]
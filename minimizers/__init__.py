@@ -1,5 +1,11 @@
 from . import CFRPlus
+from . import ChanceSampling
+from . import DCFR
+from . import LinearCFR
 from . import MCCFR_External
 from . import MCCFR_Outcome
 from . import RBP_CFR
 from . import VanillaCFR
+
+from . import VectorizedCFR
+from . import VectorizedCFRPlus
@@ -15,7 +15,7 @@ setup(
     author_email='rexstockham13@gmail.com',
     license='MIT',
     python_requires='>=3.7',
-    packages=['openCFR', 'openCFR.games', 'openCFR.games.sample_games', 'openCFR.minimizers'],
+    packages=['openCFR', 'openCFR.benchmarks', 'openCFR.games', 'openCFR.games.sample_games', 'openCFR.minimizers'],
     package_dir={'openCFR': '.'},
     package_data={'openCFR': ['./pretrained/*', 'LICENSE.txt', 'README.md']},
     include_package_data=True,
@@ -0,0 +1,11 @@
+import importlib.util
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'openCFR' not in sys.modules: # The repository root is the openCFR package, as mapped by setup.py
+    spec = importlib.util.spec_from_file_location('openCFR', os.path.join(ROOT_DIR, '__init__.py'), submodule_search_locations=[ROOT_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['openCFR'] = module
+    spec.loader.exec_module(module)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from openCFR import BudgetOptions, InfoSetTable, ParallelOptions, ReportOptions, Trainer
+from openCFR.games import CompiledTree
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import MCCFR_Outcome
+from openCFR.minimizers.Sampler import Sampler
+
+def test_sampler_is_reproducible_and_resumable():
+    sampler = Sampler(3, block_size=16)
+    state = sampler.get_state()
+    draws = [sampler.uniform() for _ in range(40)] # Crosses two block boundaries
+    other = Sampler(3, block_size=16)
+
+    assert [other.uniform() for _ in range(40)] == draws
+
+    sampler.set_state(state)
+
+    assert [sampler.uniform() for _ in range(40)] == draws
+
+def test_sampler_choice_follows_the_cdf():
+    sampler = Sampler(0)
+    counts = np.bincount([sampler.choice([0.2, 0.5, 1.0]) for _ in range(20000)], minlength=3)
+
+    np.testing.assert_allclose(counts / 20000, [0.2, 0.3, 0.5], atol=0.015)
+
+def test_batch_matches_repeated_single_trajectories():
+    # Without an update in between, a batch of trajectories accumulates the same expected regrets as that many calls to cfr
+    game = Kuhn()
+    root = game.build_game_tree()
+    tree = CompiledTree(game, root)
+    num_trajectories = 40000
+
+    single = InfoSetTable()
+    single.intern_tree(game, root)
+    sampler = Sampler(0)
+
+    for _ in range(num_trajectories):
+        MCCFR_Outcome.cfr(game, root, single, np.ones(2), 1, 1, sampler)
+
+    batched = InfoSetTable()
+    sampler = Sampler(1)
+
+    for _ in range(num_trajectories // 1000):
+        MCCFR_Outcome.cfr_batch(game, tree, batched, np.ones(2), 1, 1, sampler, 1000)
+
+    assert sorted(batched.keys()) == sorted(single.keys())
+
+    for key in single.keys():
+        np.testing.assert_allclose(batched[key].regret_sum / num_trajectories, single[key].regret_sum / num_trajectories, atol=0.02)
+        assert batched[key].reach_prob / num_trajectories == pytest.approx(single[key].reach_prob / num_trajectories, abs=0.01)
+
+def test_batched_training_converges():
+    trainer = Trainer(Kuhn(), MCCFR_Outcome)
+    trainer.train(300, parallel=ParallelOptions(batch_size=256), budget=BudgetOptions(exploitability_freq=100), seed=0, report=ReportOptions(display=False))
+
+    assert trainer.exploitability_history[-1][1] < 0.3 # A uniform strategy is exploitable by 0.458
@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+
+from openCFR import CheckpointOptions, ReportOptions, Trainer, load_checkpoint
+from openCFR.Checkpoint import ARRAYS, read_header
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import CFRPlus
+
+def train(iterations, save_dir=None, save_freq=100):
+    checkpoints = CheckpointOptions(save_dir=str(save_dir), save_freq=save_freq) if save_dir is not None else None
+
+    return Trainer(Kuhn(), CFRPlus).train(iterations, report=ReportOptions(display=False), checkpoints=checkpoints)
+
+def test_every_checkpoint_in_a_chain_loads_its_iteration(tmp_path):
+    train(150, save_dir=tmp_path, save_freq=10)
+    paths = sorted(os.listdir(tmp_path))
+
+    assert read_header(os.path.join(tmp_path, 'checkpoint_11.ckpt'))[0]['base'] is None # Every tenth checkpoint is full
+    assert read_header(os.path.join(tmp_path, 'checkpoint_91.ckpt'))[0]['base'] == 'checkpoint_81.ckpt'
+    assert read_header(os.path.join(tmp_path, 'checkpoint_111.ckpt'))[0]['base'] is None
+    assert 'results_final.pickle' in paths
+    assert not any(path.endswith('.tmp') for path in paths)
+
+    for iteration in (11, 51, 101, 131, 150):
+        infosets, state = load_checkpoint(os.path.join(tmp_path, 'checkpoint_' + str(iteration) + '.ckpt'))
+        expected, value = train(iteration)
+
+        assert state['iteration'] == iteration
+        assert state['expected_game_value'] == value
+        assert infosets.keys() == expected.keys()
+
+        for num_actions, block in expected.blocks.items():
+            for name in ARRAYS:
+                np.testing.assert_array_equal(getattr(infosets.blocks[num_actions], name)[:block.size], getattr(block, name)[:block.size])
+
+def test_incremental_checkpoints_hold_only_changed_rows(tmp_path):
+    train(30, save_dir=tmp_path, save_freq=10)
+    full = read_header(os.path.join(tmp_path, 'checkpoint_11.ckpt'))[0]
+    incremental = read_header(os.path.join(tmp_path, 'checkpoint_21.ckpt'))[0]
+
+    assert full['num_infosets'] == incremental['num_infosets'] == 12
+    assert sum(block['num_rows'] for block in full['blocks']) == 12
+    assert incremental['index'][1] < full['index'][1] # No information sets were added since the base
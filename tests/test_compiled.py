@@ -0,0 +1,30 @@
+import random
+
+import numpy as np
+import pytest
+
+from openCFR import ReportOptions, Trainer, TreeOptions
+from openCFR.games.sample_games import Kuhn, TexasHoldEm
+from openCFR.minimizers import ChanceSampling, MCCFR_External, MCCFR_Outcome, RBP_CFR
+
+def train(game, minimizer, iterations, tree=None):
+    np.random.seed(0)
+    random.seed(0) # Seeds the sampled utilities of TexasHoldEm
+
+    return Trainer(game(), minimizer).train(iterations, seed=0, tree=tree, report=ReportOptions(display=False))
+
+@pytest.mark.parametrize('game, iterations', [(Kuhn, 300), (lambda: TexasHoldEm(1, 2, 4), 10)])
+@pytest.mark.parametrize('minimizer', [ChanceSampling, MCCFR_External, MCCFR_Outcome, RBP_CFR])
+def test_compiled_training_matches_tree_training(game, iterations, minimizer):
+    infosets, value = train(game, minimizer, iterations)
+    compiled, compiled_value = train(game, minimizer, iterations, TreeOptions(compiled=True))
+
+    assert compiled_value == value
+    assert sorted(compiled.keys()) == sorted(infosets.keys())
+
+    for key in infosets.keys():
+        for name in ('regret_sum', 'strategy', 'strategy_sum', 'reach_prob_sum'):
+            np.testing.assert_array_equal(getattr(compiled[key], name), getattr(infosets[key], name))
+
+    if minimizer is RBP_CFR:
+        assert RBP_CFR.pruning_stats(compiled) == RBP_CFR.pruning_stats(infosets)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from openCFR import ReportOptions, Trainer, TreeOptions
+from openCFR.Checkpoint import ARRAYS
+from openCFR.games import CompiledTree
+from openCFR.games.sample_games import Kuhn, TexasHoldEm
+from openCFR.minimizers import CFRPlus, VanillaCFR
+
+def unique_nodes(root):
+    seen = {}
+    stack = [root]
+
+    while stack:
+        node = stack.pop()
+
+        if id(node) not in seen:
+            seen[id(node)] = node
+            stack.extend(node.next_nodes)
+
+    return len(seen)
+
+def test_dag_compiles_to_the_same_tree():
+    game = TexasHoldEm(1, 2, 4)
+    tree = CompiledTree(game, game.build_game_tree())
+    dag_root = game.build_game_dag()
+    dag = CompiledTree(game, dag_root)
+
+    assert unique_nodes(dag_root) < tree.num_nodes # Subtrees are shared
+    assert dag.num_nodes == tree.num_nodes
+
+    for name in ('node_type', 'player', 'parent', 'action_index', 'edge_prob', 'edge_sign', 'terminal_utility', 'infoset_index'):
+        np.testing.assert_array_equal(getattr(dag, name), getattr(tree, name))
+
+    assert dag.infoset_keys == tree.infoset_keys
+
+@pytest.mark.parametrize('minimizer', [VanillaCFR, CFRPlus])
+def test_dag_training_matches_tree_training(minimizer):
+    infosets, value = Trainer(Kuhn(), minimizer).train(100, report=ReportOptions(display=False))
+    dag_infosets, dag_value = Trainer(Kuhn(), minimizer).train(100, tree=TreeOptions(build_dag=True), report=ReportOptions(display=False))
+
+    assert dag_value == value
+    assert dag_infosets.keys() == infosets.keys()
+
+    for num_actions, block in infosets.blocks.items():
+        for name in ARRAYS:
+            np.testing.assert_array_equal(getattr(dag_infosets.blocks[num_actions], name)[:block.size], getattr(block, name)[:block.size])
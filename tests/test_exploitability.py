@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from openCFR import BestResponse, BudgetOptions, InfoSetTable, ReportOptions, Trainer, exploitability
+from openCFR.games import CompiledTree
+from openCFR.games.sample_games import Kuhn, RPS
+from openCFR.minimizers import CFRPlus, VanillaCFR
+
+def untrained_table(game):
+    root = game.build_game_tree()
+    infosets = InfoSetTable()
+    infosets.intern_tree(game, root)
+
+    return root, infosets
+
+def test_uniform_kuhn_strategy():
+    game = Kuhn()
+    root, infosets = untrained_table(game)
+
+    assert exploitability(game, root, infosets) == pytest.approx(11 / 24) # The known NashConv of 11 / 12, over two players
+
+def test_rps_best_response_to_a_fixed_opponent():
+    game = RPS(np.array([0.5, 0.25, 0.25]))
+    root, infosets = untrained_table(game)
+
+    assert exploitability(game, root, infosets) == pytest.approx(0.25) # Paper wins 0.5 and loses 0.25 against it
+    assert exploitability(RPS(), *untrained_table(RPS())) == pytest.approx(0)
+
+def test_compiled_and_game_node_roots_agree():
+    game = Kuhn()
+    infosets, _ = Trainer(game, VanillaCFR).train(30, report=ReportOptions(display=False))
+    root = game.build_game_tree()
+    evaluator = BestResponse(CompiledTree(game, root), infosets)
+    values, best_response_values = evaluator.evaluate()
+
+    assert exploitability(game, root, infosets) == pytest.approx(evaluator.exploitability())
+    assert values[0] == pytest.approx(-values[1])
+    assert np.all(best_response_values >= values - 1e-12)
+
+def test_cfr_plus_reaches_target_on_kuhn():
+    trainer = Trainer(Kuhn(), CFRPlus)
+    infosets, value = trainer.train(None, budget=BudgetOptions(exploitability_freq=50, target_exploitability=1e-3), report=ReportOptions(display=False))
+    iterations = trainer.training_summary['iterations']
+
+    assert trainer.training_summary['stop_reason'] == 'exploitability'
+    assert iterations <= 1000
+    assert [exploitability for _, exploitability in trainer.exploitability_history][-1] <= 1e-3
+    assert value / iterations == pytest.approx(-1 / 18, abs=2e-3) # The value of Kuhn poker for the first player
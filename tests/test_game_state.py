@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from openCFR import ReportOptions, Trainer, TreeOptions
+from openCFR.games import GameState
+from openCFR.games.sample_games import Kuhn, RPS, TexasHoldEm
+from openCFR.minimizers import ChanceSampling, DCFR, LinearCFR, MCCFR_External, MCCFR_Outcome, VanillaCFR
+
+def assert_same_states(node, state):
+    assert list(state.history) == list(node.history)
+    assert state.player == node.player
+    assert state.is_terminal_node == node.is_terminal_node
+    assert state.is_chance_node == node.is_chance_node
+
+    if node.is_terminal_node:
+        assert state.terminal_utility.get_expected_utility() == node.terminal_utility.get_expected_utility()
+        return
+
+    if node.is_chance_node:
+        assert list(state.chance_probs) == list(node.chance_probs)
+        assert state.chance_cdf == pytest.approx(list(node.chance_cdf))
+
+    else:
+        assert list(state.available_actions) == list(node.available_actions)
+
+    assert state.num_children == len(node.next_nodes)
+
+    for i, next_node in enumerate(node.next_nodes):
+        depth = state.depth
+        state.push(i)
+        assert_same_states(next_node, state)
+        state.pop()
+
+        assert state.depth == depth
+
+@pytest.mark.parametrize('game', [Kuhn, RPS, lambda: TexasHoldEm(1, 2, 4)])
+def test_game_state_visits_the_same_states_as_the_tree(game):
+    game = game()
+    assert_same_states(game.build_game_tree(), GameState(game))
+
+@pytest.mark.parametrize('minimizer', [VanillaCFR, LinearCFR, DCFR, ChanceSampling, MCCFR_External, MCCFR_Outcome])
+def test_tree_free_training_matches_tree_training(minimizer):
+    np.random.seed(0)
+    infosets, value = Trainer(Kuhn(), minimizer).train(200, seed=0, report=ReportOptions(display=False))
+    np.random.seed(0)
+    tree_free, tree_free_value = Trainer(Kuhn(), minimizer).train(200, seed=0, tree=TreeOptions(tree_free=True), report=ReportOptions(display=False))
+
+    assert tree_free_value == value
+    assert sorted(tree_free.keys()) == sorted(infosets.keys())
+
+    for key in infosets.keys():
+        np.testing.assert_array_equal(tree_free[key].regret_sum, infosets[key].regret_sum)
+        np.testing.assert_array_equal(tree_free[key].strategy_sum, infosets[key].strategy_sum)
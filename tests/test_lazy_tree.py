@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from openCFR import InfoSetTable, ReportOptions, Trainer, TreeOptions
+from openCFR.games import LazyTree
+from openCFR.games.sample_games import Kuhn, TexasHoldEm
+from openCFR.minimizers import MCCFR_External, MCCFR_Outcome, VanillaCFR
+from openCFR.minimizers.Sampler import Sampler
+
+def walk(node, depth):
+    '''
+    Returns the histories of every node down to a depth, reading next_nodes as a traversal does.
+    '''
+    histories = [tuple(node.history)]
+
+    if depth > 0 and not node.is_terminal_node:
+        for next_node in node.next_nodes:
+            histories.extend(walk(next_node, depth - 1))
+
+    return histories
+
+def test_cache_is_bounded_and_evicts_least_recently_used():
+    tree = LazyTree(Kuhn(), max_expanded=3)
+    root = tree.root
+    deals = root.next_nodes
+
+    for deal in deals[:3]:
+        deal.next_nodes
+
+    assert len(tree.expanded) == 3
+    assert id(root) not in tree.expanded # The root was the least recently visited
+    assert tree.num_evicted == 1
+    assert root._next_nodes is None
+
+    deals[1].next_nodes # Now the most recently visited, so expanding the root again evicts deals[0]
+    new_deals = root.next_nodes
+
+    assert list(tree.expanded) == [id(deals[2]), id(deals[1]), id(root)]
+    assert tree.num_evicted == 2
+    assert [node.history for node in new_deals] == [node.history for node in deals] and new_deals[0] is not deals[0]
+
+def test_evicted_children_are_created_again():
+    game = TexasHoldEm(1, 2, 4)
+    built = walk(game.build_game_tree(), 4)
+    tree = LazyTree(game, max_expanded=2)
+
+    assert walk(tree.root, 4) == built
+    assert walk(tree.root, 4) == built # Every node was evicted and expanded again
+    assert len(tree.expanded) <= 2
+    assert tree.num_created > 2 * len(built) - 2
+
+def test_new_decision_nodes_are_interned():
+    game = Kuhn()
+    infosets = InfoSetTable()
+    tree = LazyTree(game, infosets=infosets)
+    walk(tree.root, 10)
+
+    assert len(infosets) == 12
+
+@pytest.mark.parametrize('minimizer', [VanillaCFR, MCCFR_External, MCCFR_Outcome])
+def test_lazy_training_matches_built_tree(minimizer):
+    np.random.seed(0)
+    infosets, value = Trainer(Kuhn(), minimizer).train(300, seed=0, report=ReportOptions(display=False))
+    np.random.seed(0)
+    lazy, lazy_value = Trainer(Kuhn(), minimizer).train(300, seed=0, tree=TreeOptions(lazy_tree_size=4), report=ReportOptions(display=False))
+
+    assert lazy_value == value
+
+    for key in infosets.keys():
+        np.testing.assert_array_equal(lazy[key].strategy_sum, infosets[key].strategy_sum)
@@ -0,0 +1,67 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from openCFR import BudgetOptions, JSONLSink, ReportOptions, Trainer, TreeOptions
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import MCCFR_External, VanillaCFR, VectorizedCFR
+
+KUHN_NODES = {'decision': 24, 'chance': 4, 'terminal': 30} # Visited by every full width traversal of Kuhn
+
+def train_with_metrics(minimizer, iterations, **kwargs):
+    records = []
+    trainer = Trainer(Kuhn(), minimizer)
+    infosets, value = trainer.train(iterations, report=ReportOptions(display=False, metrics=records.append, metrics_freq=10), **kwargs)
+
+    return trainer, infosets, value, records
+
+@pytest.mark.parametrize('minimizer, tree', [(VanillaCFR, None), (VanillaCFR, TreeOptions(lazy_tree_size=100)), (VanillaCFR, TreeOptions(tree_free=True)), (VectorizedCFR, None)])
+def test_records_count_every_node_visit(minimizer, tree):
+    _, infosets, value, records = train_with_metrics(minimizer, 30, tree=tree)
+
+    assert [record['event'] for record in records] == ['start', 'iteration', 'iteration', 'iteration']
+    assert [record['iteration'] for record in records] == [0, 10, 20, 30]
+    assert records[-1]['num_infosets'] == 12
+
+    for record in records[1:]:
+        assert record['nodes'] == {name: 10 * count for name, count in KUHN_NODES.items()}
+        assert record['infosets_touched'] == 120
+        assert set(record['phases']) == {'traverse', 'update', 'key', 'checkpoint', 'evaluation', 'display'}
+        assert record['phases']['traverse'] > 0
+
+    assert infosets.node_counter is None # Removed from the table once training ends
+    assert value == Trainer(Kuhn(), minimizer).train(30, tree=tree, report=ReportOptions(display=False))[1]
+
+@pytest.mark.parametrize('tree', [None, TreeOptions(compiled=True)])
+def test_sampled_visits_are_counted(tree):
+    np.random.seed(0)
+    trainer, _, _, records = train_with_metrics(MCCFR_External, 100, seed=0, tree=tree)
+    nodes = [record['nodes'] for record in records[1:]]
+
+    assert all(0 < count['terminal'] < 10 * KUHN_NODES['terminal'] for count in nodes)
+    assert all(count['chance'] == 20 for count in nodes) # Two deals per traversal
+
+    if tree is not None: # A compiled traversal samples the same nodes
+        np.random.seed(0)
+        assert nodes == [record['nodes'] for record in train_with_metrics(MCCFR_External, 100, seed=0)[3][1:]]
+
+def test_node_budget_stops_training():
+    trainer = Trainer(Kuhn(), VanillaCFR)
+    trainer.train(None, budget=BudgetOptions(nodes=5000, check_freq=1), report=ReportOptions(display=False))
+    summary = trainer.training_summary
+    per_iteration = sum(KUHN_NODES.values())
+
+    assert summary['stop_reason'] == 'nodes'
+    assert summary['nodes'] == summary['iterations'] * per_iteration
+    assert 5000 <= summary['nodes'] < 5000 + per_iteration
+
+def test_jsonl_sink_writes_one_line_per_record(tmp_path):
+    path = os.path.join(tmp_path, 'metrics.jsonl')
+    Trainer(Kuhn(), VanillaCFR).train(20, report=ReportOptions(display=False, metrics=JSONLSink(path), metrics_freq=5))
+
+    with open(path) as file:
+        records = [json.loads(line) for line in file]
+
+    assert [record['iteration'] for record in records] == [0, 5, 10, 15, 20]
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from openCFR import BudgetOptions, InfoSetTable, ParallelOptions, ReportOptions, Trainer
+from openCFR.Checkpoint import ARRAYS
+from openCFR.Parallel import _merge_deltas
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import CFRPlus, DCFR, LinearCFR, MCCFR_External, MCCFR_Outcome, VanillaCFR
+
+@pytest.mark.parametrize('minimizer', [VanillaCFR, CFRPlus, LinearCFR, DCFR])
+def test_chance_split_matches_serial_training(minimizer):
+    # Kuhn has static utilities, so the results do not depend on which process samples them
+    serial, value = Trainer(Kuhn(), minimizer).train(100, report=ReportOptions(display=False))
+    parallel, parallel_value = Trainer(Kuhn(), minimizer).train(100, parallel=ParallelOptions(workers=3), report=ReportOptions(display=False))
+
+    assert parallel.keys() == serial.keys()
+    assert parallel_value == pytest.approx(value, rel=1e-12)
+
+    for num_actions, block in serial.blocks.items():
+        for name in ARRAYS:
+            np.testing.assert_allclose(getattr(parallel.blocks[num_actions], name)[:block.size], getattr(block, name)[:block.size], rtol=1e-12, atol=1e-12)
+
+@pytest.mark.parametrize('minimizer', [MCCFR_External, MCCFR_Outcome])
+def test_sampling_pool_converges(minimizer):
+    trainer = Trainer(Kuhn(), minimizer)
+    budget = BudgetOptions(exploitability_freq=1000)
+    infosets, _ = trainer.train(5000, parallel=ParallelOptions(workers=2, sync_interval=100), budget=budget, seed=0, report=ReportOptions(display=False))
+
+    assert trainer.training_summary['iterations'] == 5000
+    assert len(infosets) == 12
+    assert trainer.exploitability_history[-1][1] < 0.25 # A uniform strategy is exploitable by 0.458
+
+def test_merge_keeps_concurrent_merges():
+    infosets = InfoSetTable()
+    infosets.add('a', [0, 1])
+    block = infosets.blocks[2]
+    shared_regret = {2: np.zeros_like(block.regret_sum)}
+    shared_regret[2][0] = [1, 2]
+    block.strategy_sum[0] = [3, 4]
+    block.reach_prob_sum[0] = 5
+    block.regret_sum[0] = [1, -1] # The worker's local deltas
+    block.reach_prob[0] = 0.5
+    block.touched[0] = True
+
+    class ConcurrentMerge:
+        @staticmethod
+        def update(staging, iteration=None):
+            # Another worker merges into the same row while this worker's update runs
+            shared_regret[2][0] += 10
+            block.strategy_sum[0] += 10
+            block.reach_prob_sum[0] += 10
+            MCCFR_External.update(staging, iteration)
+
+    _merge_deltas(ConcurrentMerge, infosets, shared_regret, 1)
+
+    np.testing.assert_allclose(shared_regret[2][0], [12, 11])
+    np.testing.assert_allclose(block.strategy_sum[0], [13.25, 14.25]) # The uniform strategy weighted by the reach probability
+    np.testing.assert_allclose(block.strategy[0], [2 / 3, 1 / 3])
+    np.testing.assert_allclose(block.reach_prob_sum[0], 15.5)
+    assert not block.touched[0]
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import mmap
+import os
+
+import numpy as np
+import pytest
+
+from openCFR import Policy, PolicyServer, ReportOptions, Trainer
+from openCFR.Policy import MAGIC, SECTIONS, key_hash
+from openCFR.games.sample_games import Kuhn, TexasHoldEm
+from openCFR.minimizers import CFRPlus
+
+@pytest.fixture(scope='module')
+def trained():
+    game = TexasHoldEm(1, 2, 4)
+    infosets, _ = Trainer(game, CFRPlus).train(20, report=ReportOptions(display=False))
+
+    return game, infosets
+
+def test_file_layout(tmp_path, trained):
+    _, infosets = trained
+    path = os.path.join(tmp_path, 'texas.policy')
+    Policy.from_table(infosets).save(path)
+
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    header_length = int(np.frombuffer(data, dtype=np.uint64, count=1, offset=8)[0])
+    header = json.loads(data[16:16 + header_length].decode('utf-8'))
+
+    assert data[:8] == MAGIC
+    assert header['num_infosets'] == len(infosets)
+    assert list(header['sections']) == [name for name, _ in SECTIONS]
+
+    for name, dtype in SECTIONS:
+        offset, length = header['sections'][name]
+
+        assert offset % 8 == 0
+        assert offset + length * np.dtype(dtype).itemsize <= len(data)
+
+    hashes = np.frombuffer(data, dtype=np.uint64, count=len(infosets), offset=header['sections']['hashes'][0])
+
+    assert np.all(np.diff(hashes.astype(np.float64)) >= 0)
+    assert sorted(hashes.tolist()) == sorted(key_hash(key) for key in infosets.keys())
+
+def test_loaded_policy_matches_average_strategies(tmp_path, trained):
+    game, infosets = trained
+    path = os.path.join(tmp_path, 'texas.policy')
+    Policy.from_table(infosets, game).save(path)
+    policy = Policy.load(path, game)
+
+    assert isinstance(policy.buffer, mmap.mmap)
+    assert len(policy) == len(infosets)
+    assert sorted(policy.keys()) == sorted(infosets.keys())
+
+    for key, infoset in infosets.items():
+        np.testing.assert_allclose(policy.probs(key), infoset.get_average_strategy() / np.sum(infoset.get_average_strategy()))
+        np.testing.assert_array_equal(policy.available_actions(key), infoset.available_actions)
+
+    assert 'missing' not in policy
+
+    with pytest.raises(KeyError):
+        policy.probs('missing')
+
+    probs = policy.probs(infosets.keys()[0])
+    policy.close()
+
+    assert np.all(np.isfinite(probs)) # Views handed out before close stay valid
+
+def test_load_rejects_other_files(tmp_path):
+    path = os.path.join(tmp_path, 'not.policy')
+
+    with open(path, 'wb') as file:
+        file.write(b'\0' * 64)
+
+    with pytest.raises(ValueError):
+        Policy.load(path)
+
+def test_batch_lookups_match_single_lookups(trained):
+    game, infosets = trained
+    policy = Policy.from_table(infosets, game)
+    keys = infosets.keys()[::7]
+
+    for key, probs in zip(keys, policy.probs_batch(keys)):
+        np.testing.assert_array_equal(probs, policy.probs(key))
+
+    assert policy.lookup(['missing', keys[0]]).tolist() == [-1, policy.index(keys[0])]
+
+    with pytest.raises(KeyError):
+        policy.probs_batch(['missing'])
+
+    rng = np.random.default_rng(0)
+    sampled = policy.sample_batch(keys * 200, rng)
+
+    for i, key in enumerate(keys): # Sampled frequencies follow the strategies
+        actions = policy.available_actions(key)
+        frequencies = [np.mean(sampled[i::len(keys)] == action) for action in actions]
+
+        np.testing.assert_allclose(frequencies, policy.probs(key), atol=0.15)
+
+def test_act_follows_the_strategy_of_a_history():
+    game = Kuhn()
+    infosets, _ = Trainer(game, CFRPlus).train(200, report=ReportOptions(display=False))
+    policy = Policy.from_table(infosets, game)
+    node = game.build_game_tree()
+
+    while node.is_chance_node: # Deal the cards
+        node = node.next_nodes[0]
+    history = list(node.history)
+    key = game.get_infoset_key(history)
+
+    assert policy.act(history) == policy.available_actions(key)[np.argmax(policy.probs(key))]
+    assert policy.act(history, np.random.default_rng(0)) in policy.available_actions(key)
+
+def test_server_replies_to_each_request_in_order(trained):
+    game, infosets = trained
+    server = PolicyServer(Policy.from_table(infosets, game), port=0, seed=0)
+    keys = infosets.keys()[:3]
+    requests = [{'id': 1, 'key': keys[0]}, {'keys': keys, 'sample': True}, {'id': 3, 'key': 'missing'}]
+
+    async def exchange():
+        await server.start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+
+        for request in requests:
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+
+        writer.write(b'not json\n')
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in range(len(requests) + 1)]
+        writer.close()
+        await server.close()
+
+        return replies
+
+    replies = asyncio.run(exchange())
+
+    assert replies[0]['id'] == 1 and replies[0]['probs'] == server.policy.probs(keys[0]).tolist()
+    assert len(replies[1]['sampled']) == 3 and replies[1]['actions'][0] == server.policy.available_actions(keys[0]).tolist()
+    assert replies[2]['id'] == 3 and 'error' in replies[2]
+    assert 'error' in replies[3]
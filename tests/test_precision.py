@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pytest
+
+from openCFR import CheckpointOptions, InfoSetTable, ReportOptions, Trainer, exploitability, load_checkpoint
+from openCFR.Checkpoint import ARRAYS
+from openCFR.InfoSetTable import PRECISIONS
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import CFRPlus, MCCFR_External, VectorizedCFRPlus
+
+@pytest.mark.parametrize('precision', sorted(PRECISIONS))
+@pytest.mark.parametrize('minimizer', [CFRPlus, VectorizedCFRPlus, MCCFR_External])
+def test_precision_keeps_its_dtypes_and_converges(precision, minimizer):
+    game = Kuhn()
+    infosets, _ = Trainer(game, minimizer).train(1000, precision=precision, seed=0, report=ReportOptions(display=False))
+    dtype, sum_dtype = PRECISIONS[precision]
+
+    for block in infosets.blocks.values():
+        assert block.regret_sum.dtype == dtype and block.strategy.dtype == dtype and block.reach_prob.dtype == dtype
+        assert block.strategy_sum.dtype == sum_dtype and block.reach_prob_sum.dtype == sum_dtype
+
+    double, _ = Trainer(game, minimizer).train(1000, seed=0, report=ReportOptions(display=False))
+    root = game.build_game_tree()
+
+    assert exploitability(game, root, infosets) == pytest.approx(exploitability(game, root, double), abs=5e-3)
+
+@pytest.mark.parametrize('precision', sorted(PRECISIONS))
+def test_checkpoints_load_into_any_precision(tmp_path, precision):
+    infosets, _ = Trainer(Kuhn(), CFRPlus).train(100, precision=precision, report=ReportOptions(display=False), checkpoints=CheckpointOptions(save_dir=str(tmp_path)))
+    path = os.path.join(tmp_path, 'checkpoint_100.ckpt')
+
+    for loaded_precision in PRECISIONS:
+        loaded, _ = load_checkpoint(path, loaded_precision)
+
+        for num_actions, block in infosets.blocks.items():
+            for name in ARRAYS:
+                np.testing.assert_array_equal(getattr(loaded.blocks[num_actions], name)[:block.size],
+                                              getattr(block, name)[:block.size].astype(getattr(loaded.blocks[num_actions], name).dtype))
+
+def test_unknown_precision_is_rejected():
+    with pytest.raises(ValueError):
+        InfoSetTable('half')
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from openCFR import ReportOptions, Trainer
+from openCFR.Checkpoint import ARRAYS
+from openCFR.Exploitability import exploitability
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import RBP_CFR, VanillaCFR
+
+def train(minimizer, iterations):
+    return Trainer(Kuhn(), minimizer).train(iterations, report=ReportOptions(display=False))
+
+def test_pruning_is_exact(monkeypatch):
+    pruned, value = train(RBP_CFR, 300)
+    monkeypatch.setattr(RBP_CFR, 'PRUNING', False)
+    unpruned, unpruned_value = train(RBP_CFR, 300)
+
+    assert value == unpruned_value
+    assert RBP_CFR.pruning_stats(unpruned)['pruned_fraction'] == 0
+
+    for num_actions, block in unpruned.blocks.items():
+        for name in ARRAYS:
+            np.testing.assert_array_equal(getattr(pruned.blocks[num_actions], name), getattr(block, name))
+
+def test_pruning_skips_part_of_the_tree():
+    infosets, _ = train(RBP_CFR, 300)
+    stats = RBP_CFR.pruning_stats(infosets)
+
+    assert len(stats['pruned_fractions']) == 300
+    assert stats['pruned_fractions'][0] == 0 # Every strategy is uniform on the first iteration
+    assert np.mean(stats['pruned_fractions'][100:]) > 0.1
+    assert stats['pruned_actions'] > 0
+
+def test_converges_like_vanilla_cfr():
+    game = Kuhn()
+    root = game.build_game_tree()
+    rbp, rbp_value = train(RBP_CFR, 1000)
+    vanilla, vanilla_value = train(VanillaCFR, 1000)
+
+    assert exploitability(game, root, rbp) <= exploitability(game, root, vanilla)
+    assert rbp_value / 1000 == pytest.approx(-1 / 18, abs=5e-3)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from openCFR import ReportOptions, Trainer
+from openCFR.Reporting import ResultsReporter, snapshot, summarize
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import CFRPlus
+
+def train(iterations, summary):
+    return Trainer(Kuhn(), CFRPlus).train(iterations, report=ReportOptions(display_freq=10, summary=summary))
+
+def test_summaries_are_written_at_every_display():
+    summaries = []
+    infosets, value = train(35, summaries.append)
+
+    assert [summary['iteration'] for summary in summaries] == [11, 21, 31, 35]
+
+    last = summaries[-1]
+    assert last['num_infosets'] == 12
+    assert last['expected_value'] == pytest.approx([value / 35, -value / 35])
+    assert last['average_regret'] >= last['max_infoset_regret'] >= 0
+    assert 0 < last['mean_entropy'] <= np.log(2)
+    assert len(last['most_changed']) == 10
+    assert all(key in infosets.keys_by_id for key, _ in last['most_changed'])
+    assert [change for _, change in last['most_changed']] == sorted((change for _, change in last['most_changed']), reverse=True)
+    assert 'strategies' not in last
+
+def test_summaries_do_not_change_training():
+    np.random.seed(0)
+    infosets, value = train(50, lambda summary: None)
+    expected_infosets, expected_value = Trainer(Kuhn(), CFRPlus).train(50, report=ReportOptions(display=False))
+
+    assert value == expected_value
+
+    for num_actions, block in expected_infosets.blocks.items():
+        np.testing.assert_array_equal(infosets.blocks[num_actions].strategy_sum, block.strategy_sum)
+
+def test_most_changed_measures_total_variation():
+    infosets, value = Trainer(Kuhn(), CFRPlus).train(10, report=ReportOptions(display=False))
+    first = summarize(snapshot(infosets), value, 10)
+    previous = {num_actions: np.full_like(strategies, 0.5) for num_actions, strategies in first['strategies'].items()}
+    second = summarize(snapshot(infosets), value, 10, previous, top_k=3)
+
+    assert first['most_changed'] == []
+    assert len(second['most_changed']) == 3
+
+    infoset_id, change = second['most_changed'][0]
+    block, row = infosets.locate(infoset_id)
+    assert change == pytest.approx(0.5 * np.abs(first['strategies'][block.num_actions][row] - 0.5).sum())
+
+def test_reporter_errors_are_raised_on_wait():
+    infosets, value = Trainer(Kuhn(), CFRPlus).train(5, report=ReportOptions(display=False))
+
+    def failing_sink(summary):
+        raise RuntimeError('sink failed')
+
+    reporter = ResultsReporter(infosets, Kuhn().action_map, failing_sink)
+    reporter.submit(value, 5)
+
+    with pytest.raises(RuntimeError, match='sink failed'):
+        reporter.wait()
+
+    reporter.close() # The error is only raised once
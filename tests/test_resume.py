@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pytest
+
+from openCFR import CheckpointOptions, ReportOptions, Trainer, load_checkpoint
+from openCFR.Checkpoint import ARRAYS
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import (CFRPlus, ChanceSampling, DCFR, Discounting, LinearCFR, MCCFR_External, MCCFR_Outcome,
+                                RBP_CFR, VanillaCFR, VectorizedCFR, VectorizedCFRPlus)
+
+def train(minimizer, iterations, save_dir=None, resume_from=None, discounting=None):
+    checkpoints = CheckpointOptions(save_dir=str(save_dir)) if save_dir is not None else None
+    trainer = Trainer(Kuhn(), minimizer, discounting)
+
+    return trainer.train(iterations, report=ReportOptions(display=False), checkpoints=checkpoints, resume_from=resume_from, seed=7)
+
+def assert_same_table(infosets, other):
+    assert infosets.keys() == other.keys()
+
+    for num_actions, block in infosets.blocks.items():
+        for name in ARRAYS:
+            np.testing.assert_array_equal(getattr(block, name)[:block.size], getattr(other.blocks[num_actions], name)[:block.size])
+
+@pytest.mark.parametrize('minimizer, discounting', [
+    (VanillaCFR, None),
+    (CFRPlus, None),
+    (CFRPlus, Discounting.linear_averaging),
+    (LinearCFR, None),
+    (DCFR, None),
+    (VectorizedCFR, None),
+    (VectorizedCFRPlus, None),
+    (ChanceSampling, None),
+    (MCCFR_External, None),
+    (MCCFR_Outcome, None),
+    (RBP_CFR, None),
+])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, minimizer, discounting):
+    np.random.seed(0)
+    infosets, value = train(minimizer, 120, discounting=discounting)
+
+    np.random.seed(0)
+    train(minimizer, 60, save_dir=tmp_path, discounting=discounting)
+    np.random.seed(1) # The checkpoint restores every random number generator
+    resumed, resumed_value = train(minimizer, 120, resume_from=os.path.join(tmp_path, 'checkpoint_60.ckpt'), discounting=discounting)
+
+    assert resumed_value == value
+    assert_same_table(resumed, infosets)
+
+    if minimizer is RBP_CFR: # The pruning statistics are checkpointed with the table
+        assert RBP_CFR.pruning_stats(resumed) == RBP_CFR.pruning_stats(infosets)
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+
+from openCFR import BudgetOptions, CheckpointOptions, ParallelOptions, ReportOptions, Trainer, TreeOptions
+from openCFR.games.sample_games import Kuhn
+from openCFR.minimizers import CFRPlus, MCCFR_External, VectorizedCFR
+
+def test_deprecated_arguments_map_onto_options(tmp_path):
+    old_dir, new_dir = os.path.join(tmp_path, 'old'), os.path.join(tmp_path, 'new')
+    os.makedirs(old_dir)
+    os.makedirs(new_dir)
+
+    with pytest.warns(DeprecationWarning, match='display_results, save_dir, save_freq, save_results'):
+        old_infosets, old_value = Trainer(Kuhn(), CFRPlus).train(50, display_results=False, save_results=True, save_freq=20, save_dir=old_dir)
+
+    new_infosets, new_value = Trainer(Kuhn(), CFRPlus).train(50, report=ReportOptions(display=False), checkpoints=CheckpointOptions(new_dir, 20))
+
+    assert old_value == new_value
+    assert sorted(os.listdir(old_dir)) == sorted(os.listdir(new_dir))
+
+    for num_actions, block in new_infosets.blocks.items():
+        np.testing.assert_array_equal(old_infosets.blocks[num_actions].strategy_sum, block.strategy_sum)
+
+def test_every_deprecated_group_is_mapped(tmp_path):
+    trainer = Trainer(Kuhn(), MCCFR_External)
+
+    with pytest.warns(DeprecationWarning):
+        trainer.train(None, display_results=False, lazy_tree_size=10, time_budget=60, node_budget=2000, budget_check_freq=1, metrics=[], seed=0)
+
+    assert trainer.training_summary['stop_reason'] == 'nodes'
+
+    with pytest.warns(DeprecationWarning):
+        trainer.train(20, display_results=False, save_dir=str(tmp_path)) # save_dir alone saves nothing, as before
+
+    assert os.listdir(tmp_path) == []
+
+def test_deprecated_arguments_are_checked():
+    trainer = Trainer(Kuhn(), CFRPlus)
+
+    with pytest.raises(TypeError):
+        trainer.train(10, display_result=False)
+
+    with pytest.warns(DeprecationWarning), pytest.raises(ValueError):
+        trainer.train(10, display_results=False, report=ReportOptions(display=False))
+
+    with pytest.warns(DeprecationWarning), pytest.raises(ValueError):
+        trainer.train(10, display_results=False, build_dag=True, tree_free=True)
+
+def test_summary_is_returned_on_request():
+    trainer = Trainer(Kuhn(), CFRPlus)
+    infosets, value, summary = trainer.train(30, report=ReportOptions(display=False), return_summary=True)
+
+    assert summary is trainer.training_summary
+    assert summary['iterations'] == 30
+    assert summary['stop_reason'] == 'iterations'
+    assert len(trainer.train(30, report=ReportOptions(display=False))) == 2
+
+@pytest.mark.parametrize('minimizer, options', [
+    (CFRPlus, {'iterations': None}),
+    (VectorizedCFR, {'tree': TreeOptions(tree_free=True)}),
+    (VectorizedCFR, {'parallel': ParallelOptions(workers=2)}),
+    (CFRPlus, {'parallel': ParallelOptions(batch_size=4)}),
+    (MCCFR_External, {'parallel': ParallelOptions(workers=2), 'budget': BudgetOptions(nodes=100)}),
+    (CFRPlus, {'tree': TreeOptions(compiled=True)}),
+    (MCCFR_External, {'tree': TreeOptions(compiled=True), 'parallel': ParallelOptions(workers=2)}),
+])
+def test_invalid_combinations_are_rejected(minimizer, options):
+    options = {'iterations': 10, 'report': ReportOptions(display=False), **options}
+
+    with pytest.raises(ValueError):
+        Trainer(Kuhn(), minimizer).train(**options)
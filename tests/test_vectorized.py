@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+import pytest
+
+from openCFR import ReportOptions, Trainer
+from openCFR.games.sample_games import Kuhn, RPS, TexasHoldEm
+from openCFR.minimizers import CFRPlus, VanillaCFR, VectorizedCFR, VectorizedCFRPlus, VectorizedEngine
+
+@pytest.mark.parametrize('game', [Kuhn, RPS])
+@pytest.mark.parametrize('recursive, vectorized', [(VanillaCFR, VectorizedCFR), (CFRPlus, VectorizedCFRPlus)])
+def test_vectorized_matches_recursive(game, recursive, vectorized):
+    expected, value = Trainer(game(), recursive).train(200, report=ReportOptions(display=False))
+    infosets, vectorized_value = Trainer(game(), vectorized).train(200, report=ReportOptions(display=False))
+
+    assert sorted(infosets.keys()) == sorted(expected.keys())
+    assert vectorized_value == pytest.approx(value, rel=1e-9, abs=1e-9)
+
+    for key in expected.keys():
+        for name in ('regret_sum', 'strategy', 'strategy_sum', 'reach_prob_sum'):
+            np.testing.assert_allclose(getattr(infosets[key], name), getattr(expected[key], name), rtol=1e-9, atol=1e-9)
+
+@pytest.mark.parametrize('vectorized', [VectorizedCFR, VectorizedCFRPlus])
+def test_path_traversal_matches_level_traversal(monkeypatch, vectorized):
+    results = []
+
+    for path_size in (10 ** 6, 0): # TexasHoldEm(1, 2, 4) is traversed along its paths, then one depth at a time
+        monkeypatch.setattr(VectorizedEngine, 'PATH_SIZE', path_size)
+        np.random.seed(0)
+        random.seed(0) # Seeds the sampled utilities
+        results.append(Trainer(TexasHoldEm(1, 2, 4), vectorized).train(5, report=ReportOptions(display=False)))
+
+    (paths, value), (levels, levels_value) = results
+
+    assert value == pytest.approx(levels_value, rel=1e-9, abs=1e-9)
+
+    for key in levels.keys():
+        for name in ('regret_sum', 'strategy_sum', 'reach_prob_sum'):
+            np.testing.assert_allclose(getattr(paths[key], name), getattr(levels[key], name), rtol=1e-9, atol=1e-9)